@@ -13,36 +13,101 @@ from .cairn import CairnAdapter
 from .lmsi import LMSIAdapter
 from .arretsurimages import ArretSurImagesAdapter
 from .generic import GenericAdapter
+from .head import HeadMetadata
+from .partial import ContainerStrainer
+from bs4 import BeautifulSoup
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Detection order: the first adapter whose can_handle() is True is used
+ADAPTERS = [
+    GeminiAdapter,
+    EuropresseAdapter,
+    LeMondeDiplomatiqueAdapter,
+    MediapartAdapter,
+    BallastAdapter,
+    MultitudesAdapter,
+    ManifestoAdapter,
+    CairnAdapter,
+    LMSIAdapter,
+    ArretSurImagesAdapter,
+    UCLAdapter,  # UCL uses generic selectors, should be checked last
+    # Add other adapters here
+]
+
+# Documents at least this large (characters) are first parsed partially
+PARTIAL_PARSE_MIN_CHARS = 512 * 1024
+
+_strainer = None
+
+
 def get_adapter(soup, filename):
     """
     Factory function to get the appropriate adapter for the given HTML soup.
     """
-    adapters = [
-        GeminiAdapter,
-        EuropresseAdapter,
-        LeMondeDiplomatiqueAdapter,
-        MediapartAdapter,
-        BallastAdapter,
-        MultitudesAdapter,
-        ManifestoAdapter,
-        CairnAdapter,
-        LMSIAdapter,
-        ArretSurImagesAdapter,
-        UCLAdapter,  # UCL uses generic selectors, should be checked last
-        # Add other adapters here
-    ]
-
-
-
-    for adapter_cls in adapters:
-        adapter = adapter_cls(soup, filename)
+    # Metadata table built once and shared by every adapter tried
+    head = HeadMetadata(soup)
+
+    for adapter_cls in ADAPTERS:
+        adapter = adapter_cls(soup, filename, head)
         if adapter.can_handle():
             logger.info(f"Using adapter: {adapter_cls.__name__}")
             return adapter
 
     logger.info("Using adapter: GenericAdapter")
-    return GenericAdapter(soup, filename)
+    return GenericAdapter(soup, filename, head)
+
+
+def _container_strainer():
+    """Strainer keeping every element any adapter may read, built once."""
+    global _strainer
+    if _strainer is None:
+        selectors = []
+        for adapter_cls in ADAPTERS:
+            selectors.extend(adapter_cls.content_containers)
+            selectors.extend(adapter_cls.body_selectors or ())
+        _strainer = ContainerStrainer(selectors)
+    return _strainer
+
+
+def _partial_adapter(html, filename):
+    """
+    Runs the detection on a partial parse of the document (head metadata and
+    declared containers only). Returns the adapter if it is safe to use it on
+    that tree, None if the document must be parsed in full: an adapter that
+    reads arbitrary parts of the document comes first in the detection order,
+    the detected adapter declares no container, or none of its containers is
+    in the document.
+    """
+    soup = BeautifulSoup(html, "html.parser", parse_only=_container_strainer())
+    head = HeadMetadata(soup)
+
+    for adapter_cls in ADAPTERS:
+        if adapter_cls.body_selectors is None:
+            return None
+        adapter = adapter_cls(soup, filename, head)
+        if not adapter.can_handle():
+            continue
+        if adapter_cls.content_containers and soup.select_one(", ".join(adapter_cls.content_containers)):
+            logger.info(f"Using adapter: {adapter_cls.__name__} (partial parse)")
+            return adapter
+        return None
+    return None
+
+
+def parse_article(html, filename):
+    """
+    Parses an HTML document and returns the adapter that handles it.
+
+    Large documents are first parsed partially: only the <head> metadata and
+    the content containers declared by the adapters are built as a tree, which
+    keeps the peak memory of multi-MB exports low. Whenever the partial tree
+    is not enough, the document is parsed in full, as get_adapter() expects.
+    """
+    if len(html) >= PARTIAL_PARSE_MIN_CHARS:
+        adapter = _partial_adapter(html, filename)
+        if adapter is not None:
+            return adapter
+        logger.debug("Partial parse not usable, parsing the full document")
+    return get_adapter(BeautifulSoup(html, "html.parser"), filename)
@@ -6,12 +6,12 @@ class ArretSurImagesAdapter(BaseAdapter):
     """Adapter for Arrêt sur images (arretsurimages.net)"""
     
     def can_handle(self):
-        og_site = self.soup.find("meta", property="og:site_name")
-        if og_site and "Arrêt sur images" in og_site.get("content", ""):
+        og_site = self.head.meta(property="og:site_name")
+        if og_site and "Arrêt sur images" in og_site:
             return True
             
-        og_url = self.soup.find("meta", property="og:url")
-        if og_url and "arretsurimages.net" in og_url.get("content", ""):
+        og_url = self.head.meta(property="og:url")
+        if og_url and "arretsurimages.net" in og_url:
             return True
             
         if "Arrêt sur images" in self.filename or "Arr_t sur images" in self.filename:
@@ -24,18 +24,18 @@ class ArretSurImagesAdapter(BaseAdapter):
         soup = self.soup
         
         # Title
-        og_title = soup.find("meta", property="og:title")
-        if og_title and og_title.get("content"):
-            title = og_title["content"].strip()
+        og_title = self.head.meta(property="og:title")
+        if og_title:
+            title = og_title.strip()
             title = re.sub(r'\s*\|\s*Arrêt sur images\s*$', '', title, flags=re.IGNORECASE)
             meta["title"] = title
 
         # Author
         author = None
         # Meta name="author" or article:author doesn't exist on all pages, but we check just in case
-        meta_author = soup.find("meta", attrs={"name": "author"}) or soup.find("meta", property="article:author")
-        if meta_author and meta_author.get("content"):
-            author = meta_author["content"].strip()
+        meta_author = self.head.meta(name="author") or self.head.meta(property="article:author")
+        if meta_author:
+            author = meta_author.strip()
             
         if not author:
             # Often the author is in .author-name
@@ -54,24 +54,24 @@ class ArretSurImagesAdapter(BaseAdapter):
         meta["media"] = "Arrêt sur images"
         
         # URL
-        meta_url = soup.find("meta", property="og:url")
+        meta_url = self.head.meta(property="og:url")
         if meta_url:
-            meta["url"] = meta_url.get("content", "").strip()
+            meta["url"] = meta_url.strip()
 
         # Date
-        meta_date = soup.find("meta", property="article:published_time")
+        meta_date = self.head.meta(property="article:published_time")
         if meta_date:
-            meta["date"] = meta_date.get("content", "").strip()
+            meta["date"] = meta_date.strip()
 
         # Description
-        meta_desc = soup.find("meta", property="og:description")
+        meta_desc = self.head.meta(property="og:description")
         if meta_desc:
-            meta["description"] = meta_desc.get("content", "").strip()
+            meta["description"] = meta_desc.strip()
 
         # Image
-        meta_image = soup.find("meta", property="og:image")
+        meta_image = self.head.meta(property="og:image")
         if meta_image:
-            meta["image_url"] = meta_image.get("content", "").strip()
+            meta["image_url"] = meta_image.strip()
 
         return meta
 
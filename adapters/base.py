@@ -1,14 +1,35 @@
 
 from bs4 import BeautifulSoup
 import logging
-from .reader_mode import reader_extract_content
+from .reader_mode import reader_extract_with_tier
+from .head import HeadMetadata
+from .view import ContentView
 
 logger = logging.getLogger(__name__)
 
 class BaseAdapter:
-    def __init__(self, soup, filename):
+    # CSS selectors of the elements get_content() reads the article from. When
+    # the adapter declares some, large documents are only partially parsed:
+    # the <head> metadata plus these subtrees (see adapters.parse_article).
+    content_containers = ()
+    # Other body elements read by can_handle() / extract_metadata(), kept by
+    # the partial parse as well. None: the adapter reads arbitrary parts of
+    # the document, which is then always parsed in full.
+    body_selectors = ()
+    # Boilerplate left out of the content container (see _content_view)
+    junk_filter = None
+
+    def __init__(self, soup, filename, head=None):
         self.soup = soup
         self.filename = filename
+        # <meta>/<link>/<title>/JSON-LD lookup table, shared by all the
+        # adapters tried on the same document
+        self.head = head if head is not None else HeadMetadata(soup)
+        # Which extraction answered get_content(): "adapter" (site-specific
+        # selectors), "fast" / "full" (reader mode tiers) or "heuristic"
+        self.extraction_tier = "adapter"
+        # Counts of the last junk pass (JunkFilter.find)
+        self.junk_stats = None
 
     def can_handle(self):
         """Returns True if this adapter can handle the given soup/filename."""
@@ -32,7 +53,27 @@ class BaseAdapter:
     def get_content(self):
         """Returns the cleaned text content to be spoken."""
         return ""
-    
+
+    def close(self):
+        """
+        Tears down the parse tree once the article has been extracted: the
+        tree of a large page holds tens of MB, freed right away instead of
+        whenever the reference cycles are collected.
+        """
+        if self.soup is not None:
+            self.soup.decompose()
+            self.soup = None
+
+    def _content_view(self, container):
+        """
+        Read-only view of container without the adapter's junk elements and
+        hidden elements (found in one walk). The tree is left untouched, so
+        get_content() and extract_metadata() can run in any order.
+        """
+        view = ContentView(container, self.junk_filter)
+        self.junk_stats = view.junk_stats
+        return view
+
     def _generate_long_description(self, target_length=1200):
         """
         Generate a long description from article content for USLT tag.
@@ -79,4 +120,7 @@ class BaseAdapter:
         """
         if html_string is None:
             html_string = str(self.soup)
-        return reader_extract_content(html_string)
+        text, tier, _ = reader_extract_with_tier(html_string)
+        if tier:
+            self.extraction_tier = tier
+        return text
@@ -1,5 +1,6 @@
 
 from .base import BaseAdapter
+from .junk import JunkFilter
 from bs4 import Tag
 import re
 import os
@@ -7,19 +8,41 @@ import os
 
 class CairnAdapter(BaseAdapter):
     """Adapter for Cairn/Psychologies academic articles (psygenresociete.org and similar)"""
-    
+
+    junk_filter = JunkFilter(
+        tags=["script", "style", "nav", "header", "footer",
+              "aside", "form", "iframe", "noscript", "figure",
+              "button", "input", "img", "video", "audio"],
+        # Academic articles have footnotes
+        selectors=[
+            ".share", ".social",
+            ".footnotes", ".notes", "[class*='footnote']", "[class*='note-']",
+            ".references", ".bibliography", ".biblio",
+            ".author", ".authors", ".author-info",
+            ".doi", "[class*='doi']",
+            ".comments",
+            ".related",
+            ".navigation",
+            ".meta", ".article-meta",
+            ".sidebar", ".widget"
+        ],
+    )
+    # soup.body, the last fallback of get_content(), is not strainable
+    content_containers = ("main", "article")
+    body_selectors = (".author", ".authors", ".meta-author", "h1")
+
     def can_handle(self):
         # Check og:site_name
-        og_site = self.soup.find("meta", property="og:site_name")
+        og_site = self.head.meta(property="og:site_name")
         if og_site:
-            site_name = og_site.get("content", "").lower()
+            site_name = og_site.lower()
             if "psychologies" in site_name or "cairn" in site_name:
                 return True
         
         # Check URL
-        og_url = self.soup.find("meta", property="og:url")
+        og_url = self.head.meta(property="og:url")
         if og_url:
-            url = og_url.get("content", "")
+            url = og_url
             if "psygenresociete.org" in url or "cairn.info" in url:
                 return True
         
@@ -37,16 +60,16 @@ class CairnAdapter(BaseAdapter):
         filename_title = os.path.splitext(filename)[0]
 
         # Title
-        og_title = soup.find("meta", property="og:title")
-        if og_title and og_title.get("content"):
-            title = og_title["content"].strip()
+        og_title = self.head.meta(property="og:title")
+        if og_title:
+            title = og_title.strip()
             # Clean " – Psychologies, Genre et Société" suffix
             title = re.sub(r'\s*[-–]\s*Psychologies.*$', '', title, flags=re.IGNORECASE)
             meta["title"] = title
         
         if not meta["title"]:
-            if soup.title and soup.title.string:
-                meta["title"] = soup.title.string.strip()
+            if self.head.title:
+                meta["title"] = self.head.title.strip()
 
         if not meta["title"]:
             h1_tag = soup.find("h1")
@@ -57,9 +80,9 @@ class CairnAdapter(BaseAdapter):
             meta["title"] = filename_title
 
         # Author - Academic articles often have author in specific format
-        meta_author = soup.find("meta", property="article:author")
-        if meta_author and meta_author.get("content"):
-            meta["author"] = meta_author["content"].strip()
+        meta_author = self.head.meta(property="article:author")
+        if meta_author:
+            meta["author"] = meta_author.strip()
         else:
             # Try to find author in first paragraph or specific classes
             author_el = soup.select_one(".author, .authors, .meta-author")
@@ -77,26 +100,26 @@ class CairnAdapter(BaseAdapter):
                             meta["author"] = text
 
         # Media - Extract from og:site_name
-        og_site = soup.find("meta", property="og:site_name")
-        if og_site and og_site.get("content"):
-            meta["media"] = og_site["content"].strip()
+        og_site = self.head.meta(property="og:site_name")
+        if og_site:
+            meta["media"] = og_site.strip()
         else:
             meta["media"] = "Psychologies, Genre et Société"
         
         # URL
-        meta_url = soup.find("meta", property="og:url") or soup.find("link", rel="canonical")
+        meta_url = self.head.meta(property="og:url") or self.head.link("canonical")
         if meta_url:
-            meta["url"] = meta_url.get("href", meta_url.get("content", "")).strip()
+            meta["url"] = meta_url.strip()
 
         # Date
-        meta_date = soup.find("meta", property="article:published_time")
-        if meta_date and meta_date.get("content"):
-            meta["date"] = meta_date["content"].strip()
+        meta_date = self.head.meta(property="article:published_time")
+        if meta_date:
+            meta["date"] = meta_date.strip()
 
         # Description
-        meta_desc = soup.find("meta", property="og:description")
-        if meta_desc and meta_desc.get("content"):
-            og_desc = meta_desc["content"].strip()
+        meta_desc = self.head.meta(property="og:description")
+        if meta_desc:
+            og_desc = meta_desc.strip()
             if len(og_desc) < 300:
                 long_desc = self._generate_long_description()
                 meta["description"] = long_desc if long_desc else og_desc
@@ -106,9 +129,9 @@ class CairnAdapter(BaseAdapter):
             meta["description"] = self._generate_long_description()
 
         # Image
-        meta_image = soup.find("meta", property="og:image")
-        if meta_image and meta_image.get("content"):
-            meta["image_url"] = meta_image["content"].strip()
+        meta_image = self.head.meta(property="og:image")
+        if meta_image:
+            meta["image_url"] = meta_image.strip()
 
         return meta
         
@@ -127,57 +150,28 @@ class CairnAdapter(BaseAdapter):
         if not main_content:
             return ""
         
-        # Create a copy to avoid modifying original
-        container = main_content.__copy__()
-        
-        # Remove unwanted elements
-        for element in container(["script", "style", "nav", "header", "footer", 
-                                   "aside", "form", "iframe", "noscript", "figure", 
-                                   "button", "input", "img", "video", "audio"]):
-            element.extract()
-
-        # Remove specific junk selectors - Academic articles have footnotes
-        junk_selectors = [
-            ".share", ".social",
-            ".footnotes", ".notes", "[class*='footnote']", "[class*='note-']",
-            ".references", ".bibliography", ".biblio",
-            ".author", ".authors", ".author-info",
-            ".doi", "[class*='doi']",
-            ".comments",
-            ".related",
-            ".navigation",
-            ".meta", ".article-meta",
-            ".sidebar", ".widget"
-        ]
-        for selector in junk_selectors:
-            for element in container.select(selector):
-                element.extract()
+        # Read-only view without unwanted elements, junk selectors and hidden elements
+        view = self._content_view(main_content)
 
-        # Remove short metadata paragraphs at the beginning
-        paragraphs = container.find_all('p')
+        # Skip short metadata paragraphs at the beginning
+        paragraphs = view.find_all('p')
         for p in paragraphs[:5]:  # Only check first 5
-            text = p.get_text(strip=True)
+            text = view.get_text(p, strip=True)
             # Skip DOI, author names, etc.
             if len(text) < 50:
                 if "DOI" in text or re.match(r'^[A-Z][a-zéèàù]+\s*[A-Z]', text):
-                    p.extract()
+                    view.exclude(p)
                 elif len(text.split()) <= 3:
-                    p.extract()
-        
-        # Pre-process: unwrap nested elements
-        while True:
-            wrapper = container.find(lambda t: t.name in ['p', 'div'] and 
-                                     t.find(['p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6']))
-            if not wrapper:
-                break
-            wrapper.unwrap()
-            
-        # Extract text from relevant tags
+                    view.exclude(p)
+
+        # Extract text from relevant tags (nested p/div containing other
+        # block elements are skipped)
         text_parts = []
         seen_texts = set()  # Avoid duplicates
         
-        for tag in container.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'p', 'blockquote', 'li']):
-            text = tag.get_text(separator=" ", strip=True)
+        for tag in view.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'p', 'blockquote', 'li'],
+                                 flatten=['p', 'div']):
+            text = view.get_text(tag, separator=" ", strip=True)
             if not text:
                 continue
             
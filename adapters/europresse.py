@@ -1,12 +1,17 @@
 
 from .base import BaseAdapter
+from .view import ContentView
 
 class EuropresseAdapter(BaseAdapter):
+    content_containers = ("div.DocText", "div.doc-content", "section.doc-content")
+    body_selectors = (".titreArticleVisu", ".rdp__articletitle", ".sm-margin-bottomNews",
+                      ".DocPublicationName", ".rdp__DocPublicationName")
+
     def can_handle(self):
         # Europresse often has "Europresse" title or specific structure
         # Check extraction logic from original file
-        title = self.soup.find("title")
-        if title and "Europresse" in title.get_text():
+        title = self.head.title
+        if title and "Europresse" in title:
             return True
         # Original script logic: if meta["title"] == "Europresse" or ... 
         # Here we try to detect before extraction.
@@ -49,15 +54,12 @@ class EuropresseAdapter(BaseAdapter):
         if not main_content:
             return ""
 
-        # Pre-process: unwrap
-        while True:
-            wrapper = main_content.find(lambda t: t.name in ['p', 'div'] and t.find(['p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6']))
-            if not wrapper: break
-            wrapper.unwrap()
+        # Read-only view: nested p/div containing other block elements are skipped
+        view = ContentView(main_content)
 
         text_parts = []
-        for tag in main_content.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'p']):
-            text = tag.get_text(separator=" ", strip=True)
+        for tag in view.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'p'], flatten=['p', 'div']):
+            text = view.get_text(tag, separator=" ", strip=True)
             if not text: continue
             
             if not text[-1] in '.!?':
@@ -3,17 +3,25 @@ from .base import BaseAdapter
 import os
 import re
 import logging
-from bs4 import Comment
+from bs4 import Comment, Tag
 
 logger = logging.getLogger(__name__)
 
+HEADING_TAGS = frozenset(['h1', 'h2', 'h3', 'h4', 'h5', 'h6'])
+# Tags that end a run of inline content
+BLOCK_TAGS = HEADING_TAGS | {'p', 'div', 'blockquote', 'ul', 'ol', 'li'}
+# Block tags read through when they contain other block tags
+WRAPPER_TAGS = frozenset(['p', 'div', 'blockquote', 'li'])
+# Tags whose text is read
+TEXT_TAGS = HEADING_TAGS | {'p', 'li', 'blockquote'}
+
 class GeminiAdapter(BaseAdapter):
     def can_handle(self):
         # Check title or specific meta tags
         # Gemini export often has "Gemini" in title or specific filename pattern
         if "Gemini" in self.filename:
             return True
-        if self.soup.find("meta", property="og:site_name", content="Gemini"):
+        if "Gemini" in self.head.meta_all(property="og:site_name"):
             return True
         return False
 
@@ -64,114 +72,53 @@ class GeminiAdapter(BaseAdapter):
         if not markdown_div:
             return ""
 
-        # 1. Flatten structure: Unwrap block tags that contain other block tags
-        # This fixes issues where <p> contains <h2> or other <p> (invalid but possible)
-        block_tags = ['p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'div', 'blockquote', 'ul', 'ol', 'li']
-        while True:
-            # Find a tag that is in block_tags AND contains another tag from block_tags
-            # We explicitly exclude 'div' from being unwrapped if it's the root container, but find searches descendants.
-            # We want to unwrap P, DIV, BLOCKQUOTE if they have block children.
-            wrapper = markdown_div.find(lambda t: t.name in ['p', 'div', 'blockquote', 'li'] and t.find(block_tags))
-            if not wrapper: 
-                break
-            wrapper.unwrap()
-
-
-        # 2. Re-group inline elements into <p>
-        # Unwrapping might have left text nodes and inline tags (em, strong, a) as direct children.
-        # We need to wrap them in <p> so they are caught by find_all('p').
-        # Using a grouping approach.
-        
-        new_contents = []
-        buffer = []
-        
-        def flush_buffer():
-            if not buffer: return
-            # Check if buffer has only whitespace
-            is_empty = True
-            for item in buffer:
-                if isinstance(item, str):
-                    if item.strip():
-                        is_empty = False
-                        break
-                else:
-                    # Tags are content
-                    is_empty = False
-                    break
-            
-            if not is_empty:
-                new_p = self.soup.new_tag("p")
-                for item in buffer:
-                    new_p.append(item)
-                new_contents.append(new_p)
-            else:
-                 # If whitespace, just append? No, discard whitespace between blocks
-                 pass
-            buffer.clear()
-
-        # Iterate over a copy of children to avoiding modification issues during iteration?
-        # Actually we will rebuild the children list.
-        original_contents = list(markdown_div.contents)
-        markdown_div.clear() # We will refill it
-        
-        block_tags_set = {'p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'div', 'blockquote', 'ul', 'ol', 'li'}
-        
-        for node in original_contents:
-            if isinstance(node, str):
-                buffer.append(node)
-                continue
-                
-            if node.name in block_tags_set:
-                flush_buffer()
-                new_contents.append(node)
+        # 1. Flatten structure: wrappers (p, div, blockquote, li) that contain
+        # other block tags are read through, as if unwrapped. This fixes issues
+        # where <p> contains <h2> or other <p> (invalid but possible). The tree
+        # is not modified, so metadata and content can be extracted in any order.
+        flattened = _flattened_wrappers(markdown_div)
+
+        # 2. Re-group inline elements into paragraphs
+        # Flattening leaves text nodes and inline tags (em, strong, a) as direct
+        # children: consecutive ones are read as one paragraph, whitespace-only
+        # runs between blocks are dropped.
+        segments = []
+        run = []
+        for node in _children(markdown_div, flattened):
+            if isinstance(node, Tag) and node.name in BLOCK_TAGS:
+                if _has_content(run):
+                    segments.append(run)
+                run = []
+                segments.append(node)
             else:
-                # Inline tag (em, strong, a, span, br...)
-                buffer.append(node)
-                
-        flush_buffer()
-        
-        # Refill markdown_div
-        for node in new_contents:
-            markdown_div.append(node)
-
-        # 3. Extract content linearly
+                # Text or inline tag (em, strong, a, span, br...)
+                run.append(node)
+        if _has_content(run):
+            segments.append(run)
+
+        # 3. Extract content linearly, in one traversal
+        # A text tag is skipped when its parent (once flattened) is itself a text
+        # tag, which was read with it; elements are tracked by identity only
+        # (Tag.__eq__ compares whole subtrees).
+        paragraph_types = self.soup.new_tag("p").interesting_string_types
         text_parts = []
-        tags_of_interest = ['h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'p', 'li', 'blockquote']
-        
-        found_tags = markdown_div.find_all(tags_of_interest)
-
-        
-        for element in found_tags:
-            # Skip if this element still contains block tags (shouldn't happen due to step 1, but safety first)
-            # Exception: blockquote might contain p, we might want to read p inside blockquote.
-            # If element is blockquote, we let it pass?
-            # Actually, if we stick to the plan: if we unwrap blockquote because it had p, then blockquote is GONE.
-            # That might be bad if we want to extract blockquote semantics.
-            # But for TTS, reading the text is priority.
-            
-            # Anti-doublon: If this tag is inside another tag we are also processing?
-            # If we flattened, there shouldn't be much nesting.
-            # But assume <p><b>Text</b></p>. <b> is not in tags_of_interest. Safe.
-            # Assume <ul><li>Text</li></ul>. <ul> unwrapped (if in list). <li> remains.
-            
-            # Check if this tag is a descendant of another tag in the found list?
-            # This is O(N^2).
-            # Easier: just check if parent is in tags_of_interest.
-            if element.parent and element.parent in found_tags:
-                continue
-
-            text = element.get_text(separator=" ", strip=True)
-            if not text: continue
-            
-            if text[-1] not in '.!?:;"':
-                text = text + '.'
-            
-            if element.name in ['h1', 'h2', 'h3', 'h4', 'h5', 'h6']:
-                text_parts.append(f"{text}...")
-            elif element.name == 'li':
-                text_parts.append(f"{text}") 
+        for segment in segments:
+            if isinstance(segment, list):
+                _append_text(text_parts, 'p', _run_text(segment, paragraph_types))
+                stack = [(node, 'p') for node in reversed(segment)]
             else:
-                text_parts.append(text)
+                stack = [(segment, markdown_div.name)]
+
+            while stack:
+                element, parent_name = stack.pop()
+                if not isinstance(element, Tag):
+                    continue
+                if id(element) in flattened:
+                    stack.extend((child, parent_name) for child in reversed(element.contents))
+                    continue
+                if element.name in TEXT_TAGS and parent_name not in TEXT_TAGS:
+                    _append_text(text_parts, element.name, element.get_text(separator=" ", strip=True))
+                stack.extend((child, element.name) for child in reversed(element.contents))
         
         result = " ".join(text_parts)
         result = re.sub(r'\.{4,}', '...', result)
@@ -179,3 +126,72 @@ class GeminiAdapter(BaseAdapter):
         result = re.sub(r'\s+', ' ', result).strip()
         
         return result
+
+
+def _flattened_wrappers(root):
+    """
+    ids of the wrappers below root that contain a block tag. Unwrapping one of
+    them never changes which blocks the others contain (the innermost blocks
+    are never unwrapped), so the set is computed in one bottom-up pass.
+    """
+    order = []  # (tag, index of its parent in order, -1 for the top level)
+    stack = [(child, -1) for child in reversed(root.contents) if isinstance(child, Tag)]
+    while stack:
+        tag, parent = stack.pop()
+        order.append((tag, parent))
+        index = len(order) - 1
+        stack.extend((child, index) for child in reversed(tag.contents) if isinstance(child, Tag))
+
+    has_block = [False] * len(order)
+    flattened = set()
+    for index in range(len(order) - 1, -1, -1):
+        tag, parent = order[index]
+        if has_block[index] and tag.name in WRAPPER_TAGS:
+            flattened.add(id(tag))
+        if parent >= 0 and (has_block[index] or tag.name in BLOCK_TAGS):
+            has_block[parent] = True
+    return flattened
+
+
+def _children(node, flattened):
+    """Children of node, reading through the flattened wrappers."""
+    children = []
+    stack = list(reversed(node.contents))
+    while stack:
+        child = stack.pop()
+        if isinstance(child, Tag) and id(child) in flattened:
+            stack.extend(reversed(child.contents))
+        else:
+            children.append(child)
+    return children
+
+
+def _has_content(run):
+    """A run of inline nodes is a paragraph unless it is only whitespace."""
+    return any(isinstance(node, Tag) or node.strip() for node in run)
+
+
+def _run_text(run, types):
+    """get_text(separator=" ", strip=True) of a <p> holding the run's nodes."""
+    strings = []
+    for node in run:
+        for string in ([node] if not isinstance(node, Tag) else node.descendants):
+            if isinstance(string, Tag) or type(string) not in types:
+                continue
+            string = string.strip()
+            if string:
+                strings.append(string)
+    return " ".join(strings)
+
+
+def _append_text(text_parts, name, text):
+    if not text:
+        return
+    
+    if text[-1] not in '.!?:;"':
+        text = text + '.'
+    
+    if name in HEADING_TAGS:
+        text_parts.append(f"{text}...")
+    else:
+        text_parts.append(text)
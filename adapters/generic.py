@@ -1,12 +1,23 @@
 
 from .base import BaseAdapter
-from .reader_mode import reader_extract_content, reader_extract_metadata
+from .junk import JunkFilter
+from .reader_mode import reader_extract_with_tier, reader_extract_metadata
 from bs4 import Tag, NavigableString
 import json
 import re
 import os
 
 class GenericAdapter(BaseAdapter):
+    # Boilerplate removed by the heuristic fallback, on the whole document
+    junk_filter = JunkFilter(
+        tags=["script", "style", "nav", "header", "footer", "aside", "form", "iframe", "noscript", "figure", "button", "input"],
+        selectors=[
+            ".share", ".social", ".comment", ".meta", ".tags", ".banner", ".promo", ".newsletter",
+            ".navigation", ".sidebar", ".related", ".breadcrumbs", ".author-bio", ".date", 
+            "#cookie-banner", "#subscribe-modal", ".paywall", ".teaser", ".recruitment",
+            ".noprint", ".hidden", ".visually-hidden", ".feed"
+        ],
+    )
     def can_handle(self):
         return True # Fallback
 
@@ -18,13 +29,13 @@ class GenericAdapter(BaseAdapter):
         filename_title = os.path.splitext(filename)[0]
 
         # --- Titre ---
-        og_title = soup.find("meta", property="og:title")
-        if og_title and og_title.get("content"):
-            meta["title"] = og_title["content"].strip()
+        og_title = self.head.meta(property="og:title")
+        if og_title:
+            meta["title"] = og_title.strip()
         
         if not meta["title"]:
-            if soup.title and soup.title.string:
-                meta["title"] = soup.title.string.strip()
+            if self.head.title:
+                meta["title"] = self.head.title.strip()
 
         if not meta["title"]:
             h1_tag = soup.find("h1")
@@ -46,32 +57,29 @@ class GenericAdapter(BaseAdapter):
         # --- Auteur (JSON-LD & Meta) ---
         # (Simplified extraction for generic)
         author = "Unknown Author"
-        meta_author = soup.find("meta", attrs={"name": "author"}) or \
-                      soup.find("meta", property="article:author")
-        if meta_author and meta_author.get("content"):
-             author = meta_author["content"].strip()
+        meta_author = self.head.meta(name="author") or \
+                      self.head.meta(property="article:author")
+        if meta_author:
+             author = meta_author.strip()
         meta["author"] = author
 
         # --- URL ---
-        meta_url = soup.find("meta", property="og:url") or soup.find("link", rel="canonical")
+        meta_url = self.head.meta(property="og:url") or self.head.link("canonical")
         if meta_url:
-            if meta_url.name == "link":
-                meta["url"] = meta_url.get("href", "").strip()
-            else:
-                meta["url"] = meta_url.get("content", "").strip()
+            meta["url"] = meta_url.strip()
 
         # --- Date ---
-        meta_date = soup.find("meta", property="article:published_time") or \
-                    soup.find("meta", attrs={"name": "date"})
-        if meta_date and meta_date.get("content"):
-            meta["date"] = meta_date["content"].strip()
+        meta_date = self.head.meta(property="article:published_time") or \
+                    self.head.meta(name="date")
+        if meta_date:
+            meta["date"] = meta_date.strip()
 
         # --- Description ---
         # Try og:description first, but generate a longer one from content
-        meta_desc = soup.find("meta", property="og:description") or \
-                    soup.find("meta", attrs={"name": "description"})
-        if meta_desc and meta_desc.get("content"):
-            og_desc = meta_desc["content"].strip()
+        meta_desc = self.head.meta(property="og:description") or \
+                    self.head.meta(name="description")
+        if meta_desc:
+            og_desc = meta_desc.strip()
             # If og:description is short (< 300 chars), supplement with article content
             if len(og_desc) < 300:
                 long_desc = self._generate_long_description()
@@ -83,18 +91,18 @@ class GenericAdapter(BaseAdapter):
             meta["description"] = self._generate_long_description()
 
         # --- Image ---
-        meta_image = soup.find("meta", property="og:image")
-        if meta_image and meta_image.get("content"):
-            meta["image_url"] = meta_image["content"].strip()
+        meta_image = self.head.meta(property="og:image")
+        if meta_image:
+            meta["image_url"] = meta_image.strip()
 
         # --- Média ---
-        og_site_name = soup.find("meta", property="og:site_name")
-        if og_site_name and og_site_name.get("content"):
-            meta["media"] = og_site_name["content"].strip()
+        og_site_name = self.head.meta(property="og:site_name")
+        if og_site_name:
+            meta["media"] = og_site_name.strip()
         else:
-            app_name = soup.find("meta", attrs={"name": "application-name"})
-            if app_name and app_name.get("content"):
-                meta["media"] = app_name["content"].strip()
+            app_name = self.head.meta(name="application-name")
+            if app_name:
+                meta["media"] = app_name.strip()
                 
         # --- Trafilatura Reader Mode Fallback ---
         # Si certains champs importants sont vides, essayons Reader Mode
@@ -121,37 +129,30 @@ class GenericAdapter(BaseAdapter):
         soup = self.soup
         html_string = str(soup)
         
-        # 0. Essai via Reader Mode (Trafilatura) en priorité pour le Generic
-        reader_content = reader_extract_content(html_string)
+        # 0. Essai via Reader Mode (Trafilatura) en priorité pour le Generic:
+        # passe rapide, puis passe complète si la qualité est insuffisante
+        reader_content, tier, _ = reader_extract_with_tier(html_string)
         if reader_content and len(reader_content) > 100:
+            self.extraction_tier = tier
             return reader_content
 
         # 1. Cleaning Fallback (si Reader Mode a échoué)
-        for element in soup(["script", "style", "nav", "header", "footer", "aside", "form", "iframe", "noscript", "figure", "button", "input"]):
-            element.extract()
-
-        junk_selectors = [
-            ".share", ".social", ".comment", ".meta", ".tags", ".banner", ".promo", ".newsletter",
-            ".navigation", ".sidebar", ".related", ".breadcrumbs", ".author-bio", ".date", 
-            "#cookie-banner", "#subscribe-modal", ".paywall", ".teaser", ".recruitment",
-            ".noprint", ".hidden", ".visually-hidden", ".feed"
-        ]
-        for selector in junk_selectors:
-            for element in soup.select(selector):
-                element.extract()
+        self.extraction_tier = "heuristic"
+        view = self._content_view(soup)
         
         # 2. Main Content Detection
-        main_content = soup.find('article')
+        main_content = view.find('article')
         if not main_content:
-            main_content = soup.find('main')
+            main_content = view.find('main')
         if not main_content:
-            main_content = soup.find('div', role='main')
+            main_content = next((div for div in view.elements()
+                                 if div.name == 'div' and div.get('role') == 'main'), None)
             
         if not main_content:
             max_p_count = 0
             best_div = None
-            for div in soup.find_all('div'):
-                p_count = len(div.find_all('p', recursive=False))
+            for div in view.find_all('div'):
+                p_count = sum(1 for child in view.children(div) if child.name == 'p')
                 if p_count > max_p_count:
                     max_p_count = p_count
                     best_div = div
@@ -166,10 +167,10 @@ class GenericAdapter(BaseAdapter):
 
         # 3. Text Generation
         text_parts = []
-        relevant_tags = main_content.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'p', 'li'])
+        relevant_tags = view.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'p', 'li'], main_content)
         
         for tag in relevant_tags:
-            text = tag.get_text(separator=" ", strip=True)
+            text = view.get_text(tag, separator=" ", strip=True)
             if not text: continue
             
             if not text[-1] in '.!?':
@@ -0,0 +1,69 @@
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+JSON_LD_TYPE = "application/ld+json"
+
+
+class HeadMetadata:
+    """
+    Metadata table of a document, built in a single traversal: <meta>
+    contents by property and by name, <link> hrefs by rel, the <title> text
+    and the parsed JSON-LD objects.
+
+    Lookups return the value of the first matching element in document
+    order, like soup.find() did, so adapters read their metadata in constant
+    time instead of walking the tree once per field. Metadata is collected
+    from the whole document, not only <head>: SingleFile pages and some
+    sites put <meta> or JSON-LD scripts in <body>.
+    """
+
+    def __init__(self, soup):
+        self.properties = {}  # "og:title" -> [content, ...]
+        self.names = {}       # "author" -> [content, ...]
+        self.links = {}       # "canonical" -> [href, ...]
+        self.title = None
+        self.json_ld = []
+
+        for tag in soup.find_all(["meta", "link", "title", "script"]):
+            if tag.name == "meta":
+                content = tag.get("content") or ""
+                if tag.get("property"):
+                    self.properties.setdefault(tag["property"], []).append(content)
+                if tag.get("name"):
+                    self.names.setdefault(tag["name"], []).append(content)
+            elif tag.name == "link":
+                rel = tag.get("rel") or []
+                if isinstance(rel, str):
+                    rel = rel.split()
+                for value in rel:
+                    self.links.setdefault(value, []).append(tag.get("href") or "")
+            elif tag.name == "title":
+                if self.title is None:
+                    self.title = tag.get_text()
+            elif tag.get("type") == JSON_LD_TYPE:
+                try:
+                    self.json_ld.append(json.loads(tag.string))
+                except (TypeError, ValueError):
+                    logger.debug("Skipping invalid JSON-LD script")
+
+    def meta(self, property=None, name=None):
+        """
+        Content of the first <meta property=...> (or <meta name=...>), "" if
+        it has no content attribute, None if there is no such element.
+        """
+        values = self.meta_all(property=property, name=name)
+        return values[0] if values else None
+
+    def meta_all(self, property=None, name=None):
+        """Contents of every <meta property=...> (or <meta name=...>), in document order."""
+        if property is not None:
+            return self.properties.get(property, [])
+        return self.names.get(name, [])
+
+    def link(self, rel):
+        """href of the first <link rel=...>, None if there is none."""
+        values = self.links.get(rel)
+        return values[0] if values else None
+
@@ -0,0 +1,76 @@
+import re
+import time
+
+import soupsieve
+from bs4 import Tag
+
+DISPLAY_NONE = re.compile(r'display\s*:\s*none', re.IGNORECASE)
+
+
+def is_hidden(element):
+    """Checks if an element is hidden via inline style or the hidden attribute."""
+    if isinstance(element, Tag):
+        style = element.get('style', '')
+        if style and DISPLAY_NONE.search(style):
+            return True
+        if element.has_attr('hidden'):
+            return True
+    return False
+
+
+class JunkFilter:
+    """
+    Boilerplate removal compiled once per adapter: tag names plus CSS
+    selectors (compiled into a single soupsieve matcher) plus hidden
+    elements (SingleFile keeps the hidden duplicates of responsive blocks).
+
+    find() walks the container once and returns the matching elements without
+    touching the tree (adapters exclude them from a ContentView), remove()
+    extracts them with their subtree. Either way this replaces one traversal
+    per tag list and per selector. Selectors are matched on the tree before
+    anything is removed, which gives the same result as removing them one
+    after the other as long as they do not use sibling combinators or
+    positional pseudo-classes.
+    """
+
+    def __init__(self, tags=(), selectors=(), hidden=True):
+        self.tags = frozenset(tags)
+        self.selectors = list(selectors)
+        self.matcher = soupsieve.compile(", ".join(selectors)) if selectors else None
+        self.hidden = hidden
+
+    def find(self, container):
+        """
+        Finds the outermost junk elements below container (not container
+        itself), in document order. Returns (elements, stats) with stats =
+        {"removed": elements found, "hidden": of which hidden, "nodes":
+        elements found including their descendants, "seconds"}.
+        """
+        start = time.perf_counter()
+        junk = []
+        hidden = 0
+        stack = [child for child in reversed(container.contents) if isinstance(child, Tag)]
+        while stack:
+            element = stack.pop()
+            if element.name in self.tags or (self.matcher is not None and self.matcher.match(element)):
+                junk.append(element)
+                continue
+            if self.hidden and is_hidden(element):
+                junk.append(element)
+                hidden += 1
+                continue
+            stack.extend(child for child in reversed(element.contents) if isinstance(child, Tag))
+
+        nodes = sum(1 + sum(1 for child in element.descendants if isinstance(child, Tag))
+                    for element in junk)
+        return junk, {"removed": len(junk), "hidden": hidden, "nodes": nodes,
+                      "seconds": time.perf_counter() - start}
+
+    def remove(self, container):
+        """Extracts the junk elements below container. Returns the stats of find()."""
+        start = time.perf_counter()
+        junk, stats = self.find(container)
+        for element in junk:
+            element.extract()
+        stats["seconds"] = time.perf_counter() - start
+        return stats
@@ -1,5 +1,6 @@
 
 from .base import BaseAdapter
+from .view import ContentView
 from bs4 import Tag
 import re
 import os
@@ -10,8 +11,8 @@ class LeMondeDiplomatiqueAdapter(BaseAdapter):
         # Often "Le Monde diplomatique" is in the title or footer
         if "Le Monde diplomatique" in self.filename:
             return True
-        og_site = self.soup.find("meta", property="og:site_name")
-        if og_site and "Le Monde diplomatique" in og_site.get("content", ""):
+        og_site = self.head.meta(property="og:site_name")
+        if og_site and "Le Monde diplomatique" in og_site:
             return True
         return False
 
@@ -22,13 +23,13 @@ class LeMondeDiplomatiqueAdapter(BaseAdapter):
         filename_title = os.path.splitext(filename)[0]
 
         # Title
-        og_title = soup.find("meta", property="og:title")
-        if og_title and og_title.get("content"):
-            meta["title"] = og_title["content"].strip()
+        og_title = self.head.meta(property="og:title")
+        if og_title:
+            meta["title"] = og_title.strip()
         
         if not meta["title"]:
-            if soup.title and soup.title.string:
-                meta["title"] = soup.title.string.strip()
+            if self.head.title:
+                meta["title"] = self.head.title.strip()
 
         if not meta["title"]:
             h1_tag = soup.find("h1")
@@ -49,9 +50,9 @@ class LeMondeDiplomatiqueAdapter(BaseAdapter):
 
         # Author
         # LMD often has author in og:article:author or specific class
-        meta_author = soup.find("meta", property="article:author")
-        if meta_author and meta_author.get("content"):
-            meta["author"] = meta_author["content"].strip()
+        meta_author = self.head.meta(property="article:author")
+        if meta_author:
+            meta["author"] = meta_author.strip()
         else:
             author_span = soup.select_one(".auteurs a")
             if author_span:
@@ -61,19 +62,19 @@ class LeMondeDiplomatiqueAdapter(BaseAdapter):
         meta["media"] = "Le Monde diplomatique"
         
         # URL
-        meta_url = soup.find("meta", property="og:url") or soup.find("link", rel="canonical")
+        meta_url = self.head.meta(property="og:url") or self.head.link("canonical")
         if meta_url:
-            meta["url"] = meta_url.get("href", meta_url.get("content", "")).strip()
+            meta["url"] = meta_url.strip()
 
         # Date
-        meta_date = soup.find("meta", property="article:published_time")
-        if meta_date and meta_date.get("content"):
-            meta["date"] = meta_date["content"].strip()
+        meta_date = self.head.meta(property="article:published_time")
+        if meta_date:
+            meta["date"] = meta_date.strip()
 
         # Description
-        meta_desc = soup.find("meta", property="og:description")
-        if meta_desc and meta_desc.get("content"):
-            og_desc = meta_desc["content"].strip()
+        meta_desc = self.head.meta(property="og:description")
+        if meta_desc:
+            og_desc = meta_desc.strip()
             # If og:description is short (< 300 chars), supplement with article content
             if len(og_desc) < 300:
                 long_desc = self._generate_long_description()
@@ -85,9 +86,9 @@ class LeMondeDiplomatiqueAdapter(BaseAdapter):
             meta["description"] = self._generate_long_description()
 
         # Image
-        meta_image = soup.find("meta", property="og:image")
-        if meta_image and meta_image.get("content"):
-            meta["image_url"] = meta_image["content"].strip()
+        meta_image = self.head.meta(property="og:image")
+        if meta_image:
+            meta["image_url"] = meta_image.strip()
 
         return meta
         
@@ -96,38 +97,31 @@ class LeMondeDiplomatiqueAdapter(BaseAdapter):
         main_content = self.soup.select_one("div.texte")
         chapo = self.soup.select_one("div.chapo")
         
-        container = self.soup.new_tag("div")
-        
-        if chapo:
-             container.append(chapo)
-        
-        if main_content:
-            container.append(main_content)
-            
         if not main_content and not chapo:
             return ""
-            
-        # Clean-up inside the specific content
-        # (Generic cleanup might have already been done if we called a shared helper, 
-        # but here we do adapter specific stuff)
-        
-        # Pre-process: unwrap
-        while True:
-            wrapper = container.find(lambda t: t.name in ['p', 'div'] and t.find(['p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6']))
-            if not wrapper: break
-            wrapper.unwrap()
-            
+
+        # Read-only views: moving chapo and main_content into a new container
+        # took them out of the soup, so a second call (the long description of
+        # extract_metadata, then the content itself) found nothing. Each part
+        # skips the other if one is nested in the other; nested p/div
+        # containing other block elements are skipped.
         text_parts = []
-        for tag in container.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'p']):
-            text = tag.get_text(separator=" ", strip=True)
-            if not text: continue
-            
-            if not text[-1] in '.!?':
-                text = text + '.'
-                
-            if tag.name.startswith('h'):
-                text_parts.append(f"{text}...")
-            else:
-                text_parts.append(f"{text}.")
+        for part, other in ((chapo, main_content), (main_content, chapo)):
+            if not part:
+                continue
+            view = ContentView(part)
+            if other:
+                view.exclude(other)
+            for tag in view.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'p'], flatten=['p', 'div']):
+                text = view.get_text(tag, separator=" ", strip=True)
+                if not text: continue
+
+                if not text[-1] in '.!?':
+                    text = text + '.'
+
+                if tag.name.startswith('h'):
+                    text_parts.append(f"{text}...")
+                else:
+                    text_parts.append(f"{text}.")
                 
         return " ".join(text_parts)
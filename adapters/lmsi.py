@@ -1,17 +1,29 @@
 from .base import BaseAdapter
+from .junk import JunkFilter
 import re
 import os
 
 class LMSIAdapter(BaseAdapter):
     """Adapter for lmsi.net articles"""
-    
+
+    junk_filter = JunkFilter(
+        tags=["script", "style", "nav", "figure", "img", "iframe"],
+        selectors=[
+            ".info-publi", ".spip_note_ref", ".notes", ".portfolio", 
+            ".share", ".social", ".author", ".tags", ".related", "#forum",
+            ".cartouche h1"
+        ],
+    )
+    content_containers = (".contenu-principal",)
+    body_selectors = ("h1", ".vcard.author", ".auteurs", "abbr.published")
+
     def can_handle(self):
-        og_site = self.soup.find("meta", property="og:site_name")
-        if og_site and "lmsi.net" in og_site.get("content", ""):
+        og_site = self.head.meta(property="og:site_name")
+        if og_site and "lmsi.net" in og_site:
             return True
             
-        og_url = self.soup.find("meta", property="og:url")
-        if og_url and "lmsi.net" in og_url.get("content", ""):
+        og_url = self.head.meta(property="og:url")
+        if og_url and "lmsi.net" in og_url:
             return True
         
         if "lmsi.net" in self.filename:
@@ -24,9 +36,9 @@ class LMSIAdapter(BaseAdapter):
         soup = self.soup
         
         # Title
-        og_title = soup.find("meta", property="og:title")
-        if og_title and og_title.get("content"):
-            title = og_title["content"].strip()
+        og_title = self.head.meta(property="og:title")
+        if og_title:
+            title = og_title.strip()
             title = re.sub(r'\s*[-–|]\s*Les mots sont importants.*$', '', title, flags=re.IGNORECASE)
             meta["title"] = title
             
@@ -46,28 +58,28 @@ class LMSIAdapter(BaseAdapter):
         meta["media"] = "LMSI"
         
         # URL
-        meta_url = soup.find("meta", property="og:url") or soup.find("link", rel="canonical")
+        meta_url = self.head.meta(property="og:url") or self.head.link("canonical")
         if meta_url:
-            meta["url"] = meta_url.get("content", meta_url.get("href", "")).strip()
+            meta["url"] = meta_url.strip()
 
         # Date
-        meta_date = soup.find("meta", property="article:published_time")
-        if meta_date and meta_date.get("content"):
-            meta["date"] = meta_date["content"].strip()
+        meta_date = self.head.meta(property="article:published_time")
+        if meta_date:
+            meta["date"] = meta_date.strip()
         else:
             abbr_date = soup.find("abbr", class_="published")
             if abbr_date and abbr_date.get("title"):
                 meta["date"] = abbr_date["title"].strip()
 
         # Description
-        meta_desc = soup.find("meta", property="og:description") or soup.find("meta", attrs={"name": "description"})
-        if meta_desc and meta_desc.get("content"):
-            meta["description"] = meta_desc["content"].strip()
+        meta_desc = self.head.meta(property="og:description") or self.head.meta(name="description")
+        if meta_desc:
+            meta["description"] = meta_desc.strip()
 
         # Image
-        meta_image = soup.find("meta", property="og:image")
-        if meta_image and meta_image.get("content"):
-            meta["image_url"] = meta_image["content"].strip()
+        meta_image = self.head.meta(property="og:image")
+        if meta_image:
+            meta["image_url"] = meta_image.strip()
 
         return meta
         
@@ -77,37 +89,20 @@ class LMSIAdapter(BaseAdapter):
         if not container:
             return ""
 
-        # Remove junk
-        for el in container(["script", "style", "nav", "figure", "img", "iframe"]):
-            el.extract()
-            
-        junk_selectors = [
-            ".info-publi", ".spip_note_ref", ".notes", ".portfolio", 
-            ".share", ".social", ".author", ".tags", ".related", "#forum",
-            ".cartouche h1"
-        ]
-        for selector in junk_selectors:
-            for el in container.select(selector):
-                el.extract()
-
-        # Unwrap wrappers to avoid missing text
-        while True:
-            wrapper = container.find(lambda t: t.name in ['div', 'span'] and 
-                                     t.find(['p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6']))
-            if not wrapper:
-                break
-            wrapper.unwrap()
+        # Read-only view without junk and hidden elements. Unwrapping the
+        # div/span wrappers never changed which tags are found below, nor
+        # which blocks they contain: the view reads through them as is.
+        view = self._content_view(container)
 
         # Extract text
         text_parts = []
         seen = set()
         
-        for tag in container.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'p', 'blockquote', 'li']):
-            # Skip nested tags that have block children
-            if tag.find(['h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'p', 'blockquote']):
-                continue
-                
-            text = tag.get_text(separator=" ", strip=True)
+        # Skip nested tags that have block children
+        for tag in view.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'p', 'blockquote', 'li'],
+                                 flatten=['h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'p', 'blockquote', 'li'],
+                                 blocks=['h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'p', 'blockquote']):
+            text = view.get_text(tag, separator=" ", strip=True)
             if not text or len(text) < 15:
                 continue
                 
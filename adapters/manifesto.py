@@ -1,5 +1,6 @@
 
 from .base import BaseAdapter
+from .junk import JunkFilter
 from bs4 import Tag
 import re
 import os
@@ -7,16 +8,37 @@ import os
 
 class ManifestoAdapter(BaseAdapter):
     """Adapter for Manifesto XXI articles (manifesto-21.com)"""
-    
+
+    junk_filter = JunkFilter(
+        tags=["script", "style", "nav", "header", "footer",
+              "aside", "form", "iframe", "noscript", "figure",
+              "button", "input", "img", "video", "audio"],
+        # Elementor specific
+        selectors=[
+            ".share", ".social", ".sharing",
+            ".author", ".post-author", ".elementor-author-box",
+            ".tags", ".post-tags",
+            ".comments",
+            ".related", ".jet-smart-listing",
+            ".navigation", ".nav-links",
+            ".meta", ".post-meta", ".elementor-post-info",
+            ".elementor-widget-jet-woo-builder-archive-sale-badge",
+            ".elementor-widget-theme-post-featured-image",
+            ".elementor-widget-post-navigation",
+            "[class*='share']", "[class*='social']",
+            ".jet-listing-dynamic-link", ".elementor-icon-list"
+        ],
+    )
+
     def can_handle(self):
         # Check og:site_name
-        og_site = self.soup.find("meta", property="og:site_name")
-        if og_site and "Manifesto" in og_site.get("content", ""):
+        og_site = self.head.meta(property="og:site_name")
+        if og_site and "Manifesto" in og_site:
             return True
         
         # Check URL
-        og_url = self.soup.find("meta", property="og:url")
-        if og_url and "manifesto-21.com" in og_url.get("content", ""):
+        og_url = self.head.meta(property="og:url")
+        if og_url and "manifesto-21.com" in og_url:
             return True
         
         # Check filename
@@ -32,16 +54,16 @@ class ManifestoAdapter(BaseAdapter):
         filename_title = os.path.splitext(filename)[0]
 
         # Title
-        og_title = soup.find("meta", property="og:title")
-        if og_title and og_title.get("content"):
-            title = og_title["content"].strip()
+        og_title = self.head.meta(property="og:title")
+        if og_title:
+            title = og_title.strip()
             # Clean " - Manifesto XXI" suffix
             title = re.sub(r'\s*[-–]\s*Manifesto\s*(XXI|21)?\s*$', '', title, flags=re.IGNORECASE)
             meta["title"] = title
         
         if not meta["title"]:
-            if soup.title and soup.title.string:
-                meta["title"] = soup.title.string.strip()
+            if self.head.title:
+                meta["title"] = self.head.title.strip()
 
         if not meta["title"]:
             h1_tag = soup.find("h1")
@@ -55,22 +77,20 @@ class ManifestoAdapter(BaseAdapter):
         author = None
         
         # 1. Check meta name="author" (most common for Manifesto XXI)
-        meta_author = soup.find("meta", attrs={"name": "author"})
-        if meta_author and meta_author.get("content"):
-            author = meta_author["content"].strip()
+        meta_author = self.head.meta(name="author")
+        if meta_author:
+            author = meta_author.strip()
         
         # 2. Check meta property="article:author"
         if not author:
-            meta_author = soup.find("meta", property="article:author")
-            if meta_author and meta_author.get("content"):
-                author = meta_author["content"].strip()
+            meta_author = self.head.meta(property="article:author")
+            if meta_author:
+                author = meta_author.strip()
         
-        # 3. Try JSON-LD schema
+        # 3. Try JSON-LD schema (parsed once in the metadata table)
         if not author:
-            import json
-            for script in soup.find_all('script', type='application/ld+json'):
+            for data in self.head.json_ld:
                 try:
-                    data = json.loads(script.string)
                     if isinstance(data, dict):
                         if '@graph' in data:
                             for item in data['@graph']:
@@ -87,7 +107,7 @@ class ManifestoAdapter(BaseAdapter):
                                 author = author_data.get('name', '')
                             elif isinstance(author_data, str):
                                 author = author_data
-                except:
+                except (AttributeError, TypeError):
                     pass
         
         # 4. Try HTML elements
@@ -103,19 +123,19 @@ class ManifestoAdapter(BaseAdapter):
         meta["media"] = "Manifesto XXI"
         
         # URL
-        meta_url = soup.find("meta", property="og:url") or soup.find("link", rel="canonical")
+        meta_url = self.head.meta(property="og:url") or self.head.link("canonical")
         if meta_url:
-            meta["url"] = meta_url.get("href", meta_url.get("content", "")).strip()
+            meta["url"] = meta_url.strip()
 
         # Date
-        meta_date = soup.find("meta", property="article:published_time")
-        if meta_date and meta_date.get("content"):
-            meta["date"] = meta_date["content"].strip()
+        meta_date = self.head.meta(property="article:published_time")
+        if meta_date:
+            meta["date"] = meta_date.strip()
 
         # Description
-        meta_desc = soup.find("meta", property="og:description")
-        if meta_desc and meta_desc.get("content"):
-            og_desc = meta_desc["content"].strip()
+        meta_desc = self.head.meta(property="og:description")
+        if meta_desc:
+            og_desc = meta_desc.strip()
             if len(og_desc) < 300:
                 long_desc = self._generate_long_description()
                 meta["description"] = long_desc if long_desc else og_desc
@@ -125,9 +145,9 @@ class ManifestoAdapter(BaseAdapter):
             meta["description"] = self._generate_long_description()
 
         # Image
-        meta_image = soup.find("meta", property="og:image")
-        if meta_image and meta_image.get("content"):
-            meta["image_url"] = meta_image["content"].strip()
+        meta_image = self.head.meta(property="og:image")
+        if meta_image:
+            meta["image_url"] = meta_image.strip()
 
         return meta
         
@@ -143,60 +163,29 @@ class ManifestoAdapter(BaseAdapter):
         if not article:
             return ""
         
-        # Create a copy to avoid modifying original
-        container = article.__copy__()
-        
-        # Remove unwanted elements
-        for element in container(["script", "style", "nav", "header", "footer", 
-                                   "aside", "form", "iframe", "noscript", "figure", 
-                                   "button", "input", "img", "video", "audio"]):
-            element.extract()
-
-        # Remove specific junk selectors - Elementor specific
-        junk_selectors = [
-            ".share", ".social", ".sharing",
-            ".author", ".post-author", ".elementor-author-box",
-            ".tags", ".post-tags",
-            ".comments",
-            ".related", ".jet-smart-listing",
-            ".navigation", ".nav-links",
-            ".meta", ".post-meta", ".elementor-post-info",
-            ".elementor-widget-jet-woo-builder-archive-sale-badge",
-            ".elementor-widget-theme-post-featured-image",
-            ".elementor-widget-post-navigation",
-            "[class*='share']", "[class*='social']",
-            ".jet-listing-dynamic-link", ".elementor-icon-list"
-        ]
-        for selector in junk_selectors:
-            for element in container.select(selector):
-                element.extract()
+        # Read-only view without unwanted elements, junk selectors and hidden elements
+        view = self._content_view(article)
 
-        # Remove standalone date/author paragraphs (very short paragraphs at the start)
-        paragraphs = container.find_all('p')
+        # Skip standalone date/author paragraphs (very short paragraphs at the start)
+        paragraphs = view.find_all('p')
         for p in paragraphs[:5]:  # Only check first 5
-            text = p.get_text(strip=True)
+            text = view.get_text(p, strip=True)
             # Skip short metadata-like paragraphs
             if len(text) < 30:
                 # Check if it looks like a date or author name
                 if re.match(r'^\d{1,2}\s+\w+\s+\d{4}$', text):  # Date pattern
-                    p.extract()
+                    view.exclude(p)
                 elif len(text.split()) <= 3:  # Short name
-                    p.extract()
-        
-        # Pre-process: unwrap nested elements
-        while True:
-            wrapper = container.find(lambda t: t.name in ['p', 'div'] and 
-                                     t.find(['p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6']))
-            if not wrapper:
-                break
-            wrapper.unwrap()
-            
-        # Extract text from relevant tags
+                    view.exclude(p)
+
+        # Extract text from relevant tags (nested p/div containing other
+        # block elements are skipped)
         text_parts = []
         seen_texts = set()  # Avoid duplicates
         
-        for tag in container.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'p', 'blockquote', 'li']):
-            text = tag.get_text(separator=" ", strip=True)
+        for tag in view.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'p', 'blockquote', 'li'],
+                                 flatten=['p', 'div']):
+            text = view.get_text(tag, separator=" ", strip=True)
             if not text:
                 continue
             
@@ -1,10 +1,16 @@
 
 from .base import BaseAdapter
+from .junk import JunkFilter
 from bs4 import Tag
 import re
 import os
 
 class MediapartAdapter(BaseAdapter):
+    # "À lire aussi" blocks, accessibility hidden text, and other noise
+    # Note: Do NOT remove dropcap-wrapper as it contains the first paragraph text
+    junk_filter = JunkFilter(selectors=[".lire-aussi", ".r-interne", ".read-also", ".screen-reader-only", "figure"])
+    body_selectors = ("div.news__rich-text-content", "div.content-page__full")
+
     def can_handle(self):
         if "Mediapart" in self.filename:
             return True
@@ -20,13 +26,13 @@ class MediapartAdapter(BaseAdapter):
         filename_title = os.path.splitext(filename)[0]
 
         # Title
-        og_title = soup.find("meta", property="og:title")
-        if og_title and og_title.get("content"):
-            meta["title"] = og_title["content"].strip()
+        og_title = self.head.meta(property="og:title")
+        if og_title:
+            meta["title"] = og_title.strip()
         
         if not meta["title"]:
-            if soup.title and soup.title.string:
-                meta["title"] = soup.title.string.strip()
+            if self.head.title:
+                meta["title"] = self.head.title.strip()
 
         if not meta["title"]:
             h1_tag = soup.find("h1")
@@ -46,27 +52,27 @@ class MediapartAdapter(BaseAdapter):
         meta["title"] = title
 
         # Author
-        meta_author = soup.find("meta", attrs={"name": "author"})
-        if meta_author and meta_author.get("content"):
-            meta["author"] = meta_author["content"].strip()
+        meta_author = self.head.meta(name="author")
+        if meta_author:
+            meta["author"] = meta_author.strip()
 
         # Media
         meta["media"] = "Mediapart"
         
         # URL
-        meta_url = soup.find("meta", property="og:url") or soup.find("link", rel="canonical")
+        meta_url = self.head.meta(property="og:url") or self.head.link("canonical")
         if meta_url:
-            meta["url"] = meta_url.get("href", meta_url.get("content", "")).strip()
+            meta["url"] = meta_url.strip()
 
         # Date
-        meta_date = soup.find("meta", property="article:published_time")
-        if meta_date and meta_date.get("content"):
-            meta["date"] = meta_date["content"].strip()
+        meta_date = self.head.meta(property="article:published_time")
+        if meta_date:
+            meta["date"] = meta_date.strip()
 
         # Description
-        meta_desc = soup.find("meta", property="og:description")
-        if meta_desc and meta_desc.get("content"):
-            og_desc = meta_desc["content"].strip()
+        meta_desc = self.head.meta(property="og:description")
+        if meta_desc:
+            og_desc = meta_desc.strip()
             # If og:description is short (< 300 chars), supplement with article content
             if len(og_desc) < 300:
                 long_desc = self._generate_long_description()
@@ -78,9 +84,9 @@ class MediapartAdapter(BaseAdapter):
             meta["description"] = self._generate_long_description()
 
         # Image
-        meta_image = soup.find("meta", property="og:image")
-        if meta_image and meta_image.get("content"):
-            meta["image_url"] = meta_image["content"].strip()
+        meta_image = self.head.meta(property="og:image")
+        if meta_image:
+            meta["image_url"] = meta_image.strip()
 
         return meta
         
@@ -90,34 +96,19 @@ class MediapartAdapter(BaseAdapter):
         if not main_content:
             return ""
 
-        # Remove "À lire aussi" blocks, accessibility hidden text, and other noise
-        # Note: Do NOT remove dropcap-wrapper as it contains the first paragraph text
-        for node in main_content.select(".lire-aussi, .r-interne, .read-also, .screen-reader-only, figure"): 
-            node.extract()
+        # Read-only view without "À lire aussi" blocks, other noise and hidden elements
+        view = self._content_view(main_content)
             
         # Identify paragraphs and headings
         # Handling nested paragraphs: Mediapart HTML can be very messy with <p> inside <p>.
-        # Strategy: Find all interesting tags, then filter out those that are descendants of another interesting tag.
-        # This keeps the outermost container and avoids duplication.
-        
-        all_tags = main_content.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'p', 'li'])
-        top_level_tags = []
-        all_tags_set = set(all_tags)
-        
-        for tag in all_tags:
-            is_nested = False
-            for parent in tag.parents:
-                if parent == main_content: break # Don't go beyond main container
-                if parent in all_tags_set:
-                    is_nested = True
-                    break
-            if not is_nested:
-                top_level_tags.append(tag)
+        # Strategy: keep only the interesting tags that are not descendants of another
+        # interesting tag. This keeps the outermost container and avoids duplication.
+        top_level_tags = view.find_outermost(['h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'p', 'li'])
         
         text_parts = []
         
         for tag in top_level_tags:
-            text = tag.get_text(separator=" ", strip=True)
+            text = view.get_text(tag, separator=" ", strip=True)
              
             if "À lire aussi" in text and len(text) < 50:
                 continue
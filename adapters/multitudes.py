@@ -1,5 +1,6 @@
 
 from .base import BaseAdapter
+from .junk import JunkFilter
 from bs4 import Tag
 import re
 import os
@@ -7,16 +8,33 @@ import os
 
 class MultitudesAdapter(BaseAdapter):
     """Adapter for Multitudes articles (multitudes.net)"""
-    
+
+    junk_filter = JunkFilter(
+        tags=["script", "style", "nav", "header", "footer",
+              "aside", "form", "iframe", "noscript", "figure",
+              "button", "input", "img", "video", "audio"],
+        selectors=[
+            ".share", ".social", ".sharing",
+            ".author", ".post-author",
+            ".tags", ".post-tags",
+            ".comments",
+            ".related",
+            ".navigation",
+            ".meta", ".post-meta"
+        ],
+    )
+    content_containers = (".entry-content", "article")
+    body_selectors = ("h1",)
+
     def can_handle(self):
         # Check og:site_name
-        og_site = self.soup.find("meta", property="og:site_name")
-        if og_site and "multitudes" in og_site.get("content", "").lower():
+        og_site = self.head.meta(property="og:site_name")
+        if og_site and "multitudes" in og_site.lower():
             return True
         
         # Check URL
-        og_url = self.soup.find("meta", property="og:url")
-        if og_url and "multitudes.net" in og_url.get("content", ""):
+        og_url = self.head.meta(property="og:url")
+        if og_url and "multitudes.net" in og_url:
             return True
         
         # Check filename
@@ -32,16 +50,16 @@ class MultitudesAdapter(BaseAdapter):
         filename_title = os.path.splitext(filename)[0]
 
         # Title
-        og_title = soup.find("meta", property="og:title")
-        if og_title and og_title.get("content"):
-            title = og_title["content"].strip()
+        og_title = self.head.meta(property="og:title")
+        if og_title:
+            title = og_title.strip()
             # Clean " - multitudes" suffix
             title = re.sub(r'\s*[-–]\s*multitudes\s*$', '', title, flags=re.IGNORECASE)
             meta["title"] = title
         
         if not meta["title"]:
-            if soup.title and soup.title.string:
-                meta["title"] = soup.title.string.strip()
+            if self.head.title:
+                meta["title"] = self.head.title.strip()
 
         if not meta["title"]:
             h1_tag = soup.find("h1")
@@ -65,27 +83,27 @@ class MultitudesAdapter(BaseAdapter):
         if authors:
             meta["author"] = ", ".join(authors[:3])  # Limit to 3 authors
         else:
-            meta_author = soup.find("meta", property="article:author")
-            if meta_author and meta_author.get("content"):
-                meta["author"] = meta_author["content"].strip()
+            meta_author = self.head.meta(property="article:author")
+            if meta_author:
+                meta["author"] = meta_author.strip()
 
         # Media
         meta["media"] = "Multitudes"
         
         # URL
-        meta_url = soup.find("meta", property="og:url") or soup.find("link", rel="canonical")
+        meta_url = self.head.meta(property="og:url") or self.head.link("canonical")
         if meta_url:
-            meta["url"] = meta_url.get("href", meta_url.get("content", "")).strip()
+            meta["url"] = meta_url.strip()
 
         # Date
-        meta_date = soup.find("meta", property="article:published_time")
-        if meta_date and meta_date.get("content"):
-            meta["date"] = meta_date["content"].strip()
+        meta_date = self.head.meta(property="article:published_time")
+        if meta_date:
+            meta["date"] = meta_date.strip()
 
         # Description
-        meta_desc = soup.find("meta", property="og:description")
-        if meta_desc and meta_desc.get("content"):
-            og_desc = meta_desc["content"].strip()
+        meta_desc = self.head.meta(property="og:description")
+        if meta_desc:
+            og_desc = meta_desc.strip()
             if len(og_desc) < 300:
                 long_desc = self._generate_long_description()
                 meta["description"] = long_desc if long_desc else og_desc
@@ -95,9 +113,9 @@ class MultitudesAdapter(BaseAdapter):
             meta["description"] = self._generate_long_description()
 
         # Image
-        meta_image = soup.find("meta", property="og:image")
-        if meta_image and meta_image.get("content"):
-            meta["image_url"] = meta_image["content"].strip()
+        meta_image = self.head.meta(property="og:image")
+        if meta_image:
+            meta["image_url"] = meta_image.strip()
 
         return meta
         
@@ -113,48 +131,22 @@ class MultitudesAdapter(BaseAdapter):
         if not entry_content:
             return ""
         
-        # Create a copy to avoid modifying original
-        container = entry_content.__copy__()
-        
-        # Remove unwanted elements
-        for element in container(["script", "style", "nav", "header", "footer", 
-                                   "aside", "form", "iframe", "noscript", "figure", 
-                                   "button", "input", "img", "video", "audio"]):
-            element.extract()
-
-        # Remove author headers (h3 tags that are just author names)
-        for h3 in container.find_all('h3'):
-            text = h3.get_text(strip=True)
-            # If it's a short name-like h3, remove it
+        # Read-only view without unwanted elements, junk selectors and hidden elements
+        view = self._content_view(entry_content)
+
+        # Skip author headers (h3 tags that are just author names)
+        for h3 in view.find_all('h3'):
+            text = view.get_text(h3, strip=True)
+            # If it's a short name-like h3, skip it
             if len(text) < 50 and not any(c in text for c in [':', '.', '?', '!']):
-                h3.extract()
+                view.exclude(h3)
 
-        # Remove specific junk selectors
-        junk_selectors = [
-            ".share", ".social", ".sharing",
-            ".author", ".post-author",
-            ".tags", ".post-tags",
-            ".comments",
-            ".related",
-            ".navigation",
-            ".meta", ".post-meta"
-        ]
-        for selector in junk_selectors:
-            for element in container.select(selector):
-                element.extract()
-        
-        # Pre-process: unwrap nested elements
-        while True:
-            wrapper = container.find(lambda t: t.name in ['p', 'div'] and 
-                                     t.find(['p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6']))
-            if not wrapper:
-                break
-            wrapper.unwrap()
-            
-        # Extract text from relevant tags
+        # Extract text from relevant tags (nested p/div containing other
+        # block elements are skipped)
         text_parts = []
-        for tag in container.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'p', 'blockquote', 'li']):
-            text = tag.get_text(separator=" ", strip=True)
+        for tag in view.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'p', 'blockquote', 'li'],
+                                 flatten=['p', 'div']):
+            text = view.get_text(tag, separator=" ", strip=True)
             if not text:
                 continue
             
@@ -0,0 +1,84 @@
+import logging
+import re
+
+from bs4 import SoupStrainer
+
+from .head import JSON_LD_TYPE
+
+logger = logging.getLogger(__name__)
+
+# Tags always kept by the partial parse: what HeadMetadata reads
+HEAD_TAGS = {"meta", "link", "title"}
+
+# First compound of a CSS selector: optional tag name, then .class / #id parts
+COMPOUND = re.compile(r'^([a-zA-Z][\w-]*)?((?:[.#][\w-]+)*)')
+
+
+def _compound_rule(selector):
+    """
+    (tag, classes, id) rule matching the first compound of a selector, or None
+    if the selector starts with syntax this rule cannot express (attribute
+    selectors, pseudo-classes...). Keeping the outermost element of every
+    selector keeps everything the selector can match inside it.
+    """
+    match = COMPOUND.match(selector.strip())
+    if not match or not match.group(0):
+        return None
+    tag = match.group(1)
+    parts = re.findall(r'[.#][\w-]+', match.group(2))
+    classes = frozenset(part[1:] for part in parts if part[0] == ".")
+    ids = [part[1:] for part in parts if part[0] == "#"]
+    return tag, classes, ids[0] if ids else None
+
+
+class ContainerStrainer(SoupStrainer):
+    """
+    SoupStrainer keeping only the <head> metadata tags and the outermost
+    elements matching the given CSS selectors, with their whole subtree.
+    Text outside of kept elements is dropped.
+
+    Only the first compound of each selector is checked (tag name, classes,
+    id), so the kept set is a superset of what the selectors match: adapters
+    still run their usual select() calls on the partial tree.
+    """
+
+    def __init__(self, selectors):
+        super().__init__()
+        self.rules = []
+        for selector in selectors:
+            for part in selector.split(","):
+                rule = _compound_rule(part)
+                if rule is None:
+                    logger.debug(f"Selector not strainable, ignored: {part.strip()}")
+                elif rule not in self.rules:
+                    self.rules.append(rule)
+
+    def keeps(self, name, attrs):
+        if name in HEAD_TAGS:
+            return True
+        attrs = dict(attrs or {})
+        if name == "script":
+            return attrs.get("type") == JSON_LD_TYPE
+        classes = attrs.get("class") or ""
+        if isinstance(classes, str):
+            classes = classes.split()
+        classes = set(classes)
+        for tag, rule_classes, rule_id in self.rules:
+            if tag and tag != name:
+                continue
+            if rule_id and attrs.get("id") != rule_id:
+                continue
+            if rule_classes <= classes:
+                return True
+        return False
+
+    # beautifulsoup4 >= 4.13
+    def allow_tag_creation(self, nsprefix, name, attrs):
+        return self.keeps(name, attrs)
+
+    def allow_string_creation(self, string):
+        return False
+
+    # beautifulsoup4 4.12
+    def search_tag(self, markup_name=None, markup_attrs={}):
+        return markup_name if self.keeps(markup_name, markup_attrs) else None
@@ -13,6 +13,105 @@ config.set("DEFAULT", "MIN_OUTPUT_SIZE", "1")
 config.set("DEFAULT", "MIN_OUTPUT_COMM_SIZE", "1")
 
 
+# Tiered extraction: a cheap precision-oriented pass first (no fallback
+# extractors), the full configuration only when its result looks poor.
+QUALITY_THRESHOLD = 0.5          # Below this score, escalate to the full pass
+QUALITY_TARGET_CHARS = 1500      # Length giving a full length score
+QUALITY_TARGET_PARAGRAPHS = 4    # Paragraph count giving a full paragraph score
+
+MARKDOWN_LINK = re.compile(r'\[([^\]]*)\]\([^)]*\)')
+
+
+def content_quality(extracted_text, link_chars=0):
+    """
+    Scores an extraction between 0 and 1 from its length, its number of
+    paragraphs and its link density (share of the text inside links: menus,
+    related-article lists). Short, single-block or link-heavy results score low.
+    """
+    if not extracted_text:
+        return 0.0
+    length = len(extracted_text)
+    paragraphs = sum(1 for block in extracted_text.split('\n\n') if block.strip())
+    link_density = min(1.0, link_chars / length)
+    return (min(1.0, length / QUALITY_TARGET_CHARS)
+            * min(1.0, paragraphs / QUALITY_TARGET_PARAGRAPHS)
+            * (1.0 - link_density))
+
+
+def _scored(extracted_text):
+    """
+    Removes the Markdown links of a Trafilatura output (kept only to measure
+    the link density) and scores it. Returns (text, score).
+    """
+    if not extracted_text:
+        return "", 0.0
+    link_chars = 0
+    def unlink(match):
+        nonlocal link_chars
+        link_chars += len(match.group(1))
+        return match.group(1)
+    extracted_text = MARKDOWN_LINK.sub(unlink, extracted_text)
+    return extracted_text, content_quality(extracted_text, link_chars)
+
+
+def _extract_fast(html_string):
+    """Tier 1: precision-oriented Trafilatura pass, without fallback extractors."""
+    extracted_text = trafilatura.extract(
+        html_string,
+        fast=True,
+        favor_precision=True,
+        include_comments=False,
+        include_tables=False,
+        include_links=True,  # Only to measure the link density, see _scored
+        include_images=False,
+        include_formatting=True,
+        config=config
+    )
+    return _scored(extracted_text)
+
+
+def _extract_full(html_string):
+    """Tier 2: Trafilatura with its fallback extractors (slower, better recall)."""
+    extracted_text = trafilatura.extract(
+        html_string,
+        include_comments=False,
+        include_tables=False,
+        include_links=True,  # Scored like the fast pass, see _scored
+        include_images=False,
+        include_formatting=True, # Keep basic formatting to identify headings/paragraphs
+        config=config
+    )
+    return _scored(extracted_text)
+
+
+def reader_extract_with_tier(html_string):
+    """
+    Extracts the main content of an article like reader_extract_content and
+    tells which tier answered: returns (text, tier, score) where tier is
+    "fast", "full" or None when nothing was extracted. The full pass only
+    answers when it scores strictly better than the fast one.
+    """
+    if not html_string:
+        return "", None, 0.0
+        
+    try:
+        extracted_text, score = _extract_fast(html_string)
+        tier = "fast"
+        if score < QUALITY_THRESHOLD:
+            logger.debug(f"Reader mode: fast extraction score {score:.2f}, escalating to full extraction")
+            full_text, full_score = _extract_full(html_string)
+            if full_score > score:
+                extracted_text, score, tier = full_text, full_score, "full"
+        
+        if not extracted_text:
+            return "", None, 0.0
+        return _format_for_tts(extracted_text), tier, round(score, 2)
+        
+    except Exception as e:
+        logger.warning(f"Trafilatura content extraction failed: {e}")
+        return "", None, 0.0
+
+
 def reader_extract_content(html_string):
     """
     Extracts the main content of an article from an HTML string using Trafilatura.
@@ -20,82 +119,64 @@ def reader_extract_content(html_string):
     
     Returns an empty string if extraction fails or is too short.
     """
-    if not html_string:
-        return ""
+    return reader_extract_with_tier(html_string)[0]
+
+
+def _format_for_tts(extracted_text):
+    """Formats Trafilatura output (markdown-like) for TTS."""
+    # Headers are usually prefixed with # or are on their own line
+    text_parts = []
+    
+    lines = extracted_text.split('\n')
+    for i, line in enumerate(lines):
+        line = line.strip()
+        if not line:
+            continue
+            
+        # Remove Markdown header markers (e.g. "## Title")
+        line = re.sub(r'^#+\s+', '', line)
         
-    try:
-        # Extract text with focus on readability and keeping structure
-        extracted_text = trafilatura.extract(
-            html_string,
-            include_comments=False,
-            include_tables=False,
-            include_links=False,
-            include_images=False,
-            include_formatting=True, # Keep basic formatting to identify headings/paragraphs
-            config=config
-        )
+        # Remove academic footnotes (e.g., [1], [ 2 ], [12]) safely anywhere in the text
+        line = re.sub(r'\[\s*\d{1,3}\s*\]', '', line)
         
-        if not extracted_text:
-            return ""
-            
-        # Format for TTS: Trafilatura output is usually markdown-like
-        # Headers are usually prefixed with # or are on their own line
-        text_parts = []
+        # Remove standalone numbers or very short standalone references
+        if re.match(r'^\d+$', line) or (len(line) < 20 and re.match(r'^(sources?|bibliographie|notes?)[s\s:.]*$', line, re.IGNORECASE)):
+            continue
         
-        lines = extracted_text.split('\n')
-        for i, line in enumerate(lines):
-            line = line.strip()
-            if not line:
-                continue
-                
-            # Remove Markdown header markers (e.g. "## Title")
-            line = re.sub(r'^#+\s+', '', line)
-            
-            # Remove academic footnotes (e.g., [1], [ 2 ], [12]) safely anywhere in the text
-            line = re.sub(r'\[\s*\d{1,3}\s*\]', '', line)
-            
-            # Remove standalone numbers or very short standalone references
-            if re.match(r'^\d+$', line) or (len(line) < 20 and re.match(r'^(sources?|bibliographie|notes?)[s\s:.]*$', line, re.IGNORECASE)):
-                continue
-            
-            # Remove list item markers but keep the content and add a pause
-            line = re.sub(r'^[-*+]\s+', '', line)
-            
-            # Replace markdown emphasis (bold/italic) with quotes for TTS intonation/pauses
-            line = re.sub(r'\*\*(.*?)\*\*', r'"\1"', line)
-            line = re.sub(r'\*(.*?)\*', r'"\1"', line)
-            line = re.sub(r'__(.*?)__', r'"\1"', line)
-            line = re.sub(r'_(.*?)_', r'"\1"', line)
-            
-            # Clean up any remaining stray asterisks or underscores
-            line = line.replace('*', ', ')
-            line = line.replace('_', ' ')
-            
-            # Add punctuation if missing for TTS pauses
-            if not line[-1] in '.!?:;,"\'»*':
-                # If it's a short line, it might be a header
-                if len(line) < 100 and not line.endswith(','):
-                    line = f"{line}..."
-                else:
-                    line = f"{line}."
-                    
-            text_parts.append(line)
-            
-        # Join with explicitly long pauses between distinct paragraphs/lines
-        # The ' ... ' ensures the TTS engine breathes between blocks
-        result = " ... ".join(text_parts)
+        # Remove list item markers but keep the content and add a pause
+        line = re.sub(r'^[-*+]\s+', '', line)
         
-        # Clean up excessive punctuation that might have been created
-        result = re.sub(r'\.{5,}', '...', result)
-        result = re.sub(r'\.{2}', '.', result)
-        result = re.sub(r' \.\.\. \.', ' ... ', result)
-        result = re.sub(r',\.', '.', result)
+        # Replace markdown emphasis (bold/italic) with quotes for TTS intonation/pauses
+        line = re.sub(r'\*\*(.*?)\*\*', r'"\1"', line)
+        line = re.sub(r'\*(.*?)\*', r'"\1"', line)
+        line = re.sub(r'__(.*?)__', r'"\1"', line)
+        line = re.sub(r'_(.*?)_', r'"\1"', line)
         
-        return result
+        # Clean up any remaining stray asterisks or underscores
+        line = line.replace('*', ', ')
+        line = line.replace('_', ' ')
         
-    except Exception as e:
-        logger.warning(f"Trafilatura content extraction failed: {e}")
-        return ""
+        # Add punctuation if missing for TTS pauses
+        if not line[-1] in '.!?:;,"\'»*':
+            # If it's a short line, it might be a header
+            if len(line) < 100 and not line.endswith(','):
+                line = f"{line}..."
+            else:
+                line = f"{line}."
+                
+        text_parts.append(line)
+        
+    # Join with explicitly long pauses between distinct paragraphs/lines
+    # The ' ... ' ensures the TTS engine breathes between blocks
+    result = " ... ".join(text_parts)
+    
+    # Clean up excessive punctuation that might have been created
+    result = re.sub(r'\.{5,}', '...', result)
+    result = re.sub(r'\.{2}', '.', result)
+    result = re.sub(r' \.\.\. \.', ' ... ', result)
+    result = re.sub(r',\.', '.', result)
+    
+    return result
 
 
 def reader_extract_metadata(html_string):
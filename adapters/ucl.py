@@ -4,6 +4,9 @@ import re
 import os
 
 class UCLAdapter(BaseAdapter):
+    # can_handle() searches the text of the whole document
+    body_selectors = None
+
     def can_handle(self):
         # Union Communiste Libertaire
         if "Union communiste libertaire" in self.soup.get_text():
@@ -19,9 +22,9 @@ class UCLAdapter(BaseAdapter):
         filename_title = os.path.splitext(filename)[0]
 
         # Title
-        og_title = soup.find("meta", property="og:title")
-        if og_title and og_title.get("content"):
-            meta["title"] = og_title["content"].strip()
+        og_title = self.head.meta(property="og:title")
+        if og_title:
+            meta["title"] = og_title.strip()
         
         if not meta["title"]:
             entry_title = soup.select_one(".entry-title")
@@ -29,8 +32,8 @@ class UCLAdapter(BaseAdapter):
                 meta["title"] = entry_title.get_text(separator=" ", strip=True)
         
         if not meta["title"]:
-            if soup.title and soup.title.string:
-                meta["title"] = soup.title.string.strip()
+            if self.head.title:
+                meta["title"] = self.head.title.strip()
 
         if not meta["title"]:
             h1_tag = soup.find("h1")
@@ -60,14 +63,14 @@ class UCLAdapter(BaseAdapter):
         meta["media"] = "Union Communiste Libertaire"
         
         # URL
-        meta_url = soup.find("meta", property="og:url") or soup.find("link", rel="canonical")
+        meta_url = self.head.meta(property="og:url") or self.head.link("canonical")
         if meta_url:
-            meta["url"] = meta_url.get("href", meta_url.get("content", "")).strip()
+            meta["url"] = meta_url.strip()
 
         # Date
-        meta_date = soup.find("meta", property="article:published_time")
-        if meta_date and meta_date.get("content"):
-            meta["date"] = meta_date["content"].strip()
+        meta_date = self.head.meta(property="article:published_time")
+        if meta_date:
+            meta["date"] = meta_date.strip()
         else:
             # Try specific UCL date selector
             date_el = soup.select_one(".date-publication")
@@ -75,9 +78,9 @@ class UCLAdapter(BaseAdapter):
                 meta["date"] = date_el.get_text(strip=True)
 
         # Description
-        meta_desc = soup.find("meta", property="og:description")
-        if meta_desc and meta_desc.get("content"):
-            og_desc = meta_desc["content"].strip()
+        meta_desc = self.head.meta(property="og:description")
+        if meta_desc:
+            og_desc = meta_desc.strip()
             # If og:description is short (< 300 chars), supplement with article content
             if len(og_desc) < 300:
                 long_desc = self._generate_long_description()
@@ -89,9 +92,9 @@ class UCLAdapter(BaseAdapter):
             meta["description"] = self._generate_long_description()
 
         # Image
-        meta_image = soup.find("meta", property="og:image")
-        if meta_image and meta_image.get("content"):
-            meta["image_url"] = meta_image["content"].strip()
+        meta_image = self.head.meta(property="og:image")
+        if meta_image:
+            meta["image_url"] = meta_image.strip()
 
         return meta
         
@@ -0,0 +1,145 @@
+from bs4 import CData, NavigableString, Tag
+
+# Block elements whose presence makes a wrapper "unwrapped" by flattening
+FLATTEN_BLOCKS = ('p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6')
+
+
+def _child_tags(element):
+    return [child for child in element.contents if isinstance(child, Tag)]
+
+
+class ContentView:
+    """
+    Read-only view of a content container. Adapters used to deep-copy their
+    container (__copy__), extract the junk from the copy and unwrap nested
+    wrappers until none was left, or to do the same on the shared soup. The
+    view gives the same traversal without touching the tree:
+
+    - exclude(element) hides an element and its subtree (junk, metadata
+      paragraphs...), the tree itself is not modified;
+    - find_all(..., flatten=[...]) skips the wrappers that contain a visible
+      block element, which is what the unwrap loop removed: unwrapping never
+      changes which blocks an element contains, so the wrappers to skip can
+      be computed in one bottom-up pass over the visible elements;
+    - get_text() ignores the text of excluded elements.
+
+    Metadata and content extraction can therefore run in any order, any
+    number of times, on one parsed document. Elements are tracked by
+    identity (id()), never with Tag.__eq__, which compares whole subtrees.
+    """
+
+    def __init__(self, root, junk_filter=None):
+        self.root = root
+        self._excluded = set()
+        self._dirty = set()  # Ancestors of excluded elements: get_text() must filter them
+        self.junk_stats = None
+        if junk_filter is not None:
+            junk, self.junk_stats = junk_filter.find(root)
+            for element in junk:
+                self.exclude(element)
+
+    def exclude(self, element):
+        """Hides element and its subtree from every later traversal."""
+        if id(element) in self._excluded:
+            return
+        self._excluded.add(id(element))
+        parent = element.parent
+        while parent is not None and id(parent) not in self._dirty:
+            self._dirty.add(id(parent))
+            if parent is self.root:
+                break
+            parent = parent.parent
+
+    def is_excluded(self, element):
+        return id(element) in self._excluded
+
+    def children(self, element=None):
+        """Visible child elements of element (default: the root)."""
+        element = self.root if element is None else element
+        return [child for child in _child_tags(element) if id(child) not in self._excluded]
+
+    def elements(self, element=None):
+        """Visible descendant elements of element (default: the root), in document order."""
+        stack = list(reversed(self.children(element)))
+        while stack:
+            tag = stack.pop()
+            yield tag
+            stack.extend(reversed(self.children(tag)))
+
+    def find(self, names, element=None):
+        """First visible descendant whose name is in names, None if there is none."""
+        names = {names} if isinstance(names, str) else set(names)
+        return next((tag for tag in self.elements(element) if tag.name in names), None)
+
+    def contains(self, element, names):
+        """True if element has a visible descendant whose name is in names (element.find(names))."""
+        return self.find(names, element) is not None
+
+    def find_outermost(self, names, element=None):
+        """Visible descendants whose name is in names and that have no such ancestor, in document order."""
+        names = {names} if isinstance(names, str) else set(names)
+        found = []
+        stack = list(reversed(self.children(element)))
+        while stack:
+            tag = stack.pop()
+            if tag.name in names:
+                found.append(tag)
+            else:
+                stack.extend(reversed(self.children(tag)))
+        return found
+
+    def find_all(self, names, element=None, flatten=(), blocks=FLATTEN_BLOCKS):
+        """
+        Visible descendants whose name is in names, in document order. Those
+        whose name is in flatten and that contain a visible element named in
+        blocks are skipped, as if the wrappers had been unwrapped.
+        """
+        names = {names} if isinstance(names, str) else set(names)
+        if not flatten:
+            return [tag for tag in self.elements(element) if tag.name in names]
+
+        flatten = set(flatten)
+        blocks = set(blocks)
+        order = []  # (tag, index of its parent in order, -1 for the top level)
+        stack = [(child, -1) for child in reversed(self.children(element))]
+        while stack:
+            tag, parent = stack.pop()
+            order.append((tag, parent))
+            index = len(order) - 1
+            stack.extend((child, index) for child in reversed(self.children(tag)))
+
+        # Descendants come after their ancestors in document order: walking
+        # backwards, each element is complete before its parent is reached
+        has_block = [False] * len(order)
+        for index in range(len(order) - 1, -1, -1):
+            tag, parent = order[index]
+            if parent >= 0 and (has_block[index] or tag.name in blocks):
+                has_block[parent] = True
+
+        return [tag for index, (tag, _) in enumerate(order)
+                if tag.name in names and not (tag.name in flatten and has_block[index])]
+
+    def get_text(self, element, separator="", strip=False):
+        """element.get_text() without the text of excluded elements."""
+        if id(element) not in self._dirty:
+            return element.get_text(separator=separator, strip=strip)
+
+        types = getattr(element, "interesting_string_types", None) or (NavigableString, CData)
+        if isinstance(types, type):
+            types = (types,)
+        strings = []
+        stack = list(reversed(element.contents))
+        while stack:
+            node = stack.pop()
+            if isinstance(node, Tag):
+                if id(node) not in self._excluded:
+                    stack.extend(reversed(node.contents))
+                continue
+            if type(node) not in types:
+                continue
+            if strip:
+                node = node.strip()
+                if not node:
+                    continue
+            strings.append(node)
+        return separator.join(strings)
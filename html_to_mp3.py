@@ -2,14 +2,18 @@
 import os
 import shutil
 import asyncio
-import edge_tts
 import logging
 import re
 import json
 import glob
+import inspect
+import hashlib
+import sys
 import argparse
-from bs4 import BeautifulSoup, Tag, NavigableString
-from mutagen.id3 import ID3, TIT2, TPE1, TALB, TRCK, COMM, USLT, TDRC, APIC
+import functools
+import time
+from concurrent.futures import ProcessPoolExecutor
+from mutagen.id3 import ID3, TIT2, TPE1, TALB, TRCK, COMM, USLT, TDRC, APIC, TCON
 import urllib.request
 import urllib.error
 
@@ -28,6 +32,88 @@ OUTPUT_DIR = os.path.expanduser("/home/killersky4/Documents/Perso/Podcasts/Artcl
 ARCHIVE_DIR = os.path.expanduser("/home/killersky4/Téléchargements/versaudio/Archived")
 VOICE = "fr-FR-VivienneNeural"
 
+# Moteur TTS: "edge" (edge-tts), "local" (espeak-ng/piper) ou "auto"
+# (edge-tts, avec bascule sur le moteur local si edge-tts est indisponible)
+TTS_BACKEND = "auto"
+LOCAL_TTS_ENGINE = "espeak-ng"   # "espeak-ng" ou "piper"
+LOCAL_TTS_VOICE = "fr"           # Voix espeak-ng
+PIPER_MODEL = os.path.expanduser("~/.local/share/piper/fr_FR-siwis-medium.onnx")
+
+# État persistant entre deux exécutions (budget TTS, rapport du dernier passage)
+STATE_DIR = os.path.expanduser("~/.local/state/tts_mp3")
+# Préparation des MP3 (synthèse, tags, vérification) sur disque local, avant
+# leur publication dans OUTPUT_DIR par un seul renommage atomique
+STAGING_DIR = os.path.join(STATE_DIR, "staging")
+
+# Traitement concurrent d'INPUT_DIR (plusieurs processus ou machines qui
+# synchronisent le même dossier): chaque fichier est réservé par un bail,
+# renouvelé pendant son traitement et repris par un autre s'il expire
+LEASE_DIR = os.path.join(INPUT_DIR, "_leases")
+LEASE_TTL = 900                  # Bail non renouvelé depuis ce délai: abandonné (secondes)
+LEASE_HEARTBEAT = 60             # Intervalle de renouvellement du bail (secondes)
+
+# Fichiers en échec (erreur d'extraction, contenu trop court; pas les erreurs de
+# synthèse, reportées au passage suivant sans pénalité): ignorés sans analyse tant
+# qu'ils n'ont pas changé, nouvel essai après FAILURE_RETRY_DELAY secondes (délai
+# doublé à chaque échec), puis mise en quarantaine avec un fichier .failure.json
+QUARANTINE_DIR = os.path.join(INPUT_DIR, "Quarantine")
+FAILURE_MAX_ATTEMPTS = 4
+FAILURE_RETRY_DELAY = 3600
+
+# Ordre de traitement: fichiers prioritaires (dans PRIORITY_DIR, ou dont le nom
+# commence par PRIORITY_MARKER) d'abord, puis les plus courts d'abord; chaque heure
+# d'attente retire PRIORITY_AGING_CHARS_PER_HOUR caractères au coût d'un fichier,
+# pour que les articles longs finissent par passer
+PRIORITY_DIR = os.path.join(INPUT_DIR, "Prioritaire")
+PRIORITY_MARKER = "!"
+PRIORITY_AGING_CHARS_PER_HOUR = 20000
+# Nouveau parcours d'INPUT_DIR pendant un passage (articles enregistrés entre-temps):
+# quand la file est vide, tous les BACKLOG_RESCAN_FILES fichiers traités ou toutes
+# les BACKLOG_RESCAN_SECONDS secondes
+BACKLOG_RESCAN_FILES = 50
+BACKLOG_RESCAN_SECONDS = 600
+
+# Sous-dossiers d'INPUT_DIR (et de PRIORITY_DIR): parcourus eux aussi, leur nom
+# devient la catégorie des articles (genre ID3). Les dossiers d'archive, de
+# quarantaine et de baux ne sont jamais parcourus, ni les dossiers "_files"
+INPUT_SUBFOLDERS = True
+
+# Cache des étapes d'extraction (métadonnées et texte brut par empreinte du HTML,
+# texte normalisé par empreinte du texte), invalidé quand le code de l'étape change:
+# une reprise après une panne TTS passe directement à la synthèse
+ARTIFACT_DIR = os.path.join(STATE_DIR, "artifacts")
+ARTIFACT_MAX_AGE_DAYS = 30       # Entrées inutilisées depuis ce délai: supprimées
+
+# Ordonnanceur edge-tts: concurrence adaptative (AIMD), reprises et budget
+TTS_MAX_CONCURRENCY = 6          # Requêtes edge-tts simultanées au maximum
+TTS_MAX_RETRIES = 5              # Reprises par morceau avant abandon
+TTS_REQUEST_DEADLINE = 180       # Délai maximum d'une requête (secondes)
+TTS_CHARS_PER_MINUTE = 60000     # Budget de caractères par minute
+TTS_CHARS_PER_DAY = 3000000      # Budget de caractères par jour
+TTS_HEDGING = False              # Dupliquer les requêtes anormalement lentes
+TTS_HEDGE_PERCENTILE = 0.95      # Seuil de lenteur (percentile des latences observées)
+TTS_HEDGE_MAX_RATE = 0.1         # Part maximale de requêtes dupliquées
+
+# Détection des doublons (même URL ou texte quasi identique déjà synthétisé)
+DEDUP_MODE = "skip"              # "skip" (archiver sans synthèse), "flag" (signaler) ou "off"
+DEDUP_SIMILARITY = 0.95          # Similarité minimale (SimHash) pour un doublon
+
+# Flux podcast (RSS 2.0 / iTunes) généré dans OUTPUT_DIR depuis l'index de la bibliothèque
+FEED_BASE_URL = ""               # URL publique de OUTPUT_DIR (vide: pas de flux)
+FEED_TITLE = "Articles audio"
+FEED_PAGE_SIZE = 100             # Épisodes par page du flux
+
+# Processus d'extraction (analyse HTML, adapters, normalisation): recyclé entre
+# deux articles quand sa mémoire résidente ou son nombre d'articles dépasse
+# ces limites (0: pas de limite)
+WORKER_MAX_RSS_MB = 512
+WORKER_MAX_JOBS = 50
+
+# Mode test: état du dernier passage, textes de référence et aperçu des différences
+TEST_STATE_NAME = ".test_state.json"
+TEST_GOLDEN_DIR = "golden"
+TEST_DIFF_PREVIEW_LINES = 6
+
 # --- HELPER FUNCTIONS ---
 
 def clean_filename(text):
@@ -38,25 +124,16 @@ def clean_filename(text):
     safe_text = re.sub(r'[\s_-]+', '_', safe_text)
     return safe_text
 
-def is_hidden(element):
-    """Checks if an element is likely hidden via inline style."""
-    if isinstance(element, Tag):
-        style = element.get('style', '')
-        if style and 'display: none' in style.lower():
-            return True
-        if element.has_attr('hidden'):
-            return True
-    return False
-
 
 # ... (imports)
-from adapters import get_adapter
+from adapters import parse_article, ADAPTERS, GenericAdapter
+from synthesis import get_backend, BudgetExceeded
+from pipeline import (RunReport, RecyclingWorker, GoldenState, adapter_fingerprints, compare_with_golden, file_sha1,
+                      OutputCommitter, LeaseManager, FailureCache, read_html, Backlog, ThroughputModel,
+                      ArtifactCache, code_fingerprint, ArchiveStore, html_bytes, decode_file)
+from normalization import normalize_text
+from library import DuplicateIndex, LibraryIndex, canonical_url, write_feed
 
-# ... (logging setup, config, clean_filename, is_hidden remain)
-
-# Helper functions extract_metadata, download_image, generate_text_content 
-# will be removed/replaced or moved to adapters if not already done.
-# download_image is general, can stay or move to utils. Ideally stay for now.
 
 def download_image(url):
     """Downloads image to memory returns bytes or None."""
@@ -75,292 +152,55 @@ def download_image(url):
         logger.warning(f"Failed to download image {url}: {e}")
         return None
 
-# --- INCLUSIVE WRITING HANDLER ---
-
-# Homophones: mots qui s'écrivent différemment au masculin/féminin mais sonnent pareil
-# Le masculin suffit à l'oral
-HOMOPHONES_RACINES = {
-    # Terminaisons en -é (ami/amie, salarié/salariée)
-    "ami", "amie", "salari", "déput", "charg", "employ", "invit", "concern",
-    "abonn", "engag", "fatigu", "motiv", "détermin", "passionn", "diplôm",
-    "qualifi", "expériment", "intéress", "touch", "affect", "impliqu",
-    "préoccup", "inform", "consult", "réuni", "assembl", "group", "rassembl",
-    "marqu", "salu", "accompagn", "guid", "orient", "form", "sensibilis",
-    "mobilis", "organis", "structur", "coordonn", "délég", "mandaté",
-    "autoris", "habilit", "certifi", "agré", "reconnu", "validé",
-    # Autres terminaisons muettes
-    "auteur", "lecteur", "acteur", "directeur", "professeur"
-}
-
-def _sonnent_pareil(masculin: str, feminin: str) -> bool:
-    """
-    Détermine si le masculin et le féminin sonnent pareil à l'oral.
-    Utilise des règles phonétiques françaises + liste d'exceptions.
-    """
-    # Normaliser
-    masc = masculin.lower().strip()
-    fem = feminin.lower().strip()
-    
-    # Identiques
-    if masc == fem:
-        return True
-    
-    # Retirer le 's' final pour comparer les racines
-    masc_base = masc.rstrip('s')
-    fem_base = fem.rstrip('s')
-    
-    # Vérifier dans les homophones connus
-    for racine in HOMOPHONES_RACINES:
-        if masc_base.endswith(racine) or masc_base == racine:
-            return True
-    
-    # Règle: si le féminin = masculin + "e" ou "es"
-    # et que le masculin finit par une voyelle accentuée, ils sonnent pareil
-    if fem_base.startswith(masc_base):
-        suffixe = fem_base[len(masc_base):]
-        if suffixe in ['e', 'es', '']:
-            # Dernière lettre du masculin (sans 's')
-            if masc_base and masc_base[-1] in 'éèêëiîïuûüoôaàâ':
-                return True
-    
-    # Règle: terminaisons en -eur/-euse, -teur/-trice -> différent
-    if masc.endswith('eur') and fem.endswith('euse'):
-        return False
-    if masc.endswith('teur') and fem.endswith('trice'):
-        return False
-    
-    # Règle: terminaisons en -if/-ive -> différent
-    if masc.endswith('if') and fem.endswith('ive'):
-        return False
-    
-    # Règle: terminaisons en -eux/-euse -> différent
-    if masc.endswith('eux') and fem.endswith('euse'):
-        return False
-    
-    # Par défaut: différent (on dédouble)
-    return False
-
-
-def _generer_forme_parlee(masculin: str, feminin: str) -> str:
-    """
-    Génère la forme parlée d'un mot en écriture inclusive.
-    Retourne soit le masculin seul (si homophone), soit "féminin et masculin".
-    """
-    if _sonnent_pareil(masculin, feminin):
-        return masculin
-    else:
-        # Ordre: féminin d'abord (convention courante à l'oral)
-        return f"{feminin} et {masculin}"
-
+# Old extract_metadata and generate_text_content Removed
 
-def process_inclusive_writing(text: str) -> str:
-    """
-    Convertit l'écriture inclusive en forme parlée pour TTS.
-    
-    Gère les patterns:
-    - client·e·s → "clientes et clients" ou "clients" si homophone
-    - client·es → "clientes et clients"
-    - chacun·e → "chacune et chacun"
-    - celleux → "celles et ceux"
-    - iel/iels → "elle ou il" / "elles ou ils"
-    
-    Nettoie aussi les points médians orphelins.
-    """
-    result = text
-    
-    # 1. Remplacer les néologismes inclusifs courants
-    neologismes = {
-        r'\bcelleux\b': 'celles et ceux',
-        r'\bceuxlles\b': 'ceux et celles',
-        r'\biels\b': 'elles et ils',
-        r'\biel\b': 'elle ou il',
-        r'\bae\b': 'a ou e',  # rare mais existe
-    }
-    for pattern, replacement in neologismes.items():
-        result = re.sub(pattern, replacement, result, flags=re.IGNORECASE)
+def build_output_name(meta, filename, extension):
+    """Output filename ("Title - Media.mp3") from the article metadata."""
+    safe_title = clean_filename(meta['title'])
+    if len(safe_title) < 3:
+         safe_title = clean_filename(os.path.splitext(filename)[0])
     
-    # 2. Pattern complet: mot·e·s ou mot·es·s (pluriel avec double suffixe)
-    # Ex: "client·e·s", "citoyen·ne·s", "lecteur·rice·s"
-    def replace_full_pattern(match):
-        base = match.group(1)      # "client"
-        suffix1 = match.group(2)   # "e" ou "ne" ou "rice"
-        suffix2 = match.group(3)   # "s" (optionnel)
-        
-        # Construire masculin et féminin
-        if suffix2:
-            masculin = base + suffix2  # "clients"
-            feminin = base + suffix1 + suffix2  # "clientes"
-        else:
-            masculin = base  # "client"
-            feminin = base + suffix1  # "cliente"
-        
-        return _generer_forme_parlee(masculin, feminin)
+    safe_media = clean_filename(meta['media'])
     
-    # Pattern: mot·suffixe·s ou mot·suffixe (avec point médian ou tiret ou parenthèses)
-    # Séparateurs: · (point médian), - (tiret), . (point), ( )
-    separateurs = r'[·\-\.\(\)]'
-    
-    # Pattern pluriel: base·suffix·s
-    pattern_pluriel = rf'(\w+){separateurs}(\w+){separateurs}([s])\b'
-    result = re.sub(pattern_pluriel, replace_full_pattern, result)
-    
-    # Pattern singulier/court: base·suffix (ex: "chacun·e", "client·es")
-    def replace_short_pattern(match):
-        base = match.group(1)
-        suffix = match.group(2)
-        
-        # Détecter si c'est un pluriel court (suffix = "es" ou "s")
-        if suffix.endswith('s'):
-            masculin = base + 's'
-            feminin = base + suffix
-        else:
-            masculin = base
-            feminin = base + suffix
-        
-        return _generer_forme_parlee(masculin, feminin)
-    
-    pattern_court = rf'(\w+){separateurs}([eé]s?|ne|rice|euse|ive|se)\b'
-    result = re.sub(pattern_court, replace_short_pattern, result, flags=re.IGNORECASE)
-    
-    # 3. Nettoyer les points médians orphelins
-    result = re.sub(r'·', ' ', result)
-    
-    # 4. Nettoyer les espaces multiples
-    result = re.sub(r'\s+', ' ', result)
+    if safe_media and safe_media != "Unknown_Media" and safe_media != "Europresse": 
+        name = f"{safe_title} - {safe_media}{extension}"
+    else:
+        name = f"{safe_title}{extension}"
     
-    return result
+    # Limit length
+    if len(name) > 200:
+        name = name[:200] + extension
+    return name
 
 
-def clean_text_for_tts(text: str) -> str:
+def process_html_file_test(filepath, test_output_dir):
     """
-    Nettoie le texte pour la synthèse vocale en supprimant:
-    - URLs
-    - Numéros de notes de bas de page [1], [2], etc.
-    - Références bibliographiques
-    - DOI et identifiants
-    - Mentions de licence
-    - Métadonnées résiduelles
+    Process HTML file in test mode: extract and save text content only.
+    Returns {"file", "txt", "adapter", "seconds", "error"}; txt is None when
+    no text file was written.
     """
-    result = text
-    
-    # 1. Supprimer les URLs (http://, https://, www.)
-    result = re.sub(r'https?://[^\s\)]+', '', result)
-    result = re.sub(r'www\.[^\s\)]+', '', result)
-    
-    # 2. Supprimer les DOI
-    result = re.sub(r'doi\.org/[^\s\)]+', '', result)
-    result = re.sub(r'https?://doi\.org/[^\s]+', '', result)
-    result = re.sub(r'\bdoi\s*:\s*[^\s]+', '', result, flags=re.IGNORECASE)
-    
-    # 3. Supprimer les numéros de notes entre crochets [1], [2], etc.
-    result = re.sub(r'\[\d+\]', '', result)
-    
-    # 4. Supprimer les appels de notes (numéros seuls en exposant ou après un mot)
-    # Pattern original trop agressif: "texte1" ou "texte 1" en fin de phrase avant ponctuation
-    # On limite aux chiffres collés directement à un mot (sans espace) avant une ponctuation forte
-    # Ex: "mot1." ou "mot12," mais pas "le 20 janvier"
-    result = re.sub(r'(?<=[a-zA-Zà-ÿ])\d{1,2}(?=[\.,;:!?])', '', result)
-    # 5. Supprimer les références bibliographiques typiques
-    # Pattern: "Auteur, A. (YYYY). Titre..."
-    result = re.sub(r'\b[A-Z][a-zà-ÿ]+,\s*[A-Z]\.\s*(?:&\s*[A-Z][a-zà-ÿ]+,\s*[A-Z]\.\s*)*\(\d{4}\)\.\s*[^\.]+\.[^\.]*(?:Presses|Éditions|University|Press|Gallimard|Seuil)[^\.]*\.', '', result)
-    
-    # 6. Supprimer les mentions de licence Creative Commons
-    result = re.sub(r'(CC\s+BY[-\w]*|Creative\s+Commons|Tous\s+droits\s+réservés)[^\.]*\.?', '', result, flags=re.IGNORECASE)
-    result = re.sub(r'Le texte seul est utilisable sous licence[^\.]+\.', '', result, flags=re.IGNORECASE)
-    
-    # 7. Supprimer les références électroniques
-    result = re.sub(r'Référence électronique[^\.]*\.?', '', result, flags=re.IGNORECASE)
-    result = re.sub(r'\[En ligne\][^,]*,', '', result, flags=re.IGNORECASE)
-    result = re.sub(r'mis en ligne le[^,\.]+[,\.]', '', result, flags=re.IGNORECASE)
-    result = re.sub(r'consulté le \d+[^\.]+\.', '', result, flags=re.IGNORECASE)
-    result = re.sub(r'URL\s*:', '', result, flags=re.IGNORECASE)
-    
-    # 8. Supprimer les mentions "Paru dans..." "Articles du même auteur"
-    result = re.sub(r'Paru dans[^\.]+\.', '', result, flags=re.IGNORECASE)
-    result = re.sub(r'Articles? du même auteur\.?', '', result, flags=re.IGNORECASE)
-    
-    # 9. Supprimer les notes numérotées en début de phrase
-    # Pattern: "1 Texte de la note..." "2 Autre note..."
-    # On supprime les lignes qui commencent par un numéro suivi d'un espace et peu de contexte
-    result = re.sub(r'\.\s+\d{1,2}\s+[A-Z][^\.]{10,150}(?:\.\.\.|\.\s)', '. ', result)
-    
-    # 10. Nettoyer les doubles espaces et ponctuation orpheline
-    result = re.sub(r'\s+', ' ', result)
-    result = re.sub(r'\s+([.,;:!?])', r'\1', result)
-    result = re.sub(r'([.,;:!?])\s*\1+', r'\1', result)  # Ponctuation doublée
-    result = re.sub(r'\(\s*\)', '', result)  # Parenthèses vides
-    result = re.sub(r'\[\s*\]', '', result)  # Crochets vides
-    
-    # 11. Nettoyer les espaces avant ponctuation
-    result = re.sub(r'\s+\.', '.', result)
-    result = re.sub(r'\s+,', ',', result)
-    
-    return result.strip()
-
-
-# Old extract_metadata and generate_text_content Removed
-
-def process_html_file_test(filepath, test_output_dir):
-    """Process HTML file in test mode: extract and save text content only."""
     filename = os.path.basename(filepath)
     logger.info(f"[TEST MODE] Processing: {filename}")
+    result = {"file": filename, "txt": None, "adapter": None, "seconds": 0.0, "error": None}
+    start = time.perf_counter()
 
     try:
-        # Read file
-        try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                soup = BeautifulSoup(f, 'html.parser')
-        except UnicodeDecodeError:
-            with open(filepath, 'r', encoding='latin-1') as f:
-                soup = BeautifulSoup(f, 'html.parser')
-
-        # Get Adapter
-        adapter = get_adapter(soup, filename)
-        
-        # Metadata
-        meta = adapter.extract_metadata()
+        article = extract_article(filepath)
+        result["adapter"] = article['adapter']
+        meta = article['meta']
         title = meta['title']
         author = meta['author']
         media = meta['media']
-        
-        logger.info(f"[TEST MODE] Metadata - Title: {title}, Author: {author}, Media: {media}")
-
-        safe_title = clean_filename(title)
-        if len(safe_title) < 3:
-             safe_title = clean_filename(os.path.splitext(filename)[0])
-        
-        # Format filename for text output
-        safe_media = clean_filename(media)
-        
-        if safe_media and safe_media != "Unknown_Media" and safe_media != "Europresse": 
-            txt_name = f"{safe_title} - {safe_media}.txt"
-        else:
-            txt_name = f"{safe_title}.txt"
-        
-        # Limit length
-        if len(txt_name) > 200:
-            txt_name = txt_name[:200] + ".txt"
 
+        txt_name = build_output_name(meta, filename, ".txt")
         txt_path = os.path.join(test_output_dir, txt_name)
 
-        # Generate content
-        text_body = adapter.get_content()
-            
-        if len(text_body) < 50:
+        if article['text_body'] is None:
             logger.warning(f"[TEST MODE] Skipping {filename}: content too short or empty.")
-            return 
+            result["error"] = "content too short or empty"
+            return result
 
-        # Construct intro
-        text_intro = (
-            f"Article de {media}... "
-            f"{title}... "
-            f"Par {author}... "
-        )
-
-        full_content = f"{text_intro}{text_body}"
-        full_content = re.sub(r'\s+', ' ', full_content).strip()
-        full_content = process_inclusive_writing(full_content)  # Handle écriture inclusive
-        full_content = clean_text_for_tts(full_content)  # Remove URLs, notes, references
+        full_content = article['full_content']
 
         # Save text content to file
         with open(txt_path, 'w', encoding='utf-8') as f:
@@ -385,154 +225,331 @@ def process_html_file_test(filepath, test_output_dir):
             f.write(f"\nSTATISTIQUES:\n")
             f.write(f"  - Nombre de caractères: {len(full_content)}\n")
             f.write(f"  - Nombre de mots (approximatif): {len(full_content.split())}\n")
+            f.write(f"  - Extraction: {article['tier']}\n")
         
         logger.info(f"[TEST MODE] Text saved to: {txt_path}")
         logger.info(f"[TEST MODE] Content length: {len(full_content)} characters")
+        result["txt"] = txt_name
 
     except Exception as e:
         logger.error(f"[TEST MODE] Error processing {filename}: {e}", exc_info=True)
+        result["error"] = str(e)
+
+    result["seconds"] = round(time.perf_counter() - start, 2)
+    return result
+
 
+_archive_store = None
 
-async def process_html_file(filepath):
+
+def archive_store():
+    """Archive store of ARCHIVE_DIR, loaded once per process."""
+    global _archive_store
+    if _archive_store is None:
+        _archive_store = ArchiveStore(ARCHIVE_DIR)
+    return _archive_store
+
+
+def archive_input(filepath, mp3_name=""):
+    """
+    Stores a processed HTML file in the archive (compressed, once per
+    content) and removes it with its SingleFile _files folder. mp3_name: the
+    episode made from it (or that it duplicates). Returns the archived copy.
+    """
     filename = os.path.basename(filepath)
-    logger.info(f"Processing: {filename}")
+    store = archive_store()
+    entry = store.add(filepath, mp3=mp3_name)
+    archive_path = store.object_path(entry["sha1"])
+    logger.info(f"Archived to: {archive_path}")
+
+    files_dir_name = os.path.splitext(filename)[0] + "_files"
+    files_dir_path = os.path.join(os.path.dirname(filepath), files_dir_name)
+    if os.path.exists(files_dir_path) and os.path.isdir(files_dir_path):
+        shutil.rmtree(files_dir_path)
+        logger.info(f"Removed artifacts directory: {files_dir_name}")
+
+    return archive_path
 
+
+def write_id3_tags(mp3_path, meta, img_data=None):
+    """
+    Writes the article metadata as ID3 frames. Existing text frames are
+    replaced in place (mutagen reuses the tag padding); the cover is only
+    replaced when img_data is given.
+    """
     try:
-        # Read file
-        try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                soup = BeautifulSoup(f, 'html.parser')
-        except UnicodeDecodeError:
-            with open(filepath, 'r', encoding='latin-1') as f:
-                soup = BeautifulSoup(f, 'html.parser')
-
-        # Get Adapter
-        adapter = get_adapter(soup, filename)
+        audio = ID3(mp3_path)
+    except Exception:
+        audio = ID3()
+
+    for frame_id in ("TIT2", "TPE1", "TALB", "COMM", "USLT", "TDRC"):
+        audio.delall(frame_id)
+
+    audio.add(TIT2(encoding=3, text=meta['title']))
+    audio.add(TPE1(encoding=3, text=meta['author']))
+    
+    album = meta['media'] if meta['media'] != "Unknown Media" else "Audio Articles"
+    audio.add(TALB(encoding=3, text=album))
+    
+    if meta['url']:
+        audio.add(COMM(encoding=3, lang='eng', desc='', text=meta['url']))
+    
+    if meta['description']:
+        audio.add(USLT(encoding=3, lang='eng', desc='Description', text=meta['description']))
+
+    # Category (input subfolder); kept as is when retagging from the archive
+    if meta.get('category'):
+        audio.delall("TCON")
+        audio.add(TCON(encoding=3, text=meta['category']))
         
-        # Metadata
+    if meta['date']:
+        # Extract year only for TDRC tag (full ISO format like "2024-03-14T15:32" 
+        # can cause issues with podcast readers)
+        date_str = str(meta['date'])
+        # Try to extract just the year
+        year_match = re.match(r'^(\d{4})', date_str)
+        if year_match:
+            audio.add(TDRC(encoding=3, text=year_match.group(1)))
+
+    if img_data:
+        mime = 'image/jpeg'
+        if meta['image_url'].lower().endswith('.png'):
+            mime = 'image/png'
+        audio.delall("APIC")
+        audio.add(APIC(
+            encoding=3,
+            mime=mime,
+            type=3, 
+            desc=u'Cover',
+            data=img_data
+        ))
+    
+    audio.save(mp3_path)
+
+
+def extract_text(filepath, html=None):
+    """
+    Extraction stage: parses an HTML file and extracts its metadata and raw
+    text with the matching adapter. Returns {"meta", "text_body", "tier",
+    "adapter", "junk"} (adapter: module of the adapter used, junk: counts of
+    its junk removal pass or None). html: the file already decoded, read
+    from filepath when None. The parse tree is torn down before returning.
+    """
+    filename = os.path.basename(filepath)
+    if html is None:
+        html = read_html(filepath)
+    # Get adapter (partial parse of large documents)
+    adapter = parse_article(html, filename)
+    try:
         meta = adapter.extract_metadata()
-        title = meta['title']
-        author = meta['author']
-        media = meta['media']
-        
-        logger.info(f"Metadata - Title: {title}, Author: {author}, Media: {media}")
+        logger.info(f"Metadata - Title: {meta['title']}, Author: {meta['author']}, Media: {meta['media']}")
+        return {"meta": meta, "text_body": adapter.get_content(), "tier": adapter.extraction_tier,
+                "adapter": type(adapter).__module__, "junk": adapter.junk_stats}
+    finally:
+        adapter.close()
 
-        safe_title = clean_filename(title)
-        if len(safe_title) < 3:
-             safe_title = clean_filename(os.path.splitext(filename)[0])
-        
-        # Format filename
-        safe_media = clean_filename(media)
-        
-        if safe_media and safe_media != "Unknown_Media" and safe_media != "Europresse": 
-            mp3_name = f"{safe_title} - {safe_media}.mp3"
-        else:
-            mp3_name = f"{safe_title}.mp3"
-        
-        # Limit length
-        if len(mp3_name) > 200:
-            mp3_name = mp3_name[:200] + ".mp3"
 
-        mp3_path = os.path.join(OUTPUT_DIR, mp3_name)
+_artifact_cache = None
 
-        # Generate content
-        text_body = adapter.get_content()
-            
-        if len(text_body) < 50:
+
+def artifact_cache():
+    """Artifact cache of this process, for the current extraction and normalization code."""
+    global _artifact_cache
+    if _artifact_cache is None:
+        base_dir = os.path.dirname(os.path.abspath(__file__))
+        extract_paths = (glob.glob(os.path.join(base_dir, "adapters", "*.py")) +
+                         [os.path.join(base_dir, "pipeline", "loader.py")])
+        extract_fingerprints = adapter_fingerprints(ADAPTERS + [GenericAdapter], extract_paths,
+                                                    [inspect.getsource(extract_text)])
+        normalize_fingerprint = code_fingerprint(glob.glob(os.path.join(base_dir, "normalization", "*.py")))
+        _artifact_cache = ArtifactCache(ARTIFACT_DIR, extract_fingerprints, normalize_fingerprint,
+                                        max_age=ARTIFACT_MAX_AGE_DAYS * 86400)
+    return _artifact_cache
+
+
+def extract_article(filepath):
+    """
+    Extraction worker: extracts the metadata and text of an HTML file
+    (extract_text) and normalizes the text for TTS. Returns {"meta",
+    "text_body", "full_content", "tier", "adapter", "junk", "cached"};
+    text_body and full_content are None when the content is too short.
+    Each stage is read from the artifact cache when its input and code are
+    unchanged: "cached" lists the stages that were.
+    """
+    cache = artifact_cache()
+    name = os.path.basename(filepath)
+    cached = []
+    # The file is read once: hashed for the cache key, decoded only on a miss
+    with html_bytes(filepath) as data:
+        html_sha1 = hashlib.sha1(data).hexdigest()
+        extraction = cache.extraction(html_sha1, name)
+        html = decode_file(filepath, data) if extraction is None else None
+    if extraction is None:
+        extraction = extract_text(filepath, html)
+        cache.store_extraction(html_sha1, name, extraction)
+    else:
+        cached.append("extract")
+    meta = extraction['meta']
+    text_body = extraction['text_body']
+    article = {"meta": meta, "text_body": None, "full_content": None, "tier": extraction['tier'],
+               "adapter": extraction['adapter'], "junk": extraction['junk'], "cached": cached}
+    if len(text_body) < 50:
+        return article
+
+    # Construct intro
+    text_intro = (
+        f"Article de {meta['media']}... "
+        f"{meta['title']}... "
+        f"Par {meta['author']}... "
+    )
+    text = f"{text_intro}{text_body}"
+    full_content = cache.normalized(text)
+    if full_content is None:
+        full_content = normalize_text(text)
+        cache.store_normalized(text, full_content)
+    else:
+        cached.append("normalize")
+    if cached:
+        logger.info(f"Cached stages for {os.path.basename(filepath)}: {', '.join(cached)}")
+    article.update(text_body=text_body, full_content=full_content)
+    return article
+
+
+def index_episode(entry, library_index, dedup_index, img_data=None):
+    """Records a committed episode (OutputCommitter entry) in the library and duplicate indexes."""
+    meta = entry["record"]["meta"]
+    source = os.path.basename(entry["source"])
+    library_index.add(entry["mp3_path"], meta, img_data, source=source)
+    dedup_index.add(meta['url'], entry["record"]["text_body"], entry["mp3"], meta['title'])
+
+
+async def process_html_file(filepath, backend, report, dedup_index, library_index, extraction_worker,
+                            committer, failures, throughput, category=None, owns_input=None):
+    """
+    Extracts, synthesizes and publishes one input file. Only the failures of
+    the file itself (extraction error, content too short) are recorded in
+    the failure cache; synthesis and publication errors (TTS outage, retries
+    exhausted, unplayable output) defer it to the next run without penalty.
+    owns_input() is asked right before publication whether this process
+    still holds the file (its lease); if not, the episode is dropped.
+    """
+    filename = os.path.basename(filepath)
+    logger.info(f"Processing: {filename}" + (f" ({category})" if category else ""))
+    synthesizing = False
+
+    try:
+        # Parsing and extraction run in the recycled worker process
+        article, usage = await asyncio.to_thread(extraction_worker.run, filepath)
+        meta = article['meta']
+        if category:
+            meta['category'] = category
+        title = meta['title']
+
+        if article['text_body'] is None:
             logger.warning(f"Skipping {filename}: content too short or empty.")
-            return 
+            report.record_article(filename, "skipped", reason="content too short or empty",
+                                  peak_rss_mb=usage['peak_rss_mb'])
+            failures.record(filepath, "content too short or empty")
+            return
 
-        # Construct intro
-        text_intro = (
-            f"Article de {media}... "
-            f"{title}... "
-            f"Par {author}... "
-        )
+        text_body = article['text_body']
+        full_content = article['full_content']
+
+        mp3_name = build_output_name(meta, filename, ".mp3")
 
-        full_content = f"{text_intro}{text_body}"
-        full_content = re.sub(r'\s+', ' ', full_content).strip()
-        full_content = process_inclusive_writing(full_content)  # Handle écriture inclusive
-        full_content = clean_text_for_tts(full_content)  # Remove URLs, notes, references
+        # Duplicate detection (same URL or near-identical text already synthesized)
+        if DEDUP_MODE != "off":
+            duplicate = dedup_index.find(meta['url'], text_body)
+            if duplicate:
+                entry, similarity = duplicate
+                if DEDUP_MODE == "skip":
+                    logger.warning(f"Skipping {filename}: duplicate of {entry['mp3']} (similarity {similarity:.0%})")
+                    archive_input(filepath, entry['mp3'])
+                    failures.forget(filepath)
+                    report.record_article(filename, "skipped", reason=f"duplicate of {entry['mp3']}")
+                    return
+                logger.warning(f"{filename} looks like a duplicate of {entry['mp3']} (similarity {similarity:.0%})")
 
-        # Generate Audio
+        # Generate Audio in the staging directory
         logger.info(f"Generating MP3: {mp3_name}")
         logger.debug(f"Content Preview: {full_content[:100]}...")
         
-        communicate = edge_tts.Communicate(full_content, VOICE)
-        await communicate.save(mp3_path)
-        
-        # Add ID3 Tags
+        synthesizing = True
+        staged_path = committer.stage_path()
         try:
-            audio = ID3(mp3_path)
-        except Exception:
-            audio = ID3()
-            
-        audio.add(TIT2(encoding=3, text=title))
-        audio.add(TPE1(encoding=3, text=author))
-        
-        album = media if media != "Unknown Media" else "Audio Articles"
-        audio.add(TALB(encoding=3, text=album))
-        
-        if meta['url']:
-            audio.add(COMM(encoding=3, lang='eng', desc='', text=meta['url']))
-        
-        if meta['description']:
-            audio.add(USLT(encoding=3, lang='eng', desc='Description', text=meta['description']))
-            
-        if meta['date']:
-            # Extract year only for TDRC tag (full ISO format like "2024-03-14T15:32" 
-            # can cause issues with podcast readers)
-            date_str = str(meta['date'])
-            # Try to extract just the year
-            year_match = re.match(r'^(\d{4})', date_str)
-            if year_match:
-                audio.add(TDRC(encoding=3, text=year_match.group(1)))
-
-        if meta['image_url']:
-            img_data = download_image(meta['image_url'])
-            if img_data:
-                mime = 'image/jpeg'
-                if meta['image_url'].lower().endswith('.png'):
-                    mime = 'image/png'
-                audio.add(APIC(
-                    encoding=3,
-                    mime=mime,
-                    type=3, 
-                    desc=u'Cover',
-                    data=img_data
-                ))
-        
-        audio.save(mp3_path)
-        
-        logger.info(f"Generated successfully with tags: {mp3_path}")
+            tts_start = time.monotonic()
+            await backend.synthesize(full_content, staged_path)
+            tts_seconds = time.monotonic() - tts_start
 
-        # Archive and Cleanup
-        if not os.path.exists(ARCHIVE_DIR):
-            os.makedirs(ARCHIVE_DIR)
-        
-        archive_path = os.path.join(ARCHIVE_DIR, filename)
-        if os.path.exists(archive_path):
-            base, ext = os.path.splitext(filename)
-            timestamp = 0 
-            while os.path.exists(archive_path):
-                timestamp += 1
-                archive_path = os.path.join(ARCHIVE_DIR, f"{base}_{timestamp}{ext}")
-
-        shutil.move(filepath, archive_path)
-        logger.info(f"Archived to: {archive_path}")
-
-        files_dir_name = os.path.splitext(filename)[0] + "_files"
-        files_dir_path = os.path.join(INPUT_DIR, files_dir_name)
-        if os.path.exists(files_dir_path) and os.path.isdir(files_dir_path):
-            shutil.rmtree(files_dir_path)
-            logger.info(f"Removed artifacts directory: {files_dir_name}")
+            # Add ID3 Tags
+            img_data = download_image(meta['image_url']) if meta['image_url'] else None
+            write_id3_tags(staged_path, meta, img_data)
+
+            audio = committer.verify(staged_path)
+        except BaseException:
+            committer.discard(staged_path)
+            raise
+
+        if owns_input is not None and not owns_input():
+            # Lease reclaimed by another process (missed heartbeats): it publishes the episode
+            committer.discard(staged_path)
+            logger.warning(f"Dropping {mp3_name}: {filename} was claimed by another process meanwhile")
+            report.record_article(filename, "skipped", reason="lease lost before publication")
+            return
 
+        # Publish into OUTPUT_DIR (one atomic rename), then archive and cleanup
+        entry = committer.commit(staged_path, mp3_name, filepath,
+                                 record={"meta": meta, "text_body": text_body})
+        logger.info(f"Generated successfully with tags: {entry['mp3_path']}")
+
+        index_episode(entry, library_index, dedup_index, img_data)
+        committer.finish(entry)
+        failures.forget(filepath)
+        engine = backend.active_engine()
+        throughput.record(engine, len(full_content), tts_seconds, audio['duration'], tts_concurrency(engine))
+
+        junk = article['junk']
+        report.record_article(filename, "done", chars=len(full_content), tts_s=round(tts_seconds, 1),
+                              audio_s=round(audio['duration']),
+                              tier=article['tier'], peak_rss_mb=usage['peak_rss_mb'],
+                              junk_nodes=junk['nodes'] if junk else 0,
+                              junk_hidden=junk['hidden'] if junk else 0,
+                              junk_ms=round(junk['seconds'] * 1000, 1) if junk else 0,
+                              cached=",".join(article['cached']) or "none")
+
+    except BudgetExceeded as e:
+        logger.warning(f"Deferring {filename}: {e}")
+        report.record_article(filename, "deferred", reason=str(e))
     except Exception as e:
+        if synthesizing:
+            # Not the input's fault: retried on the next run, attempts untouched
+            logger.error(f"Deferring {filename} after a synthesis error: {e}", exc_info=True)
+            report.record_article(filename, "deferred", reason=f"{type(e).__name__}: {e}")
+            return
         logger.error(f"Error processing {filename}: {e}", exc_info=True)
+        report.record_article(filename, "failed", reason=str(e))
+        if os.path.exists(filepath):
+            failures.record(filepath, f"{type(e).__name__}: {e}")
+
 
+def _test_fingerprints():
+    """Code fingerprints of the test mode outputs, by adapter module (see adapter_fingerprints)."""
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    shared_paths = (glob.glob(os.path.join(base_dir, "adapters", "*.py")) +
+                    glob.glob(os.path.join(base_dir, "normalization", "*.py")) +
+                    [os.path.join(base_dir, "pipeline", "loader.py")])
+    sources = [inspect.getsource(f) for f in (extract_text, extract_article, process_html_file_test,
+                                              build_output_name)]
+    return adapter_fingerprints(ADAPTERS + [GenericAdapter], shared_paths, sources)
 
-def main_test(test_dir):
-    """Main function for test mode - no async needed as we're not generating audio."""
+
+def main_test(test_dir, workers=None, force=False, update_golden=False):
+    """
+    Test mode - no audio, so files are extracted in parallel on a process pool.
+    Files whose HTML and extraction code are unchanged since the last run are
+    not extracted again. Every output is compared with its golden text
+    (golden/<file>.txt); returns the number of files that differ from it.
+    """
     logger.info("=" * 80)
     logger.info("MODE TEST ACTIVÉ")
     logger.info(f"Répertoire source: {test_dir}")
@@ -541,16 +558,15 @@ def main_test(test_dir):
     
     if not os.path.exists(test_dir):
         logger.error(f"Test directory does not exist: {test_dir}")
-        return
-    
-    files_found = False
+        return 0
     
     try:
         files = sorted(os.listdir(test_dir))
     except FileNotFoundError:
         logger.error(f"Test directory not found: {test_dir}")
-        return
+        return 0
 
+    html_files = []
     for file in files:
         filepath = os.path.join(test_dir, file)
         
@@ -560,20 +576,325 @@ def main_test(test_dir):
         if file.endswith('.txt'): continue  # Skip existing text files
         
         if file.lower().endswith(".html") or file.lower().endswith(".htm"):
-            files_found = True
-            process_html_file_test(filepath, test_dir)
+            html_files.append(file)
     
-    if not files_found:
+    if not html_files:
         logger.info("[TEST MODE] No HTML files found in test directory.")
-    else:
-        logger.info("=" * 80)
-        logger.info("[TEST MODE] Traitement terminé. Vérifiez les fichiers .txt générés.")
-        logger.info("=" * 80)
+        return 0
+
+    start = time.monotonic()
+    state = GoldenState(os.path.join(test_dir, TEST_STATE_NAME))
+    fingerprints = _test_fingerprints()
+    html_hashes = {file: file_sha1(os.path.join(test_dir, file)) for file in html_files}
+    to_extract = [file for file in html_files
+                  if force or not state.is_fresh(file, html_hashes[file], fingerprints, test_dir)]
+    logger.info(f"[TEST MODE] {len(to_extract)} file(s) to extract, "
+                f"{len(html_files) - len(to_extract)} unchanged")
+
+    results = {}
+    if to_extract:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            paths = [os.path.join(test_dir, file) for file in to_extract]
+            for result in pool.map(process_html_file_test, paths, [test_dir] * len(paths)):
+                file = result["file"]
+                results[file] = result
+                previous = state.files.pop(file, None)
+                if previous and previous.get("txt") not in (None, result["txt"]):
+                    # Title changed: remove the text file of the previous run
+                    try:
+                        os.remove(os.path.join(test_dir, previous["txt"]))
+                    except FileNotFoundError:
+                        pass
+                if result["txt"]:
+                    state.record(file, html_hashes[file], fingerprints[result["adapter"]],
+                                 result["adapter"], result["txt"], result["seconds"])
+        state.save()
+
+    # Comparison with the golden texts
+    golden_dir = os.path.join(test_dir, TEST_GOLDEN_DIR)
+    counts = {}
+    logger.info("=" * 80)
+    for file in html_files:
+        entry = state.files.get(file)
+        result = results.get(file)
+        timing = f"{result['seconds']}s" if result else "cached"
+        if not entry:
+            status, details = "error", result["error"] if result else "no output"
+        else:
+            golden_path = os.path.join(golden_dir, os.path.splitext(file)[0] + ".txt")
+            txt_path = os.path.join(test_dir, entry["txt"])
+            if update_golden:
+                os.makedirs(golden_dir, exist_ok=True)
+                shutil.copyfile(txt_path, golden_path)
+            status, added, removed, diff = compare_with_golden(txt_path, golden_path)
+            details = entry["adapter"].rsplit(".", 1)[-1]
+            if status == "changed":
+                details += f", +{added}/-{removed} lines"
+        counts[status] = counts.get(status, 0) + 1
+        # Compact summary: identical files only show up in debug logs
+        log = logger.debug if status == "identical" else logger.info
+        log(f"  [{status}] {file} ({details}, {timing})")
+        if entry and status == "changed":
+            for line in diff[2:2 + TEST_DIFF_PREVIEW_LINES]:
+                logger.info(f"      {line[:160]}")
+
+    logger.info(f"[TEST MODE] {len(html_files)} file(s) in {time.monotonic() - start:.1f}s: " +
+                ", ".join(f"{status}={count}" for status, count in sorted(counts.items())))
+    if update_golden:
+        logger.info(f"[TEST MODE] Golden texts updated in {golden_dir}")
+    logger.info("=" * 80)
+    return 0 if update_golden else counts.get("changed", 0) + counts.get("error", 0)
+
+
+def update_feed(library_index):
+    """Regenerates the pages of the podcast feed that changed."""
+    if FEED_BASE_URL:
+        write_feed(library_index, OUTPUT_DIR, FEED_BASE_URL, FEED_TITLE, page_size=FEED_PAGE_SIZE)
+
+
+def main_build_index():
+    """One-off indexer: builds the library index (and feed) from the MP3s already in OUTPUT_DIR."""
+    for directory in [OUTPUT_DIR, STATE_DIR]:
+        os.makedirs(directory, exist_ok=True)
+    library_index = LibraryIndex(os.path.join(STATE_DIR, "library.json"))
+    library_index.sync_with_directory(OUTPUT_DIR)
+    update_feed(library_index)
+
+
+def main_import_archive():
+    """
+    One-off migration: moves the HTML files archived by older versions (plain
+    files at the top of ARCHIVE_DIR) into the archive store, so that --retag
+    reads them too.
+    """
+    if not os.path.isdir(ARCHIVE_DIR):
+        logger.error(f"Archive directory not found: {ARCHIVE_DIR}")
+        return
+    imported = archive_store().import_legacy()
+    logger.info(f"{imported} legacy archived file(s) imported, {archive_store().stats()['contents']} "
+                f"distinct contents in the archive store")
+
+
+# Lookup tables of the retag workers, set once per process by _init_retag_worker
+_retag_by_source = {}
+_retag_by_url = {}
+
+
+def _init_retag_worker(by_source, by_url):
+    global _retag_by_source, _retag_by_url
+    _retag_by_source = by_source
+    _retag_by_url = by_url
+
+
+def retag_archived_file(job):
+    """
+    Retag worker: re-extracts the metadata of an archived HTML file (no TTS)
+    and rewrites the ID3 frames of its MP3 in place. job: (path of the
+    archived copy, original filename, MP3 recorded by the archive index). The
+    MP3 is the recorded one if it still exists, else it is found by archived
+    source name, then by canonical URL, then by the name the current metadata
+    would give it. Returns (source, mp3_name, meta, status).
+    """
+    filepath, source, archived_mp3 = job
+    try:
+        adapter = parse_article(read_html(filepath), source)
+        meta = adapter.extract_metadata()
+        adapter.close()
+
+        mp3_name = archived_mp3 if archived_mp3 and os.path.exists(os.path.join(OUTPUT_DIR, archived_mp3)) else None
+        mp3_name = (mp3_name or _retag_by_source.get(source) or
+                    _retag_by_url.get(canonical_url(meta['url'])))
+        if not mp3_name:
+            mp3_name = build_output_name(meta, source, ".mp3")
+        mp3_path = os.path.join(OUTPUT_DIR, mp3_name)
+        if not os.path.exists(mp3_path):
+            return source, None, None, "no matching MP3"
+
+        write_id3_tags(mp3_path, meta)
+        return source, mp3_name, meta, "retagged"
+    except Exception as e:
+        return source, None, None, f"error: {e}"
+
+
+def main_retag(workers=None):
+    """
+    Retag-only mode: rewrites the ID3 tags of the existing MP3s from the
+    archived HTML files with the current adapters, without any synthesis.
+    Files are processed in parallel; the cover images are kept as they are.
+    """
+    for directory in [OUTPUT_DIR, STATE_DIR]:
+        os.makedirs(directory, exist_ok=True)
+    library_index = LibraryIndex(os.path.join(STATE_DIR, "library.json"))
+    library_index.sync_with_directory(OUTPUT_DIR)
+
+    by_source = {}
+    by_url = {}
+    for mp3_name, entry in library_index.episodes.items():
+        if entry.get("source"):
+            by_source[entry["source"]] = mp3_name
+        if entry.get("url"):
+            by_url[canonical_url(entry["url"])] = mp3_name
+
+    if not os.path.isdir(ARCHIVE_DIR):
+        logger.error(f"Archive directory not found: {ARCHIVE_DIR}")
+        return
+    store = archive_store()
+    jobs = [(store.object_path(entry["sha1"]), entry["name"], entry["mp3"]) for entry in store.contents()]
+    logger.info(f"Retagging from {len(jobs)} archived HTML files...")
+
+    start = time.monotonic()
+    report = RunReport()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_retag_worker,
+                             initargs=(by_source, by_url)) as pool:
+        for source, mp3_name, meta, status in pool.map(retag_archived_file, jobs, chunksize=8):
+            if mp3_name:
+                library_index.add(os.path.join(OUTPUT_DIR, mp3_name), meta, source=source, save=False)
+                report.record_article(source, "done", mp3=mp3_name)
+            elif status.startswith("error"):
+                logger.error(f"Retag failed for {source}: {status}")
+                report.record_article(source, "failed", error=status)
+            else:
+                report.record_article(source, "skipped", reason=status)
+
+    library_index.save()
+    update_feed(library_index)
+    report.add_section("retag", {"seconds": round(time.monotonic() - start, 1)})
+    report.log()
+    report.save(os.path.join(STATE_DIR, "last_retag.json"))
+
+
+def tts_concurrency(engine):
+    """Requests (edge-tts) or processes (local engine) synthesizing an article at once."""
+    return TTS_MAX_CONCURRENCY if engine == "edge" else (os.cpu_count() or 1)
+
 
+def format_duration(seconds):
+    """Duration for the logs: "1h05", "12 min" or "40 s"."""
+    seconds = round(seconds)
+    if seconds >= 3600:
+        return f"{seconds // 3600}h{seconds % 3600 // 60:02d}"
+    if seconds >= 60:
+        return f"{seconds // 60} min"
+    return f"{seconds} s"
 
-async def main():
+
+def input_backlog():
+    """Backlog of INPUT_DIR (files waiting, in processing order)."""
+    return Backlog(INPUT_DIR, PRIORITY_DIR, priority_marker=PRIORITY_MARKER,
+                   aging_chars_per_hour=PRIORITY_AGING_CHARS_PER_HOUR,
+                   state_path=os.path.join(STATE_DIR, "backlog.json"),
+                   exclude=[ARCHIVE_DIR, QUARANTINE_DIR, LEASE_DIR], recursive=INPUT_SUBFOLDERS,
+                   rescan_every=BACKLOG_RESCAN_FILES, rescan_interval=BACKLOG_RESCAN_SECONDS)
+
+
+def plan_article(filepath):
+    """
+    Plan worker: extracts a file without synthesizing it. Returns the file
+    name, its URL, text body and number of characters to synthesize, or the
+    extraction error.
+    """
+    result = {"file": os.path.basename(filepath)}
+    try:
+        article = extract_article(filepath)
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+        return result
+    result["url"] = article['meta']['url']
+    result["text_body"] = article['text_body']
+    result["chars"] = len(article['full_content']) if article['full_content'] else 0
+    return result
+
+
+def main_plan(tts_backend=TTS_BACKEND, workers=None):
+    """
+    Plan mode - costs the backlog of INPUT_DIR without synthesizing it. Files
+    are extracted in parallel and listed in processing order with their
+    characters to synthesize, estimated audio duration and synthesis time
+    (speed learned from previous runs, see ThroughputModel), and whether the
+    normal run would skip them: too short, duplicate, or failed recently.
+    """
+    os.makedirs(STATE_DIR, exist_ok=True)
+    backlog = input_backlog()
+    try:
+        queue = backlog.scan()
+    except FileNotFoundError:
+        logger.error(f"Input directory not found: {INPUT_DIR}")
+        return
+    if not queue:
+        logger.info("No new HTML files found.")
+        return
+
+    failures = FailureCache(os.path.join(STATE_DIR, "failures.json"), QUARANTINE_DIR,
+                            max_attempts=FAILURE_MAX_ATTEMPTS, retry_delay=FAILURE_RETRY_DELAY,
+                            input_dir=INPUT_DIR)
+    dedup_index = DuplicateIndex(os.path.join(STATE_DIR, "dedup_index.jsonl"), DEDUP_SIMILARITY)
+    throughput = ThroughputModel(os.path.join(STATE_DIR, "throughput.json"))
+    engine = "local" if tts_backend == "local" else "edge"
+    concurrency = tts_concurrency(engine)
+    max_rate = TTS_CHARS_PER_MINUTE / 60 if engine == "edge" else None
+    rate, rate_source = throughput.chars_per_second(engine, concurrency, max_rate)
+
+    # Files that failed recently are not extracted: the run would skip them as well
+    skipped = {item.path: failures.check(item.path) for item in queue}
+    paths = [item.path for item in queue if not skipped[item.path]]
+    logger.info(f"[PLAN] Extracting {len(paths)} file(s)...")
+    start = time.monotonic()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = dict(zip(paths, pool.map(plan_article, paths)))
+
+    report = RunReport()
+    totals = {"chars": 0, "audio_s": 0.0, "tts_s": 0.0}
+    logger.info("=" * 80)
+    for item in queue:
+        result = results.get(item.path)
+        if result is None:
+            status, reason = "skipped", f"failing: {skipped[item.path]}"
+        elif "error" in result:
+            status, reason = "failed", result["error"]
+        elif not result["chars"]:
+            status, reason = "skipped", "content too short or empty"
+        else:
+            duplicate = dedup_index.find(result["url"], result["text_body"]) if DEDUP_MODE == "skip" else None
+            if duplicate:
+                status, reason = "skipped", f"duplicate of {duplicate[0]['mp3']}"
+            else:
+                status, reason = "planned", None
+                # Later copies of this article in the backlog are duplicates too
+                dedup_index.add(result["url"], result["text_body"], item.name, persist=False)
+        if status != "planned":
+            logger.info(f"  [{status}] {item.name} ({reason})")
+            report.record_article(item.name, status, reason=reason)
+            continue
+
+        chars = result["chars"]
+        audio_s, tts_s = throughput.estimate(engine, chars, concurrency, max_rate)
+        totals["chars"] += chars
+        totals["audio_s"] += audio_s
+        totals["tts_s"] += tts_s
+        logger.info(f"  [planned] {item.name}: {chars} chars, {format_duration(audio_s)} of audio, "
+                    f"{format_duration(tts_s)} to synthesize (done after {format_duration(totals['tts_s'])})"
+                    + (", priority" if item.priority else ""))
+        report.record_article(item.name, status, chars=chars, audio_s=round(audio_s), tts_s=round(tts_s),
+                              eta_s=round(totals["tts_s"]), priority=item.priority)
+
+    logger.info("=" * 80)
+    planned = sum(1 for entry in report.articles if entry["status"] == "planned")
+    logger.info(f"[PLAN] {planned} article(s) to synthesize: {totals['chars']} characters, "
+                f"{format_duration(totals['audio_s'])} of audio, about {format_duration(totals['tts_s'])} "
+                f"with {engine} at concurrency {concurrency} ({rate:.0f} chars/s, {rate_source})")
+    if engine == "edge" and totals["chars"] > TTS_CHARS_PER_DAY:
+        logger.info(f"[PLAN] More than the daily edge-tts budget ({TTS_CHARS_PER_DAY} characters): "
+                    f"{-(-totals['chars'] // TTS_CHARS_PER_DAY)} days needed")
+    logger.info(f"[PLAN] Extraction took {time.monotonic() - start:.1f}s")
+    report.add_section("plan", {"engine": engine, "concurrency": concurrency, "chars_per_s": round(rate),
+                                "rate": rate_source, "chars": totals["chars"],
+                                "audio_s": round(totals["audio_s"]), "tts_s": round(totals["tts_s"])})
+    report.save(os.path.join(STATE_DIR, "last_plan.json"))
+
+
+async def main(tts_backend=TTS_BACKEND, hedging=TTS_HEDGING):
     # Ensure directories exist
-    for directory in [INPUT_DIR, OUTPUT_DIR, ARCHIVE_DIR]:
+    for directory in [INPUT_DIR, OUTPUT_DIR, ARCHIVE_DIR, STATE_DIR, PRIORITY_DIR]:
         if not os.path.exists(directory):
             try:
                 os.makedirs(directory)
@@ -583,24 +904,113 @@ async def main():
 
     logger.info("Starting scan...")
     files_found = False
+    report = RunReport()
+    dedup_index = DuplicateIndex(os.path.join(STATE_DIR, "dedup_index.jsonl"), DEDUP_SIMILARITY)
+    library_index = LibraryIndex(os.path.join(STATE_DIR, "library.json"))
+
+    # Complete (or roll back) the commits interrupted by a previous crash
+    committer = OutputCommitter(STAGING_DIR, OUTPUT_DIR, archive_input)
+    for entry in committer.recover():
+        index_episode(entry, library_index, dedup_index)
+        committer.finish(entry)
+        report.record_article(os.path.basename(entry["source"]), "done", recovered=True)
     
+    backlog = input_backlog()
     try:
-        files = sorted(os.listdir(INPUT_DIR))
+        queue = backlog.refresh()
     except FileNotFoundError:
         logger.error(f"Input directory not found: {INPUT_DIR}")
+        committer.close()
         return
+    if queue:
+        logger.info(f"{len(queue)} file(s) queued ({sum(item.priority for item in queue)} priority, "
+                    f"{sum(item.chars for item in queue)} characters)")
+        for item in queue:
+            logger.debug(f"  {item.name}: {item.chars} chars{', priority' if item.priority else ''}")
 
-    for file in files:
-        filepath = os.path.join(INPUT_DIR, file)
-        
-        if os.path.isdir(filepath): continue
-        if file.startswith('.'): continue
-        if file.endswith('.part') or file.endswith('.tmp') or file.endswith('.crdownload'): continue
-        
-        if file.lower().endswith(".html") or file.lower().endswith(".htm"):
-            files_found = True
-            await process_html_file(filepath)
+    try:
+        backend = get_backend(
+            tts_backend, VOICE,
+            local_engine=LOCAL_TTS_ENGINE,
+            local_voice=LOCAL_TTS_VOICE,
+            local_model=PIPER_MODEL,
+            scheduler_options={
+                "state_path": os.path.join(STATE_DIR, "tts_budget.json"),
+                "max_concurrency": TTS_MAX_CONCURRENCY,
+                "max_retries": TTS_MAX_RETRIES,
+                "request_deadline": TTS_REQUEST_DEADLINE,
+                "chars_per_minute": TTS_CHARS_PER_MINUTE,
+                "chars_per_day": TTS_CHARS_PER_DAY,
+                "hedge": hedging,
+                "hedge_percentile": TTS_HEDGE_PERCENTILE,
+                "hedge_max_rate": TTS_HEDGE_MAX_RATE,
+            }
+        )
+    except RuntimeError as e:
+        logger.error(str(e))
+        committer.close()
+        return
+
+    extraction_worker = RecyclingWorker(extract_article, max_rss_mb=WORKER_MAX_RSS_MB,
+                                        max_jobs=WORKER_MAX_JOBS)
+    leases = LeaseManager(LEASE_DIR, ttl=LEASE_TTL, heartbeat=LEASE_HEARTBEAT)
+    failures = FailureCache(os.path.join(STATE_DIR, "failures.json"), QUARANTINE_DIR,
+                            max_attempts=FAILURE_MAX_ATTEMPTS, retry_delay=FAILURE_RETRY_DELAY,
+                            input_dir=INPUT_DIR)
+    throughput = ThroughputModel(os.path.join(STATE_DIR, "throughput.json"))
+
+    # The directory is scanned again from time to time (see Backlog.next): files
+    # saved during the run are scheduled with the others
+    done = set()
+    while (item := backlog.next(done)) is not None:
+        done.add(item.path)
+        filepath, file = item.path, item.name
+        files_found = True
+        # Unchanged file that failed recently: skipped without being parsed
+        reason = failures.check(filepath)
+        if reason:
+            logger.debug(f"Skipping {file}: {reason}")
+            continue
+        # Leases are keyed by relative path: same-named files of two subfolders are distinct
+        lease = leases.claim(os.path.relpath(filepath, INPUT_DIR))
+        if lease is None:
+            logger.info(f"Skipping {file}: claimed by another process")
+            continue
+        heartbeat = asyncio.create_task(leases.keep_alive(lease))
+        try:
+            # Another process may have finished it since the directory was listed
+            if os.path.exists(filepath):
+                await process_html_file(filepath, backend, report, dedup_index, library_index,
+                                        extraction_worker, committer, failures, throughput, item.category,
+                                        owns_input=functools.partial(leases.renew, lease))
+        finally:
+            heartbeat.cancel()
+            leases.release(lease)
     
+    extraction_worker.close()
+    backend.close()
+    committer.close()
+
+    update_feed(library_index)
+    if library_index.logged:
+        library_index.save()  # Compacts the episodes logged during the run
+
+    report.add_section("tts", backend.stats())
+    report.add_section("workers", extraction_worker.stats())
+    report.add_section("leases", leases.stats())
+    report.add_section("failures", failures.stats())
+    report.add_section("backlog", backlog.stats())
+    report.add_section("archive", archive_store().stats())
+    report.add_section("artifacts", {"pruned": artifact_cache().prune()})
+    tiers = {}
+    for entry in report.articles:
+        if "tier" in entry:
+            tiers[entry["tier"]] = tiers.get(entry["tier"], 0) + 1
+    if tiers:
+        report.add_section("extraction", tiers)
+    report.log()
+    report.save(os.path.join(STATE_DIR, "last_run.json"))
+
     if not files_found:
         logger.info("No new HTML files found.")
 
@@ -612,6 +1022,11 @@ if __name__ == "__main__":
         epilog="""Examples:
   Normal mode:  python3 html_to_mp3.py
   Test mode:    python3 html_to_mp3.py --test
+  Golden texts: python3 html_to_mp3.py --test --update-golden
+  Local TTS:    python3 html_to_mp3.py --tts local
+  Retag only:   python3 html_to_mp3.py --retag
+  Old archives: python3 html_to_mp3.py --import-archive
+  Plan only:    python3 html_to_mp3.py --plan
         """
     )
     parser.add_argument(
@@ -621,6 +1036,61 @@ if __name__ == "__main__":
              'Les fichiers HTML sont lus depuis Article-Test/ et les fichiers '
              'texte sont créés dans le même dossier.'
     )
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help="Mode test: ré-extrait tous les fichiers, même ceux dont le HTML et "
+             "le code d'extraction n'ont pas changé depuis le dernier passage."
+    )
+    parser.add_argument(
+        '--update-golden',
+        action='store_true',
+        help='Mode test: enregistre les textes produits comme textes de référence '
+             '(Article-Test/golden/), auxquels les passages suivants sont comparés.'
+    )
+    parser.add_argument(
+        '--tts',
+        choices=['edge', 'local', 'auto'],
+        default=TTS_BACKEND,
+        help='Moteur de synthèse vocale: edge (edge-tts), local (espeak-ng/piper, '
+             'hors ligne, parallélisé sur tous les cœurs) ou auto (edge-tts avec '
+             'bascule automatique sur le moteur local). Défaut: %(default)s'
+    )
+    parser.add_argument(
+        '--hedge',
+        action='store_true',
+        default=TTS_HEDGING,
+        help='Relance en double les requêtes edge-tts anormalement lentes '
+             '(au plus TTS_HEDGE_MAX_RATE des requêtes) et garde la première réponse.'
+    )
+    parser.add_argument(
+        '--build-index',
+        action='store_true',
+        help="Construit l'index de la bibliothèque à partir des MP3 existants de "
+             "OUTPUT_DIR (tags ID3 et durée par lecture des en-têtes de trames), "
+             "puis régénère le flux podcast."
+    )
+    parser.add_argument(
+        '--retag',
+        action='store_true',
+        help="Réécrit uniquement les tags ID3 des MP3 existants à partir des HTML "
+             "archivés (ARCHIVE_DIR), avec les adapters actuels, sans synthèse vocale."
+    )
+    parser.add_argument(
+        '--import-archive',
+        action='store_true',
+        help="Importe une fois pour toutes dans l'archive compressée (ARCHIVE_DIR/objects) "
+             "les fichiers HTML archivés par les versions précédentes, pour que --retag "
+             "les relise aussi."
+    )
+    parser.add_argument(
+        '--plan',
+        action='store_true',
+        help="Estime le traitement des articles en attente sans synthèse vocale: "
+             "caractères à synthétiser, durée audio et durée de synthèse (vitesse "
+             "apprise des passages précédents) par fichier et au total, et fichiers "
+             "qui seraient ignorés (trop courts, doublons, en échec)."
+    )
     
     args = parser.parse_args()
     
@@ -631,9 +1101,18 @@ if __name__ == "__main__":
                 os.path.dirname(os.path.abspath(__file__)),
                 "Article-Test"
             )
-            main_test(test_dir)
+            if main_test(test_dir, force=args.force, update_golden=args.update_golden):
+                sys.exit(1)
+        elif args.build_index:
+            main_build_index()
+        elif args.retag:
+            main_retag()
+        elif args.import_archive:
+            main_import_archive()
+        elif args.plan:
+            main_plan(args.tts)
         else:
             # Normal mode: async execution
-            asyncio.run(main())
+            asyncio.run(main(args.tts, args.hedge))
     except KeyboardInterrupt:
         logger.info("Stopped by user.")
@@ -0,0 +1,4 @@
+from .dedup import DuplicateIndex, canonical_url, simhash
+from .index import LibraryIndex, read_mp3_entry
+from .feed import write_feed
+from .mp3info import scan_mp3
@@ -0,0 +1,187 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+logger = logging.getLogger(__name__)
+
+MASK64 = (1 << 64) - 1
+SHINGLE_K1 = 0x9E3779B97F4A7C15
+SHINGLE_K2 = 0xC2B2AE3D27D4EB4F
+WORD_RE = re.compile(r'\w+')
+
+# Query parameters that only track the visitor and never change the article
+TRACKING_PARAMS = re.compile(r'^(utm_\w+|fbclid|gclid|xtor|at_\w+|mc_\w+|ref|amp)$', re.IGNORECASE)
+
+# Below this length a SimHash is too noisy to compare texts
+MIN_FINGERPRINT_CHARS = 500
+
+
+def canonical_url(url):
+    """Normalizes a URL so that the same article saved twice gives the same key."""
+    if not url:
+        return ""
+    try:
+        parts = urlsplit(url.strip())
+    except ValueError:
+        return url.strip()
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = sorted((k, v) for k, v in parse_qsl(parts.query) if not TRACKING_PARAMS.match(k))
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit(("https" if parts.scheme in ("http", "https") else parts.scheme,
+                       host, path, urlencode(query), ""))
+
+
+def _splitmix64(x):
+    x = (x + 0x9E3779B97F4A7C15) & MASK64
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & MASK64
+    return x ^ (x >> 31)
+
+
+def _token_hashes(words):
+    """Stable 64-bit hash of each word (each distinct word is hashed once)."""
+    vocabulary = {}
+    hashes = []
+    for word in words:
+        h = vocabulary.get(word)
+        if h is None:
+            h = int.from_bytes(hashlib.blake2b(word.encode("utf-8"), digest_size=8).digest(), "little")
+            vocabulary[word] = h
+        hashes.append(h)
+    return hashes
+
+
+def simhash(text):
+    """64-bit SimHash of the 3-word shingles of text."""
+    words = WORD_RE.findall(text.lower())
+    if len(words) < 3:
+        words = words + [""] * (3 - len(words))
+    tokens = _token_hashes(words)
+    shingles = [
+        _splitmix64((tokens[i] * SHINGLE_K1 + tokens[i + 1] * SHINGLE_K2 + tokens[i + 2]) & MASK64)
+        for i in range(len(tokens) - 2)
+    ]
+    counts = [sum((h >> bit) & 1 for h in shingles) for bit in range(64)]
+    total = len(shingles)
+
+    fingerprint = 0
+    for bit in range(64):
+        if 2 * counts[bit] > total:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+class DuplicateIndex:
+    """
+    Index of the articles already synthesized, persisted as JSON lines.
+
+    Articles are matched by canonical URL (O(1) dict lookup) or by SimHash of
+    their text. Near-duplicate lookup uses the pigeonhole principle: the 64
+    bits are cut into max_distance + 1 bands, two fingerprints within
+    max_distance bits share at least one band exactly, so only the entries of
+    the matching band buckets are compared.
+    """
+
+    def __init__(self, path, similarity=0.95):
+        self.path = path
+        self.threshold = similarity
+        self.max_distance = int((1 - similarity) * 64)
+        self.bands = self.max_distance + 1
+        self.band_bits = 64 // self.bands
+        self.entries = []
+        self.by_url = {}
+        self.by_band = [{} for _ in range(self.bands)]
+        self._load()
+
+    def _band_keys(self, fingerprint):
+        mask = (1 << self.band_bits) - 1
+        return [(fingerprint >> (i * self.band_bits)) & mask for i in range(self.bands)]
+
+    def _insert(self, entry):
+        index = len(self.entries)
+        self.entries.append(entry)
+        if entry.get("url"):
+            self.by_url[entry["url"]] = index
+        if entry.get("fingerprint"):
+            for band, key in enumerate(self._band_keys(int(entry["fingerprint"], 16))):
+                self.by_band[band].setdefault(key, []).append(index)
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    self._insert(json.loads(line))
+                except ValueError:
+                    continue  # Truncated line from an interrupted run
+        logger.info(f"Duplicate index: {len(self.entries)} articles loaded")
+
+    def find(self, url, text):
+        """
+        Returns (entry, similarity) of the archived article matching this one,
+        or None. A URL match whose new text is much longer (e.g. the full
+        article saved after a paywall login), or whose text is less similar
+        than the threshold (corrected or rewritten article), is not a
+        duplicate; a URL match is only taken on trust when either text is
+        too short to fingerprint.
+        """
+        url = canonical_url(url)
+        fingerprint = simhash(text) if len(text) >= MIN_FINGERPRINT_CHARS else None
+
+        if url and url in self.by_url:
+            entry = self.entries[self.by_url[url]]
+            if len(text) <= 1.5 * entry.get("chars", 0):
+                similarity = 1.0
+                if fingerprint is not None and entry.get("fingerprint"):
+                    similarity = self._similarity(fingerprint, int(entry["fingerprint"], 16))
+                if similarity >= self.threshold:
+                    return entry, similarity
+                logger.info(f"Same URL as {entry.get('mp3')} but rewritten text "
+                            f"(similarity {similarity:.0%}), not a duplicate")
+            else:
+                logger.info(f"Same URL as {entry.get('mp3')} but longer text, not a duplicate")
+
+        if fingerprint is None:
+            return None
+
+        best = None
+        seen = set()
+        for band, key in enumerate(self._band_keys(fingerprint)):
+            for index in self.by_band[band].get(key, ()):
+                if index in seen:
+                    continue
+                seen.add(index)
+                distance = (fingerprint ^ int(self.entries[index]["fingerprint"], 16)).bit_count()
+                if distance <= self.max_distance and (best is None or distance < best[1]):
+                    best = (self.entries[index], distance)
+
+        if best is None:
+            return None
+        return best[0], 1 - best[1] / 64
+
+    @staticmethod
+    def _similarity(a, b):
+        return 1 - (a ^ b).bit_count() / 64
+
+    def add(self, url, text, mp3_name, title="", persist=True):
+        """Indexes a synthesized article; persist=False keeps it in memory only (dry runs)."""
+        entry = {
+            "url": canonical_url(url),
+            "fingerprint": f"{simhash(text):016x}" if len(text) >= MIN_FINGERPRINT_CHARS else "",
+            "chars": len(text),
+            "mp3": mp3_name,
+            "title": title,
+            "added": time.strftime('%Y-%m-%d %H:%M:%S'),
+        }
+        self._insert(entry)
+        if not persist:
+            return
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
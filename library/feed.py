@@ -0,0 +1,127 @@
+import hashlib
+import json
+import logging
+import os
+import xml.etree.ElementTree as ET
+from email.utils import formatdate
+from urllib.parse import quote
+
+logger = logging.getLogger(__name__)
+
+ITUNES_NS = "http://www.itunes.com/dtds/podcast-1.0.dtd"
+ATOM_NS = "http://www.w3.org/2005/Atom"
+ET.register_namespace("itunes", ITUNES_NS)
+ET.register_namespace("atom", ATOM_NS)
+
+FEED_NAME = "feed.xml"
+ARCHIVE_NAME = "feed-archive-{}.xml"
+
+
+def _format_duration(seconds):
+    seconds = int(round(seconds))
+    return f"{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+
+def _url(base_url, name):
+    return f"{base_url.rstrip('/')}/{quote(name)}"
+
+
+def _render(episodes, page_links, base_url, title, description):
+    """Renders one RSS 2.0 / iTunes document. episodes: [(mp3_name, entry)] newest first."""
+    rss = ET.Element("rss", {"version": "2.0"})
+    channel = ET.SubElement(rss, "channel")
+    ET.SubElement(channel, "title").text = title
+    ET.SubElement(channel, "link").text = base_url
+    ET.SubElement(channel, "description").text = description
+    ET.SubElement(channel, "language").text = "fr"
+    ET.SubElement(channel, f"{{{ITUNES_NS}}}author").text = title
+    ET.SubElement(channel, f"{{{ITUNES_NS}}}explicit").text = "false"
+    for rel, name in page_links:
+        ET.SubElement(channel, f"{{{ATOM_NS}}}link", {"rel": rel, "href": _url(base_url, name)})
+
+    for mp3_name, entry in episodes:
+        item = ET.SubElement(channel, "item")
+        ET.SubElement(item, "title").text = entry.get("title") or os.path.splitext(mp3_name)[0]
+        if entry.get("url"):
+            ET.SubElement(item, "link").text = entry["url"]
+        ET.SubElement(item, "description").text = entry.get("description", "")
+        if entry.get("category"):
+            ET.SubElement(item, "category").text = entry["category"]
+        ET.SubElement(item, "guid", {"isPermaLink": "false"}).text = mp3_name
+        ET.SubElement(item, "pubDate").text = formatdate(entry.get("added", 0), usegmt=True)
+        ET.SubElement(item, "enclosure", {
+            "url": _url(base_url, mp3_name),
+            "length": str(entry.get("size", 0)),
+            "type": "audio/mpeg",
+        })
+        ET.SubElement(item, f"{{{ITUNES_NS}}}author").text = entry.get("author", "")
+        ET.SubElement(item, f"{{{ITUNES_NS}}}duration").text = _format_duration(entry.get("duration", 0))
+        ET.SubElement(item, f"{{{ITUNES_NS}}}summary").text = entry.get("description", "")
+
+    ET.indent(rss)
+    return ET.tostring(rss, encoding="utf-8", xml_declaration=True)
+
+
+def _page_hash(episodes, page_links, *channel):
+    payload = json.dumps([episodes, page_links, channel], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def write_feed(index, output_dir, base_url, title="Articles audio",
+               description="Articles convertis en audio", page_size=100):
+    """
+    Writes the podcast feed of the library index into output_dir, paginated as
+    RFC 5005 archived feeds:
+
+    - feed.xml holds the page_size newest episodes and links to the archives;
+    - feed-archive-N.xml hold fixed blocks of page_size episodes, oldest first.
+
+    Only the pages whose episodes (or links) changed since the last call are
+    rewritten: adding an episode rewrites feed.xml and, at most, creates one
+    archive page. Returns the number of pages written.
+    """
+    ordered = sorted(index.episodes.items(), key=lambda item: (item[1].get("added", 0), item[0]))
+    archive_count = len(ordered) // page_size if len(ordered) > page_size else 0
+
+    pages = []
+    for number in range(1, archive_count + 1):
+        block = ordered[(number - 1) * page_size:number * page_size]
+        links = [("current", FEED_NAME), ("self", ARCHIVE_NAME.format(number))]
+        if number > 1:
+            links.append(("prev-archive", ARCHIVE_NAME.format(number - 1)))
+        if number < archive_count:
+            links.append(("next-archive", ARCHIVE_NAME.format(number + 1)))
+        pages.append((ARCHIVE_NAME.format(number), list(reversed(block)), links))
+
+    links = [("self", FEED_NAME)]
+    if archive_count:
+        links.append(("prev-archive", ARCHIVE_NAME.format(archive_count)))
+    pages.append((FEED_NAME, list(reversed(ordered[-page_size:])), links))
+
+    written = 0
+    for name, episodes, links in pages:
+        page_hash = _page_hash(episodes, links, base_url, title, description)
+        path = os.path.join(output_dir, name)
+        if index.feed_pages.get(name) == page_hash and os.path.exists(path):
+            continue
+        tmp_path = os.path.join(output_dir, f".{name}.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(_render(episodes, links, base_url, title, description))
+        os.replace(tmp_path, path)
+        index.feed_pages[name] = page_hash
+        written += 1
+
+    # Pages beyond the current archive count (episodes deleted) are removed
+    for name in list(index.feed_pages):
+        if name not in {page[0] for page in pages}:
+            try:
+                os.remove(os.path.join(output_dir, name))
+            except FileNotFoundError:
+                pass
+            del index.feed_pages[name]
+            written += 1
+
+    if written:
+        index.save()
+        logger.info(f"Podcast feed updated: {written} page(s) written")
+    return written
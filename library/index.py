@@ -0,0 +1,181 @@
+import hashlib
+import json
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from mutagen.id3 import ID3, ID3NoHeaderError
+from .mp3info import scan_mp3
+
+logger = logging.getLogger(__name__)
+
+
+def cover_hash(image_data):
+    """Short hash identifying a cover image (same cover => same hash)."""
+    if not image_data:
+        return ""
+    return hashlib.sha1(image_data).hexdigest()[:16]
+
+
+def read_mp3_entry(mp3_path):
+    """
+    Builds a library entry from an existing MP3: ID3 frames are read without
+    touching the audio, the duration comes from a frame header scan.
+    """
+    try:
+        tags = ID3(mp3_path)
+    except ID3NoHeaderError:
+        tags = ID3()
+
+    def text(frame_id):
+        frame = tags.get(frame_id)
+        return str(frame.text[0]) if frame and frame.text else ""
+
+    description = ""
+    for frame in tags.getall("USLT"):
+        if frame.desc == "Description":
+            description = frame.text
+            break
+
+    url = ""
+    for frame in tags.getall("COMM"):
+        if frame.text:
+            url = str(frame.text[0])
+            break
+
+    apic = tags.getall("APIC")
+    info = scan_mp3(mp3_path)
+    stat = os.stat(mp3_path)
+    return {
+        "title": text("TIT2"),
+        "author": text("TPE1"),
+        "media": text("TALB"),
+        "date": text("TDRC"),
+        "category": text("TCON"),
+        "url": url,
+        "description": description,
+        "duration": info["duration"],
+        "size": info["size"],
+        "cover_hash": cover_hash(apic[0].data) if apic else "",
+        "added": stat.st_mtime,
+        "mtime": stat.st_mtime,
+    }
+
+
+class LibraryIndex:
+    """
+    Index of the episodes present in OUTPUT_DIR, keyed by MP3 filename.
+
+    Updated as each MP3 is committed, so generating the podcast feed never
+    needs to re-read the ID3 tags of the whole library. Each update is
+    appended to a log next to the index (<path>.log, one JSON line per
+    episode) instead of rewriting the whole index; save() compacts the log
+    into the index, which is also done every COMPACT_EVERY updates.
+    """
+
+    COMPACT_EVERY = 200
+
+    def __init__(self, path):
+        self.path = path
+        self.log_path = path + ".log"
+        self.episodes = {}
+        self.feed_pages = {}  # Page filename -> hash of its entries
+        self.logged = 0
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                self.episodes = data.get("episodes", {})
+                self.feed_pages = data.get("feed_pages", {})
+            except (OSError, ValueError) as e:
+                logger.warning(f"Could not read library index {path}: {e}")
+        if os.path.exists(self.log_path):
+            with open(self.log_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue  # Truncated line from an interrupted run
+                    self.episodes[record["mp3"]] = record["entry"]
+                    self.logged += 1
+
+    def save(self):
+        """Writes the whole index and empties the update log."""
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"episodes": self.episodes, "feed_pages": self.feed_pages}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+        try:
+            os.remove(self.log_path)
+        except FileNotFoundError:
+            pass
+        self.logged = 0
+
+    def add(self, mp3_path, meta, image_data=None, source="", save=True):
+        """
+        Records a freshly committed (or retagged) MP3 from the metadata used to
+        tag it. source is the name of the archived HTML it was made from; the
+        cover hash is kept when no new image is given. save: append the update
+        to the log (False: in memory only, the caller calls save()).
+        """
+        mp3_name = os.path.basename(mp3_path)
+        info = scan_mp3(mp3_path)
+        previous = self.episodes.get(mp3_name, {})
+        self.episodes[mp3_name] = {
+            "title": meta.get("title", ""),
+            "author": meta.get("author", ""),
+            "media": meta.get("media", ""),
+            "date": meta.get("date", ""),
+            "category": meta.get("category") or previous.get("category", ""),
+            "url": meta.get("url", ""),
+            "description": meta.get("description", ""),
+            "duration": info["duration"],
+            "size": info["size"],
+            "cover_hash": cover_hash(image_data) if image_data else previous.get("cover_hash", ""),
+            "source": source or previous.get("source", ""),
+            "added": previous.get("added", time.time()),
+            "mtime": os.path.getmtime(mp3_path),
+        }
+        if save:
+            self._log(mp3_name)
+
+    def _log(self, mp3_name):
+        if self.logged >= self.COMPACT_EVERY:
+            self.save()
+            return
+        with open(self.log_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps({"mp3": mp3_name, "entry": self.episodes[mp3_name]}, ensure_ascii=False) + "\n")
+        self.logged += 1
+
+    def sync_with_directory(self, output_dir, workers=None):
+        """
+        One-off indexer for an existing library: indexes the MP3s of output_dir
+        that are missing or changed since they were indexed, and forgets the
+        deleted ones. Files are scanned in parallel.
+        """
+        present = {}
+        with os.scandir(output_dir) as entries:
+            for entry in entries:
+                if entry.is_file() and entry.name.lower().endswith(".mp3") and not entry.name.startswith("."):
+                    present[entry.name] = entry.stat().st_mtime
+
+        removed = [name for name in self.episodes if name not in present]
+        for name in removed:
+            del self.episodes[name]
+
+        stale = [name for name, mtime in present.items()
+                 if self.episodes.get(name, {}).get("mtime") != mtime]
+        if stale:
+            logger.info(f"Indexing {len(stale)} MP3 files...")
+            paths = [os.path.join(output_dir, name) for name in stale]
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                for name, entry in zip(stale, pool.map(read_mp3_entry, paths, chunksize=16)):
+                    if name in self.episodes:
+                        entry["added"] = self.episodes[name].get("added", entry["added"])
+                        entry["source"] = self.episodes[name].get("source", "")
+                    self.episodes[name] = entry
+
+        if stale or removed:
+            self.save()
+        logger.info(f"Library index: {len(self.episodes)} episodes ({len(stale)} indexed, {len(removed)} removed)")
+        return len(stale), len(removed)
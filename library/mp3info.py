@@ -0,0 +1,87 @@
+import mmap
+import os
+
+# Bitrates (kbps) indexed by [MPEG-1 or not][layer][bitrate index]
+_BITRATES = {
+    (True, 1): [0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448],
+    (True, 2): [0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384],
+    (True, 3): [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    (False, 1): [0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256],
+    (False, 2): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+    (False, 3): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+_SAMPLE_RATES = {3: [44100, 48000, 32000], 2: [22050, 24000, 16000], 0: [11025, 12000, 8000]}
+
+
+def _parse_header(b0, b1, b2):
+    """Returns (frame_length, samples, sample_rate) of an MPEG audio frame header, or None."""
+    if b0 != 0xFF or (b1 & 0xE0) != 0xE0:
+        return None
+    version = (b1 >> 3) & 0x03       # 3: MPEG-1, 2: MPEG-2, 0: MPEG-2.5
+    layer = 4 - ((b1 >> 1) & 0x03)   # 1, 2 or 3
+    bitrate_index = b2 >> 4
+    rate_index = (b2 >> 2) & 0x03
+    if version == 1 or layer == 4 or bitrate_index in (0, 15) or rate_index == 3:
+        return None
+
+    mpeg1 = version == 3
+    bitrate = _BITRATES[(mpeg1, layer)][bitrate_index] * 1000
+    sample_rate = _SAMPLE_RATES[version][rate_index]
+    padding = (b2 >> 1) & 0x01
+
+    if layer == 1:
+        return (12 * bitrate // sample_rate + padding) * 4, 384, sample_rate
+    if layer == 3 and not mpeg1:
+        return 72 * bitrate // sample_rate + padding, 576, sample_rate
+    return 144 * bitrate // sample_rate + padding, 1152, sample_rate
+
+
+def _id3v2_size(mm):
+    if len(mm) >= 10 and mm[:3] == b"ID3":
+        size = (mm[6] << 21) | (mm[7] << 14) | (mm[8] << 7) | mm[9]
+        footer = 10 if mm[5] & 0x10 else 0
+        return 10 + size + footer
+    return 0
+
+
+def scan_mp3(path):
+    """
+    Computes the duration of an MP3 by walking its frame headers through mmap,
+    without decoding any audio. Returns a dict with duration (seconds), frames
+    and size (bytes); duration is 0 when no valid frame is found.
+    """
+    size = os.path.getsize(path)
+    info = {"duration": 0.0, "frames": 0, "size": size}
+    if size == 0:
+        return info
+
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        pos = _id3v2_size(mm)
+        end = size - 128 if size >= 128 and mm[size - 128:size - 125] == b"TAG" else size
+        samples = 0.0
+        resync = False
+
+        while pos + 4 <= end:
+            header = _parse_header(mm[pos], mm[pos + 1], mm[pos + 2])
+            if header is not None and resync:
+                # After a sync loss, only trust a header followed by another one
+                following = pos + header[0]
+                if following + 4 <= end and _parse_header(mm[following], mm[following + 1], mm[following + 2]) is None:
+                    header = None
+            if header is None or header[0] <= 0:
+                # Lost sync (garbage, embedded tag): look for the next frame
+                resync = True
+                pos = mm.find(b"\xff", pos + 1, end)
+                if pos == -1:
+                    break
+                continue
+            resync = False
+            length, frame_samples, sample_rate = header
+            if pos + length > end:
+                break
+            samples += frame_samples / sample_rate
+            info["frames"] += 1
+            pos += length
+
+        info["duration"] = round(samples, 3)
+    return info
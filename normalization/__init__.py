@@ -0,0 +1,27 @@
+import re
+import time
+
+from .inclusive import process_inclusive_writing
+from .cleaning import CLEANING_STAGES, clean_text_for_tts
+
+WHITESPACE = re.compile(r'\s+')
+
+# Full text normalization before synthesis, stage by stage: (name, function)
+NORMALIZATION_STAGES = [
+    ("whitespace", lambda text: WHITESPACE.sub(' ', text).strip()),
+    ("inclusive_writing", process_inclusive_writing),  # Handle écriture inclusive
+] + CLEANING_STAGES  # Remove URLs, notes, references
+
+
+def normalize_text(text, timings=None):
+    """
+    Normalizes an article text for TTS. When a timings dict is given, the
+    time spent in each stage is added to it (seconds, by stage name).
+    """
+    for name, stage in NORMALIZATION_STAGES:
+        start = time.perf_counter()
+        text = stage(text)
+        if timings is not None:
+            timings[name] = timings.get(name, 0.0) + time.perf_counter() - start
+    return text.strip()
+
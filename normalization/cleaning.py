@@ -0,0 +1,167 @@
+import re
+
+# Every rule below runs in time linear in the length of the text, whatever
+# its content: patterns that could re-scan the rest of the text from each
+# starting position (e.g. "Paru dans[^.]+\." on a long text without any
+# dot) are implemented as a single forward scan instead.
+
+
+def _sub(pattern, replacement, flags=0):
+    regex = re.compile(pattern, flags)
+    return lambda text: regex.sub(replacement, text)
+
+
+def _chain(*rules):
+    def apply(text):
+        for rule in rules:
+            text = rule(text)
+        return text
+    return apply
+
+
+def _cut_spans(prefix, stops, min_length=0, flags=0):
+    """
+    Equivalent of re.sub(prefix + "[^stops]{min_length,}[stops]", "", text)
+    in a single pass. The regex form re-scans up to the next stop character
+    for every prefix occurrence, which is quadratic when the prefix repeats
+    in a text without stop character. Here the position of the next stop is
+    computed once and reused by all the prefixes before it.
+    """
+    prefix_re = re.compile(prefix, flags)
+    stop_re = re.compile(f"[{re.escape(stops)}]")
+
+    def apply(text):
+        pieces = []
+        kept = 0
+        pos = 0
+        next_stop = -1
+        while True:
+            match = prefix_re.search(text, pos)
+            if not match:
+                break
+            if next_stop < match.end():
+                found = stop_re.search(text, match.end())
+                if not found:
+                    break  # No stop character left: no later prefix can match
+                next_stop = found.start()
+            if next_stop - match.end() < min_length:
+                pos = match.start() + 1
+                continue
+            pieces.append(text[kept:match.start()])
+            kept = pos = next_stop + 1
+        if not pieces:
+            return text
+        pieces.append(text[kept:])
+        return "".join(pieces)
+
+    return apply
+
+
+# Pattern: "Auteur, A. (YYYY). Titre. Éditeur..." The list of authors is
+# matched possessively and as a whole, so a long list without year is not
+# re-scanned from each of its authors.
+BIBLIO_HEAD = re.compile(
+    r'\b[A-Z][a-zà-ÿ]++,\s*+[A-Z]\.\s*+(?:&\s*+[A-Z][a-zà-ÿ]++,\s*+[A-Z]\.\s*+)*+(\(\d{4}\)\.)?'
+)
+BIBLIO_PUBLISHER = re.compile(r'Presses|Éditions|University|Press|Gallimard|Seuil')
+
+
+def _remove_bibliographic_references(text):
+    """
+    Removes "Auteur, A. (YYYY). Titre. ... Éditeur ... ." references: the title
+    runs up to the next dot, the publisher must appear before the following one.
+    """
+    pieces = []
+    kept = 0
+    pos = 0
+    while True:
+        match = BIBLIO_HEAD.search(text, pos)
+        if not match:
+            break
+        pos = match.end()
+        if match.group(1) is None:
+            continue
+        title_end = text.find('.', match.end())
+        if title_end <= match.end():
+            continue
+        end = text.find('.', title_end + 1)
+        if end == -1:
+            break
+        if not BIBLIO_PUBLISHER.search(text, title_end + 1, end):
+            continue
+        pieces.append(text[kept:match.start()])
+        kept = pos = end + 1
+    if not pieces:
+        return text
+    pieces.append(text[kept:])
+    return "".join(pieces)
+
+
+# Étapes du nettoyage, dans l'ordre: (nom, fonction texte -> texte)
+CLEANING_STAGES = [
+    # 1. Supprimer les URLs (http://, https://, www.)
+    ("urls", _chain(
+        _sub(r'https?://[^\s\)]++', ''),
+        _sub(r'www\.[^\s\)]++', ''),
+    )),
+    # 2. Supprimer les DOI
+    ("doi", _chain(
+        _sub(r'doi\.org/[^\s\)]++', ''),
+        _sub(r'https?://doi\.org/[^\s]++', ''),
+        _sub(r'\bdoi\s*+:\s*+[^\s]++', '', re.IGNORECASE),
+    )),
+    # 3. Supprimer les numéros de notes entre crochets [1], [2], etc.
+    ("note_brackets", _sub(r'\[\d+\]', '')),
+    # 4. Supprimer les appels de notes collés à un mot avant une ponctuation forte
+    # Ex: "mot1." ou "mot12," mais pas "le 20 janvier"
+    ("note_calls", _sub(r'(?<=[a-zA-Zà-ÿ])\d{1,2}(?=[\.,;:!?])', '')),
+    # 5. Supprimer les références bibliographiques typiques
+    ("bibliography", _remove_bibliographic_references),
+    # 6. Supprimer les mentions de licence Creative Commons
+    ("licenses", _chain(
+        _sub(r'(CC\s+BY[-\w]*+|Creative\s+Commons|Tous\s+droits\s+réservés)[^\.]*+\.?', '', re.IGNORECASE),
+        _cut_spans(r'Le texte seul est utilisable sous licence', '.', 1, re.IGNORECASE),
+    )),
+    # 7. Supprimer les références électroniques
+    ("electronic_references", _chain(
+        _sub(r'Référence électronique[^\.]*+\.?', '', re.IGNORECASE),
+        _cut_spans(r'\[En ligne\]', ',', 0, re.IGNORECASE),
+        _cut_spans(r'mis en ligne le', ',.', 1, re.IGNORECASE),
+        _cut_spans(r'consulté le \d', '.', 1, re.IGNORECASE),
+        _sub(r'URL\s*+:', '', re.IGNORECASE),
+    )),
+    # 8. Supprimer les mentions "Paru dans..." "Articles du même auteur"
+    ("publication_mentions", _chain(
+        _cut_spans(r'Paru dans', '.', 1, re.IGNORECASE),
+        _sub(r'Articles? du même auteur\.?', '', re.IGNORECASE),
+    )),
+    # 9. Supprimer les notes numérotées en début de phrase ("1 Texte de la note...")
+    # Le corps de la note ne contient pas de point: le prendre en entier
+    # (possessif) donne le même résultat sans retour arrière.
+    ("numbered_notes", _sub(r'\.\s+\d{1,2}\s+[A-Z][^\.]{10,150}+(?:\.\.\.|\.\s)', '. ')),
+    # 10-11. Nettoyer les doubles espaces et la ponctuation orpheline
+    ("punctuation", _chain(
+        _sub(r'\s+', ' '),
+        _sub(r'\s+([.,;:!?])', r'\1'),
+        _sub(r'([.,;:!?])\s*\1+', r'\1'),  # Ponctuation doublée
+        _sub(r'\(\s*\)', ''),  # Parenthèses vides
+        _sub(r'\[\s*\]', ''),  # Crochets vides
+        _sub(r'\s+\.', '.'),
+        _sub(r'\s+,', ','),
+    )),
+]
+
+
+def clean_text_for_tts(text: str) -> str:
+    """
+    Nettoie le texte pour la synthèse vocale en supprimant:
+    - URLs
+    - Numéros de notes de bas de page [1], [2], etc.
+    - Références bibliographiques
+    - DOI et identifiants
+    - Mentions de licence
+    - Métadonnées résiduelles
+    """
+    for _, stage in CLEANING_STAGES:
+        text = stage(text)
+    return text.strip()
@@ -0,0 +1,164 @@
+import re
+
+# Homophones: mots qui s'écrivent différemment au masculin/féminin mais sonnent pareil
+# Le masculin suffit à l'oral
+HOMOPHONES_RACINES = {
+    # Terminaisons en -é (ami/amie, salarié/salariée)
+    "ami", "amie", "salari", "déput", "charg", "employ", "invit", "concern",
+    "abonn", "engag", "fatigu", "motiv", "détermin", "passionn", "diplôm",
+    "qualifi", "expériment", "intéress", "touch", "affect", "impliqu",
+    "préoccup", "inform", "consult", "réuni", "assembl", "group", "rassembl",
+    "marqu", "salu", "accompagn", "guid", "orient", "form", "sensibilis",
+    "mobilis", "organis", "structur", "coordonn", "délég", "mandaté",
+    "autoris", "habilit", "certifi", "agré", "reconnu", "validé",
+    # Autres terminaisons muettes
+    "auteur", "lecteur", "acteur", "directeur", "professeur"
+}
+
+NEOLOGISMES = [
+    (re.compile(r'\bcelleux\b', re.IGNORECASE), 'celles et ceux'),
+    (re.compile(r'\bceuxlles\b', re.IGNORECASE), 'ceux et celles'),
+    (re.compile(r'\biels\b', re.IGNORECASE), 'elles et ils'),
+    (re.compile(r'\biel\b', re.IGNORECASE), 'elle ou il'),
+    (re.compile(r'\bae\b', re.IGNORECASE), 'a ou e'),  # rare mais existe
+]
+
+# Pattern: mot·suffixe·s ou mot·suffixe (avec point médian ou tiret ou parenthèses)
+# Séparateurs: · (point médian), - (tiret), . (point), ( )
+SEPARATEURS = r'[·\-\.\(\)]'
+
+# Les mots sont ancrés en début de mot (\b) et consommés sans retour arrière
+# (\w++): un séparateur n'étant jamais un caractère de mot, seul le mot entier
+# peut précéder un séparateur. Avec (\w+) seul, une longue suite de caractères
+# sans séparateur (code, identifiant, tableau aplati) était re-parcourue depuis
+# chaque position: coût quadratique.
+# Pattern pluriel: base·suffix·s
+PATTERN_PLURIEL = re.compile(rf'\b(\w++){SEPARATEURS}(\w++){SEPARATEURS}([s])\b')
+# Pattern singulier/court: base·suffix (ex: "chacun·e", "client·es")
+PATTERN_COURT = re.compile(rf'\b(\w++){SEPARATEURS}([eé]s?|ne|rice|euse|ive|se)\b', re.IGNORECASE)
+
+ESPACES = re.compile(r'\s+')
+
+
+def _sonnent_pareil(masculin: str, feminin: str) -> bool:
+    """
+    Détermine si le masculin et le féminin sonnent pareil à l'oral.
+    Utilise des règles phonétiques françaises + liste d'exceptions.
+    """
+    # Normaliser
+    masc = masculin.lower().strip()
+    fem = feminin.lower().strip()
+    
+    # Identiques
+    if masc == fem:
+        return True
+    
+    # Retirer le 's' final pour comparer les racines
+    masc_base = masc.rstrip('s')
+    fem_base = fem.rstrip('s')
+    
+    # Vérifier dans les homophones connus
+    for racine in HOMOPHONES_RACINES:
+        if masc_base.endswith(racine) or masc_base == racine:
+            return True
+    
+    # Règle: si le féminin = masculin + "e" ou "es"
+    # et que le masculin finit par une voyelle accentuée, ils sonnent pareil
+    if fem_base.startswith(masc_base):
+        suffixe = fem_base[len(masc_base):]
+        if suffixe in ['e', 'es', '']:
+            # Dernière lettre du masculin (sans 's')
+            if masc_base and masc_base[-1] in 'éèêëiîïuûüoôaàâ':
+                return True
+    
+    # Règle: terminaisons en -eur/-euse, -teur/-trice -> différent
+    if masc.endswith('eur') and fem.endswith('euse'):
+        return False
+    if masc.endswith('teur') and fem.endswith('trice'):
+        return False
+    
+    # Règle: terminaisons en -if/-ive -> différent
+    if masc.endswith('if') and fem.endswith('ive'):
+        return False
+    
+    # Règle: terminaisons en -eux/-euse -> différent
+    if masc.endswith('eux') and fem.endswith('euse'):
+        return False
+    
+    # Par défaut: différent (on dédouble)
+    return False
+
+
+def _generer_forme_parlee(masculin: str, feminin: str) -> str:
+    """
+    Génère la forme parlée d'un mot en écriture inclusive.
+    Retourne soit le masculin seul (si homophone), soit "féminin et masculin".
+    """
+    if _sonnent_pareil(masculin, feminin):
+        return masculin
+    else:
+        # Ordre: féminin d'abord (convention courante à l'oral)
+        return f"{feminin} et {masculin}"
+
+
+def process_inclusive_writing(text: str) -> str:
+    """
+    Convertit l'écriture inclusive en forme parlée pour TTS.
+    
+    Gère les patterns:
+    - client·e·s → "clientes et clients" ou "clients" si homophone
+    - client·es → "clientes et clients"
+    - chacun·e → "chacune et chacun"
+    - celleux → "celles et ceux"
+    - iel/iels → "elle ou il" / "elles ou ils"
+    
+    Nettoie aussi les points médians orphelins.
+    """
+    result = text
+    
+    # 1. Remplacer les néologismes inclusifs courants
+    for pattern, replacement in NEOLOGISMES:
+        result = pattern.sub(replacement, result)
+    
+    # 2. Pattern complet: mot·e·s ou mot·es·s (pluriel avec double suffixe)
+    # Ex: "client·e·s", "citoyen·ne·s", "lecteur·rice·s"
+    def replace_full_pattern(match):
+        base = match.group(1)      # "client"
+        suffix1 = match.group(2)   # "e" ou "ne" ou "rice"
+        suffix2 = match.group(3)   # "s" (optionnel)
+        
+        # Construire masculin et féminin
+        if suffix2:
+            masculin = base + suffix2  # "clients"
+            feminin = base + suffix1 + suffix2  # "clientes"
+        else:
+            masculin = base  # "client"
+            feminin = base + suffix1  # "cliente"
+        
+        return _generer_forme_parlee(masculin, feminin)
+    
+    result = PATTERN_PLURIEL.sub(replace_full_pattern, result)
+    
+    def replace_short_pattern(match):
+        base = match.group(1)
+        suffix = match.group(2)
+        
+        # Détecter si c'est un pluriel court (suffix = "es" ou "s")
+        if suffix.endswith('s'):
+            masculin = base + 's'
+            feminin = base + suffix
+        else:
+            masculin = base
+            feminin = base + suffix
+        
+        return _generer_forme_parlee(masculin, feminin)
+    
+    result = PATTERN_COURT.sub(replace_short_pattern, result)
+    
+    # 3. Nettoyer les points médians orphelins
+    result = result.replace('·', ' ')
+    
+    # 4. Nettoyer les espaces multiples
+    result = ESPACES.sub(' ', result)
+    
+    return result
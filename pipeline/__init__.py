@@ -0,0 +1,12 @@
+from .report import RunReport
+from .workers import RecyclingWorker, WorkerCrashed
+from .golden import GoldenState, adapter_fingerprints, code_fingerprint, compare_with_golden, file_sha1
+from .commit import OutputCommitter, VerificationError
+from .leases import Lease, LeaseManager
+from .failures import FailureCache
+from .loader import read_html, decode_html, decode_file, html_bytes
+from .discovery import InputFile, iter_inputs
+from .backlog import Backlog, BacklogItem, estimate_chars
+from .throughput import ThroughputModel
+from .artifacts import ArtifactCache
+from .archive import ArchiveStore
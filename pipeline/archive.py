@@ -0,0 +1,121 @@
+import gzip
+import hashlib
+import json
+import logging
+import os
+import time
+import uuid
+
+from .discovery import INPUT_EXTENSIONS
+
+logger = logging.getLogger(__name__)
+
+
+class ArchiveStore:
+    """
+    Archive of the processed HTML files, content-addressed: each distinct
+    content is stored once, gzip-compressed, as objects/<sha1[:2]>/<sha1>.html.gz
+    (SingleFile pages are mostly base64 images and text, which compress well).
+    index.jsonl records every archived file, one JSON line appended per file:
+    {"sha1", "name" (original filename), "archived" (date), "mp3" (episode
+    produced from it, or that it duplicates), "size"}. Lookups by name or by
+    content are dict lookups, and archiving a file needs no collision probing.
+    """
+
+    def __init__(self, archive_dir, compresslevel=6):
+        self.archive_dir = archive_dir
+        self.objects_dir = os.path.join(archive_dir, "objects")
+        self.index_path = os.path.join(archive_dir, "index.jsonl")
+        self.compresslevel = compresslevel
+        self.entries = []
+        self.by_name = {}
+        self.by_sha1 = {}
+        self.counts = {"archived": 0, "deduplicated": 0}
+        self._load()
+
+    def object_path(self, sha1):
+        return os.path.join(self.objects_dir, sha1[:2], f"{sha1}.html.gz")
+
+    def add(self, filepath, mp3=""):
+        """
+        Archives filepath and removes it. The file is read once, hashed while
+        it is compressed; a content already archived is not stored again.
+        Returns its index entry.
+        """
+        name = os.path.basename(filepath)
+        os.makedirs(self.objects_dir, exist_ok=True)
+        tmp_path = os.path.join(self.objects_dir, f".{uuid.uuid4().hex}.tmp")
+        h = hashlib.sha1()
+        size = 0
+        try:
+            with open(filepath, "rb") as src, open(tmp_path, "wb") as raw, \
+                    gzip.GzipFile(name, "wb", self.compresslevel, raw, mtime=0) as dst:
+                for block in iter(lambda: src.read(1 << 20), b""):
+                    h.update(block)
+                    dst.write(block)
+                    size += len(block)
+            sha1 = h.hexdigest()
+            path = self.object_path(sha1)
+            if os.path.exists(path):
+                os.remove(tmp_path)
+                self.counts["deduplicated"] += 1
+            else:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        entry = {"sha1": sha1, "name": name, "archived": time.strftime('%Y-%m-%d %H:%M:%S'),
+                 "mp3": mp3 or "", "size": size}
+        self._insert(entry)
+        with open(self.index_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        os.remove(filepath)
+        self.counts["archived"] += 1
+        return entry
+
+    def find(self, name):
+        """Last index entry archived under this filename, None if unknown."""
+        return self.by_name.get(name)
+
+    def contents(self):
+        """One index entry per distinct content, the last one that produced an MP3 if any."""
+        return list(self.by_sha1.values())
+
+    def import_legacy(self):
+        """
+        Moves the HTML files archived by older versions (plain files at the
+        top of archive_dir) into the store, under their archived name.
+        Returns how many were imported.
+        """
+        legacy = []
+        with os.scandir(self.archive_dir) as entries:
+            for entry in entries:
+                if entry.name.lower().endswith(INPUT_EXTENSIONS) and entry.is_file():
+                    legacy.append(entry.path)
+        for path in sorted(legacy):
+            self.add(path)
+        if legacy:
+            logger.info(f"Imported {len(legacy)} legacy archived files into the archive store")
+        return len(legacy)
+
+    def stats(self):
+        return dict(self.counts, contents=len(self.by_sha1), files=len(self.entries))
+
+    def _insert(self, entry):
+        self.entries.append(entry)
+        self.by_name[entry["name"]] = entry
+        if entry["mp3"] or entry["sha1"] not in self.by_sha1:
+            self.by_sha1[entry["sha1"]] = entry
+
+    def _load(self):
+        if not os.path.exists(self.index_path):
+            return
+        with open(self.index_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    self._insert(json.loads(line))
+                except ValueError:
+                    continue  # Truncated line from an interrupted run
@@ -0,0 +1,121 @@
+import gzip
+import hashlib
+import json
+import logging
+import os
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+
+def text_sha1(text):
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+class ArtifactCache:
+    """
+    On-disk cache of the outputs of the extraction stages, so that a file is
+    only processed again from the first stage whose input or code changed
+    (retry after a TTS outage, test run after a normalizer change):
+
+    - "extract": metadata, raw adapter text, extraction tier..., keyed by the
+      SHA-1 of the HTML and the filename (adapters are chosen and read
+      metadata from it: the same content renamed is extracted again) and
+      valid while the code fingerprint of the adapter that produced it is
+      unchanged (extract_fingerprints, by adapter module, see
+      adapter_fingerprints);
+    - "normalize": TTS text, keyed by the SHA-1 of the text to normalize and
+      valid while normalize_fingerprint is unchanged.
+
+    Entries are gzipped JSON files, one per key (cache_dir/<stage>/<key>.json.gz),
+    written atomically: processes share the cache without locking. Entries
+    not used for max_age days are dropped by prune().
+    """
+
+    def __init__(self, cache_dir, extract_fingerprints, normalize_fingerprint, max_age=30 * 86400):
+        self.cache_dir = cache_dir
+        self.extract_fingerprints = extract_fingerprints
+        self.normalize_fingerprint = normalize_fingerprint
+        self.max_age = max_age
+        self.counts = {"extract_hits": 0, "extract_misses": 0, "normalize_hits": 0, "normalize_misses": 0}
+
+    def extraction(self, html_sha1, name):
+        """Cached extraction of the HTML file name, None if missing or produced by other code."""
+        entry = self._read("extract", self._extract_key(html_sha1, name))
+        if entry is None or entry["code"] != self.extract_fingerprints.get(entry["value"].get("adapter")):
+            self.counts["extract_misses"] += 1
+            return None
+        self.counts["extract_hits"] += 1
+        return entry["value"]
+
+    def store_extraction(self, html_sha1, name, extraction):
+        """extraction: dict with at least "adapter" (module of the adapter used)."""
+        code = self.extract_fingerprints.get(extraction["adapter"])
+        if code:
+            self._write("extract", self._extract_key(html_sha1, name), {"code": code, "value": extraction})
+
+    def normalized(self, text):
+        """Cached normalization of text, None if missing or produced by other code."""
+        entry = self._read("normalize", text_sha1(text))
+        if entry is None or entry["code"] != self.normalize_fingerprint:
+            self.counts["normalize_misses"] += 1
+            return None
+        self.counts["normalize_hits"] += 1
+        return entry["value"]
+
+    def store_normalized(self, text, normalized):
+        self._write("normalize", text_sha1(text), {"code": self.normalize_fingerprint, "value": normalized})
+
+    def prune(self):
+        """Removes the entries not used for max_age. Returns how many were removed."""
+        limit = time.time() - self.max_age
+        removed = 0
+        for stage in ("extract", "normalize"):
+            try:
+                entries = os.scandir(os.path.join(self.cache_dir, stage))
+            except FileNotFoundError:
+                continue
+            with entries:
+                for entry in entries:
+                    try:
+                        if entry.stat().st_mtime < limit:
+                            os.remove(entry.path)
+                            removed += 1
+                    except FileNotFoundError:
+                        pass
+        return removed
+
+    def stats(self):
+        return dict(self.counts)
+
+    @staticmethod
+    def _extract_key(html_sha1, name):
+        return text_sha1(f"{name}\0{html_sha1}")
+
+    def _path(self, stage, key):
+        return os.path.join(self.cache_dir, stage, f"{key}.json.gz")
+
+    def _read(self, stage, key):
+        path = self._path(stage, key)
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, EOFError, ValueError) as e:
+            logger.warning(f"Dropping unreadable cache entry {path}: {e}")
+            return None
+        try:
+            os.utime(path)  # Recently used: kept by prune()
+        except OSError:
+            pass
+        return entry
+
+    def _write(self, stage, key, entry):
+        path = self._path(stage, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{uuid.uuid4().hex[:8]}.tmp"
+        with gzip.open(tmp_path, "wt", encoding="utf-8", compresslevel=5) as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
@@ -0,0 +1,211 @@
+import json
+import logging
+import os
+import time
+from html.parser import HTMLParser
+
+from .discovery import iter_inputs
+from .loader import read_html
+
+logger = logging.getLogger(__name__)
+
+
+class TextCounter(HTMLParser):
+    """Counts the characters of the text of a page, outside <head>, scripts and styles."""
+
+    SKIPPED_TAGS = {"head", "script", "style", "noscript", "template", "svg"}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.chars = 0
+        self.skipped = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIPPED_TAGS:
+            self.skipped += 1
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIPPED_TAGS and self.skipped:
+            self.skipped -= 1
+
+    def handle_data(self, data):
+        if not self.skipped:
+            self.chars += len(data.strip())
+
+
+def estimate_chars(filepath):
+    """Cheap estimate of the length of the text to synthesize, without extraction."""
+    counter = TextCounter()
+    counter.feed(read_html(filepath))
+    counter.close()
+    return counter.chars
+
+
+class BacklogItem:
+    """An input file waiting to be processed."""
+
+    def __init__(self, path, name, priority, chars, saved, category=None):
+        self.path = path
+        self.name = name
+        self.priority = priority
+        self.chars = chars
+        self.saved = saved
+        self.category = category
+
+    def __repr__(self):
+        return f"BacklogItem({self.name!r}, priority={self.priority}, chars={self.chars})"
+
+
+class Backlog:
+    """
+    Processing order of the input directory. Files marked as priority (saved
+    in priority_dir, or whose name starts with priority_marker) come first;
+    within each class, shortest job first: the estimated synthesis cost is
+    the character count of the page text, so a two-hour article does not hold
+    back the short pieces saved after it. Aging keeps long jobs from starving:
+    every hour a file has waited since it was saved takes
+    `aging_chars_per_hour` off its cost.
+
+    The directory is walked with iter_inputs (subfolders give their category
+    to their files, `exclude` directories are not entered); the subfolders
+    of priority_dir are categories as well. next() serves the files from the
+    order of the last scan and scans again, so that files saved during a long
+    run are scheduled too, only when the queue is exhausted, after
+    `rescan_every` files or after `rescan_interval` seconds: a run costs a
+    bounded number of scans instead of one per file. Estimates are kept in
+    `state_path` by (size, mtime) and only computed for new or modified
+    files.
+    """
+
+    def __init__(self, input_dir, priority_dir=None, priority_marker="!",
+                 aging_chars_per_hour=20000, state_path=None, exclude=(), recursive=True,
+                 rescan_every=50, rescan_interval=600):
+        self.input_dir = input_dir
+        self.priority_dir = priority_dir
+        self.exclude = list(exclude)
+        self.recursive = recursive
+        self.priority_marker = priority_marker
+        self.aging_chars_per_hour = aging_chars_per_hour
+        self.state_path = state_path
+        self.rescan_every = rescan_every
+        self.rescan_interval = rescan_interval
+        self.estimates = self._load()
+        self.counts = {"estimated": 0, "priority": 0, "reordered": 0, "scans": 0}
+        self.queue = []
+        self.position = 0
+        self.earliest_after = []  # earliest_after[i]: oldest save time among queue[i + 1:]
+        self.scanned_at = None
+        self.served = 0  # Files served since the last scan
+
+    def scan(self, now=None):
+        """Input files waiting, in processing order."""
+        now = time.time() if now is None else now
+        estimated = self.counts["estimated"]
+        items = []
+        seen = set()
+        # The priority folder is walked on its own, its files flagged as priority
+        top_exclude = self.exclude + ([self.priority_dir] if self.priority_dir else [])
+        directories = [(self.input_dir, False, top_exclude)]
+        if self.priority_dir and os.path.isdir(self.priority_dir):
+            directories.append((self.priority_dir, True, self.exclude))
+        for directory, priority, exclude in directories:
+            for found in iter_inputs(directory, exclude, self.recursive):
+                key = os.path.relpath(found.path, self.input_dir)
+                seen.add(key)
+                items.append(BacklogItem(
+                    found.path, found.name,
+                    priority or found.name.startswith(self.priority_marker),
+                    self._chars(key, found.path, found.stat), found.stat.st_mtime, found.category))
+
+        stale = set(self.estimates) - seen
+        for key in stale:
+            del self.estimates[key]
+        if stale or self.counts["estimated"] != estimated:
+            self._save()
+        items.sort(key=lambda item: self._sort_key(item, now))
+        return items
+
+    def refresh(self, now=None):
+        """Scans the directory again and restarts the queue from it. Returns the queue."""
+        now = time.time() if now is None else now
+        self.queue = self.scan(now)
+        self.position = 0
+        self.earliest_after = [float("inf")] * len(self.queue)
+        for i in range(len(self.queue) - 2, -1, -1):
+            self.earliest_after[i] = min(self.earliest_after[i + 1], self.queue[i + 1].saved)
+        self.scanned_at = now
+        self.served = 0
+        self.counts["scans"] += 1
+        return self.queue
+
+    def next(self, done=()):
+        """Next file to process, ignoring the paths in `done`; None when the backlog is empty."""
+        now = time.time()
+        rescanned = False
+        if (self.scanned_at is None or self.served >= self.rescan_every
+                or now - self.scanned_at >= self.rescan_interval):
+            self.refresh(now)
+            rescanned = True
+        item = self._pop(done)
+        if item is None and not rescanned:
+            # Queue exhausted: look for the files saved since the last scan
+            self.refresh(now)
+            item = self._pop(done)
+        if item is None:
+            return None
+        self.served += 1
+        if item.priority:
+            self.counts["priority"] += 1
+        if self.earliest_after[self.position - 1] < item.saved:
+            self.counts["reordered"] += 1  # Overtook a file saved before it
+        return item
+
+    def _pop(self, done):
+        while self.position < len(self.queue):
+            item = self.queue[self.position]
+            self.position += 1
+            if item.path not in done:
+                return item
+        return None
+
+    def stats(self):
+        return dict(self.counts)
+
+    def _sort_key(self, item, now):
+        waited_hours = max(now - item.saved, 0) / 3600
+        cost = item.chars - waited_hours * self.aging_chars_per_hour
+        return (not item.priority, cost, item.saved, item.name)
+
+    def _chars(self, key, path, stat):
+        cached = self.estimates.get(key)
+        if cached and cached["size"] == stat.st_size and cached["mtime_ns"] == stat.st_mtime_ns:
+            return cached["chars"]
+        try:
+            chars = estimate_chars(path)
+        except OSError as e:
+            logger.warning(f"Could not estimate the length of {key}: {e}")
+            chars = stat.st_size
+        self.estimates[key] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "chars": chars}
+        self.counts["estimated"] += 1
+        logger.debug(f"Estimated {key}: {chars} characters")
+        return chars
+
+    def _load(self):
+        if not self.state_path:
+            return {}
+        try:
+            with open(self.state_path, encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read backlog estimates {self.state_path}: {e}")
+            return {}
+
+    def _save(self):
+        if not self.state_path:
+            return
+        tmp_path = f"{self.state_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.estimates, f, ensure_ascii=False)
+        os.replace(tmp_path, self.state_path)
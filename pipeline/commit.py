@@ -0,0 +1,256 @@
+import errno
+import fcntl
+import json
+import logging
+import os
+import shutil
+import socket
+import uuid
+
+from library import scan_mp3
+
+logger = logging.getLogger(__name__)
+
+
+class VerificationError(RuntimeError):
+    """A staged episode is not a playable MP3 (no frame, zero duration)."""
+
+
+class OutputCommitter:
+    """
+    Transactional publication of episodes. The MP3 is synthesized and tagged
+    in a staging directory on local disk, verified, then published into the
+    output directory (synced by Nextcloud) with a single atomic rename, so the
+    sync client only ever sees the finished file. The HTML source is archived
+    afterwards.
+
+    Each commit is described by a journal next to the staged file, rewritten
+    (atomically) at every step: "staged" -> "published" -> "archived". After a
+    crash, recover() completes the commits whose MP3 can still be published
+    and rolls back the others; the source then stays in the input directory
+    and is processed again.
+
+    Processes sharing staging_root each stage into their own subdirectory
+    (<host>-<pid>-<random>), owned through an exclusive flock on
+    <subdirectory>.lock held as long as the committer is open: the kernel
+    drops it when the process dies. recover() only touches the
+    subdirectories of this host whose lock it can take, i.e. whose owner is
+    dead; the files of running processes are never removed.
+    """
+
+    def __init__(self, staging_root, output_dir, archive):
+        """
+        archive(source_path, mp3_name) moves a processed HTML source away and
+        returns its new path.
+        """
+        self.staging_root = staging_root
+        self.output_dir = output_dir
+        self.archive = archive
+        self.host = socket.gethostname()
+        os.makedirs(staging_root, exist_ok=True)
+        owner = f"{self.host}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self.staging_dir = os.path.join(staging_root, owner)
+        self._lock = self._open_lock(self.staging_dir)
+        fcntl.flock(self._lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        json.dump({"host": self.host, "pid": os.getpid()}, self._lock)
+        self._lock.flush()
+        os.makedirs(self.staging_dir)
+
+    def stage_path(self):
+        """New path in the staging directory to synthesize an episode into."""
+        return os.path.join(self.staging_dir, f"{uuid.uuid4().hex}.mp3")
+
+    def verify(self, staged_path):
+        """Scans the frames of a staged MP3. Returns scan_mp3's info, raises VerificationError."""
+        info = scan_mp3(staged_path)
+        if info["frames"] == 0 or info["duration"] <= 0:
+            raise VerificationError(f"no audio in synthesized MP3 ({info['size']} bytes)")
+        return info
+
+    def discard(self, staged_path):
+        """Drops a staged MP3 that will not be committed."""
+        try:
+            os.remove(staged_path)
+        except FileNotFoundError:
+            pass
+
+    def commit(self, staged_path, mp3_name, source, record=None):
+        """
+        Publishes staged_path as output_dir/mp3_name, then archives source.
+        record (JSON-serializable) is kept in the journal for recover().
+        Returns the journal entry, with "mp3_path" and "archive" set; the
+        caller calls finish(entry) once it has indexed the episode.
+        """
+        entry = {
+            "state": "staged",
+            "staged": staged_path,
+            "mp3": mp3_name,
+            "part": os.path.join(self.output_dir, f".{mp3_name}.part"),
+            "source": source,
+            "archive": None,
+            "record": record,
+        }
+        self._write_journal(entry)
+        self._publish(entry)
+        self._archive(entry)
+        return entry
+
+    def finish(self, entry):
+        """Forgets a commit whose episode has been indexed."""
+        try:
+            os.remove(self._journal_path(entry))
+        except FileNotFoundError:
+            pass
+
+    def close(self):
+        """Releases the staging subdirectory (removed when empty)."""
+        if self._lock.closed:
+            return
+        try:
+            os.rmdir(self.staging_dir)
+            os.remove(self._lock.name)
+        except OSError:
+            pass  # Journals left to recover by the next run
+        self._lock.close()
+
+    def recover(self):
+        """
+        Completes or rolls back the commits interrupted by a crash of the
+        processes that staged into staging_root, and removes their staged
+        files without journal (crash during synthesis). The subdirectories
+        of live processes, and of other hosts, are left alone. The journals
+        recovered are moved into this committer's subdirectory. Returns the
+        completed entries: the caller indexes them, then calls finish().
+        """
+        completed = []
+        for name in sorted(os.listdir(self.staging_root)):
+            directory = os.path.join(self.staging_root, name)
+            if directory == self.staging_dir or not os.path.isdir(directory):
+                continue
+            lock = self._claim_dead(directory)
+            if lock is None:
+                continue
+            try:
+                completed.extend(self._recover_directory(directory))
+                shutil.rmtree(directory, ignore_errors=True)
+                os.remove(lock.name)
+            except FileNotFoundError:
+                pass
+            finally:
+                lock.close()
+        return completed
+
+    def _open_lock(self, directory):
+        return open(directory + ".lock", "a+", encoding="utf-8")
+
+    def _claim_dead(self, directory):
+        """Lock of a staging subdirectory whose owner is dead, None if it is alive or elsewhere."""
+        try:
+            lock = self._open_lock(directory)
+        except OSError:
+            return None
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            lock.close()  # Owner still running
+            return None
+        lock.seek(0)
+        try:
+            host = json.load(lock).get("host")
+        except ValueError:
+            host = os.path.basename(directory).rsplit("-", 2)[0]
+        if host != self.host:
+            # Locks are not shared between hosts: the owner may be running there
+            lock.close()
+            return None
+        return lock
+
+    def _recover_directory(self, directory):
+        """Recovers the journals of a dead process; its staged files without journal are left to rmtree."""
+        completed = []
+        for name in sorted(os.listdir(directory)):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(directory, name)
+            try:
+                with open(path, encoding="utf-8") as f:
+                    entry = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Dropping unreadable commit journal {name}: {e}")
+                os.remove(path)
+                continue
+            entry = self._adopt(entry, path)
+
+            if entry["state"] == "staged":
+                if os.path.exists(entry["staged"]):
+                    self._publish(entry)
+                elif os.path.exists(os.path.join(self.output_dir, entry["mp3"])):
+                    # Crashed after the rename, before the journal update
+                    entry["state"] = "published"
+                    self._write_journal(entry)
+                else:
+                    logger.warning(f"Rolling back commit of {entry['mp3']}: staged MP3 lost")
+                    self._remove_part(entry)
+                    self.finish(entry)
+                    continue
+            if entry["state"] == "published":
+                self._archive(entry)
+            logger.info(f"Recovered interrupted commit: {entry['mp3']}")
+            completed.append(entry)
+        orphans = [name for name in os.listdir(directory) if name.endswith(".mp3")]
+        if orphans:
+            logger.info(f"Removing {len(orphans)} orphan staged file(s) of {os.path.basename(directory)}")
+        return completed
+
+    def _adopt(self, entry, journal_path):
+        """Moves the journal (and staged MP3) of a dead process into this committer's subdirectory."""
+        previous = entry["staged"]
+        entry["staged"] = os.path.join(self.staging_dir, os.path.basename(previous))
+        self._write_journal(entry)
+        if os.path.exists(previous):
+            os.replace(previous, entry["staged"])
+        os.remove(journal_path)
+        return entry
+
+    def _journal_path(self, entry):
+        return os.path.splitext(entry["staged"])[0] + ".json"
+
+    def _write_journal(self, entry):
+        path = self._journal_path(entry)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    def _remove_part(self, entry):
+        try:
+            os.remove(entry["part"])
+        except FileNotFoundError:
+            pass
+
+    def _publish(self, entry):
+        mp3_path = os.path.join(self.output_dir, entry["mp3"])
+        try:
+            os.replace(entry["staged"], mp3_path)
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+            # Staging on another filesystem: copy next to the destination under
+            # a hidden .part name (ignored by sync clients), then rename
+            shutil.copyfile(entry["staged"], entry["part"])
+            with open(entry["part"], "rb") as f:
+                os.fsync(f.fileno())
+            os.replace(entry["part"], mp3_path)
+            os.remove(entry["staged"])
+        entry["state"] = "published"
+        entry["mp3_path"] = mp3_path
+        self._write_journal(entry)
+
+    def _archive(self, entry):
+        entry["mp3_path"] = os.path.join(self.output_dir, entry["mp3"])
+        if os.path.exists(entry["source"]):
+            entry["archive"] = self.archive(entry["source"], entry["mp3"])
+        entry["state"] = "archived"
+        self._write_journal(entry)
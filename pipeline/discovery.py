@@ -0,0 +1,68 @@
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+INPUT_EXTENSIONS = (".html", ".htm")
+# Partial downloads and temporary files left by browsers and sync clients
+PARTIAL_EXTENSIONS = (".part", ".tmp", ".crdownload")
+# Resources saved next to a page ("<name>_files"), never inputs themselves
+FILES_DIR_SUFFIX = "_files"
+
+
+class InputFile:
+    """An HTML file found in the input directory; category: its subfolder ("A/B"), None at the top."""
+
+    __slots__ = ("path", "name", "category", "stat")
+
+    def __init__(self, path, name, category, stat):
+        self.path = path
+        self.name = name
+        self.category = category
+        self.stat = stat
+
+    def __repr__(self):
+        return f"InputFile({self.path!r}, category={self.category!r})"
+
+
+def iter_inputs(input_dir, exclude=(), recursive=True):
+    """
+    Yields the HTML files of input_dir as they are found. Directories are
+    read with os.scandir: the file type comes with the entry, and only the
+    candidates are stat()ed, once. With recursive, subfolders are walked too
+    and name the category of their files; the `exclude` directories (archive,
+    quarantine...), "<name>_files" resource folders, hidden entries and
+    symlinked directories are never entered, so their size does not slow the
+    scan down. A missing input_dir raises FileNotFoundError.
+    """
+    excluded = {os.path.normcase(os.path.abspath(path)) for path in exclude}
+    stack = [(input_dir, None)]
+    while stack:
+        directory, category = stack.pop()
+        try:
+            entries = os.scandir(directory)
+        except FileNotFoundError:
+            if directory == input_dir:
+                raise
+            continue  # Subfolder removed meanwhile
+        subfolders = []
+        with entries:
+            for entry in entries:
+                name = entry.name
+                if name.startswith('.'):
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    if (recursive and not name.endswith(FILES_DIR_SUFFIX)
+                            and os.path.normcase(os.path.abspath(entry.path)) not in excluded):
+                        subfolders.append((entry.path, f"{category}/{name}" if category else name))
+                    continue
+                if name.endswith(PARTIAL_EXTENSIONS) or not name.lower().endswith(INPUT_EXTENSIONS):
+                    continue
+                try:
+                    if not entry.is_file():
+                        continue
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue  # Processed by another process meanwhile
+                yield InputFile(entry.path, name, category, stat)
+        stack.extend(reversed(subfolders))
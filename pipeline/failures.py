@@ -0,0 +1,158 @@
+import json
+import logging
+import os
+import shutil
+import time
+
+from .golden import file_sha1
+
+logger = logging.getLogger(__name__)
+
+
+def _timestamp(seconds):
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(seconds))
+
+
+class FailureCache:
+    """
+    Negative cache of the input files that failed (extraction error, content too
+    short...). A failed file is retried with exponential backoff: after
+    `retry_delay` seconds, then twice that, and so on; the failure that
+    reaches `max_attempts` moves it to the quarantine directory with a
+    sidecar (<file>.failure.json) explaining why.
+
+    Until its next retry, a file whose content has not changed is skipped
+    without being parsed: the check is a stat() (size and mtime), the
+    content hash is only computed when the mtime moved. A file whose content
+    changed starts over.
+
+    Files are keyed by their path relative to input_dir (by name when
+    input_dir is None), so that same-named files of two subfolders do not
+    share their attempts.
+    """
+
+    def __init__(self, path, quarantine_dir, max_attempts=4, retry_delay=3600, input_dir=None):
+        self.path = path
+        self.quarantine_dir = quarantine_dir
+        self.input_dir = input_dir
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.counts = {"skipped": 0, "failed": 0, "quarantined": 0}
+        self.entries = self._load()
+
+    def check(self, filepath):
+        """Reason to skip filepath without parsing it, None if it must be processed."""
+        name = self.key(filepath)
+        entry = self.entries.get(name)
+        if entry is None:
+            return None
+        try:
+            stat = os.stat(filepath)
+        except FileNotFoundError:
+            return None
+        if stat.st_mtime_ns != entry["mtime_ns"]:
+            if stat.st_size != entry["size"] or file_sha1(filepath) != entry["sha1"]:
+                logger.info(f"{name} changed since it failed: retrying")
+                self.forget(filepath)
+                return None
+            entry["mtime_ns"] = stat.st_mtime_ns  # Touched, same content
+        if time.time() >= entry["retry_at"]:
+            return None
+        self.counts["skipped"] += 1
+        return (f"failed {entry['attempts']} time(s) ({entry['reason']}), "
+                f"next retry at {_timestamp(entry['retry_at'])}")
+
+    def record(self, filepath, reason):
+        """
+        Records a failure of filepath. Returns the quarantine path when this
+        failure exhausted the attempts (the file has been moved), else None.
+        """
+        name = self.key(filepath)
+        self.entries = self._load()  # Other processes may have recorded failures
+        stat = os.stat(filepath)
+        sha1 = file_sha1(filepath)
+        now = time.time()
+        entry = self.entries.get(name)
+        if entry is None or entry["sha1"] != sha1:
+            entry = {"attempts": 0, "first_failure": now, "reasons": []}
+        entry.update(size=stat.st_size, mtime_ns=stat.st_mtime_ns, sha1=sha1, reason=reason,
+                     attempts=entry["attempts"] + 1, last_failure=now)
+        entry["reasons"] = (entry["reasons"] + [reason])[-self.max_attempts:]
+        entry["retry_at"] = now + self.retry_delay * 2 ** (entry["attempts"] - 1)
+        self.counts["failed"] += 1
+
+        if entry["attempts"] < self.max_attempts:
+            logger.warning(f"{name} failed ({entry['attempts']}/{self.max_attempts}): "
+                           f"next retry at {_timestamp(entry['retry_at'])}")
+            self.entries[name] = entry
+            self._save()
+            return None
+
+        quarantine_path = self._quarantine(filepath, name, entry)
+        self.entries.pop(name, None)
+        self._save()
+        return quarantine_path
+
+    def forget(self, filepath):
+        """Drops the failures of a file (processed successfully, or changed)."""
+        name = self.key(filepath)
+        if name in self.entries:
+            self.entries = self._load()
+            self.entries.pop(name, None)
+            self._save()
+
+    def key(self, filepath):
+        """Key of filepath in the cache: its path relative to input_dir."""
+        if self.input_dir is None:
+            return os.path.basename(filepath)
+        return os.path.relpath(filepath, self.input_dir)
+
+    def stats(self):
+        return dict(self.counts, pending=len(self.entries))
+
+    def _quarantine(self, filepath, key, entry):
+        name = os.path.basename(filepath)
+        os.makedirs(self.quarantine_dir, exist_ok=True)
+        target = os.path.join(self.quarantine_dir, name)
+        base, ext = os.path.splitext(name)
+        counter = 0
+        while os.path.exists(target):
+            counter += 1
+            target = os.path.join(self.quarantine_dir, f"{base}_{counter}{ext}")
+        shutil.move(filepath, target)
+
+        # SingleFile artifacts go along with the page
+        files_dir = os.path.join(os.path.dirname(filepath), base + "_files")
+        if os.path.isdir(files_dir):
+            shutil.move(files_dir, os.path.splitext(target)[0] + "_files")
+
+        with open(target + ".failure.json", "w", encoding="utf-8") as f:
+            json.dump({
+                "file": key,
+                "reason": entry["reason"],
+                "attempts": entry["attempts"],
+                "reasons": entry["reasons"],
+                "first_failure": _timestamp(entry["first_failure"]),
+                "last_failure": _timestamp(entry["last_failure"]),
+                "sha1": entry["sha1"],
+                "size": entry["size"],
+            }, f, ensure_ascii=False, indent=2)
+        self.counts["quarantined"] += 1
+        logger.error(f"{key} failed {entry['attempts']} times ({entry['reason']}): quarantined to {target}")
+        return target
+
+    def _load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read failure cache {self.path}: {e}")
+            return {}
+
+    def _save(self):
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,101 @@
+import difflib
+import hashlib
+import json
+import logging
+import os
+import sys
+
+logger = logging.getLogger(__name__)
+
+
+def file_sha1(path):
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def code_fingerprint(paths, extra_sources=()):
+    """SHA-1 of source files (by name and content) and of extra source strings."""
+    h = hashlib.sha1()
+    for path in sorted(paths):
+        h.update(os.path.basename(path).encode("utf-8"))
+        h.update(file_sha1(path).encode("ascii"))
+    for source in extra_sources:
+        h.update(source.encode("utf-8"))
+    return h.hexdigest()
+
+
+def adapter_fingerprints(adapter_classes, shared_paths, extra_sources=()):
+    """
+    Fingerprint of the code that produced the output of a file, by adapter
+    module: the shared extraction code (base adapter, reader mode,
+    normalization...), the adapter's own module and the modules of every
+    adapter tried before it in the detection order, whose can_handle() could
+    now claim the file. adapter_classes: detection order, fallback last.
+    """
+    adapter_paths = [sys.modules[cls.__module__].__file__ for cls in adapter_classes]
+    adapter_files = set(adapter_paths)
+    shared = [path for path in shared_paths if path not in adapter_files]
+    fingerprints = {}
+    for i, cls in enumerate(adapter_classes):
+        fingerprints[cls.__module__] = code_fingerprint(shared + adapter_paths[:i + 1], extra_sources)
+    return fingerprints
+
+
+def compare_with_golden(output_path, golden_path, context=0):
+    """
+    Compares an output text with its golden text. Returns (status, added,
+    removed, diff) with status "identical", "changed" or "no golden" and diff
+    the unified diff lines.
+    """
+    if not os.path.exists(golden_path):
+        return "no golden", 0, 0, []
+    with open(golden_path, encoding="utf-8") as f:
+        expected = f.read().splitlines()
+    with open(output_path, encoding="utf-8") as f:
+        actual = f.read().splitlines()
+    if expected == actual:
+        return "identical", 0, 0, []
+    diff = list(difflib.unified_diff(expected, actual, "golden", "output", n=context, lineterm=""))
+    added = sum(1 for line in diff if line.startswith("+") and not line.startswith("+++"))
+    removed = sum(1 for line in diff if line.startswith("-") and not line.startswith("---"))
+    return "changed", added, removed, diff
+
+
+class GoldenState:
+    """
+    Fingerprints of the last test run, by HTML file: {"html", "code",
+    "adapter", "txt", "seconds"}. A file whose HTML and code fingerprints are
+    unchanged, and whose output is still there, is not extracted again.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.files = {}
+        try:
+            with open(path, encoding="utf-8") as f:
+                self.files = json.load(f)
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable test state {path}: {e}")
+
+    def is_fresh(self, filename, html_hash, fingerprints, output_dir):
+        entry = self.files.get(filename)
+        if not entry or entry.get("html") != html_hash:
+            return False
+        if fingerprints.get(entry.get("adapter")) != entry.get("code"):
+            return False
+        return bool(entry.get("txt")) and os.path.exists(os.path.join(output_dir, entry["txt"]))
+
+    def record(self, filename, html_hash, code, adapter, txt, seconds):
+        self.files[filename] = {"html": html_hash, "code": code, "adapter": adapter,
+                                "txt": txt, "seconds": seconds}
+
+    def save(self):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.files, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,155 @@
+import asyncio
+import json
+import logging
+import os
+import socket
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+
+class Lease:
+    """Claim on one input file, held by a LeaseManager."""
+
+    def __init__(self, name, path, acquired):
+        self.name = name
+        self.path = path
+        self.acquired = acquired
+        self.lost = False
+
+
+class LeaseManager:
+    """
+    Cooperative claiming of the files of a shared input directory, between
+    processes of one host or hosts syncing the same folder. A file is claimed
+    by creating its lease file with O_CREAT | O_EXCL: only one creator wins.
+    The lease records its owner and when it was last renewed; the owner
+    renews it (heartbeat) while it processes the file, and a lease not
+    renewed for `ttl` seconds is stale: its owner is assumed dead and any
+    process may reclaim it.
+
+    Reclaiming renames the stale lease to a name unique to the reclaimer, so
+    that only one of several reclaimers gets it; if the lease renamed away
+    turns out to be fresh (renewed or recreated meanwhile), it is linked back.
+
+    Between hosts, exclusivity is only as good as the sync of lease_dir:
+    ttl must be well above the sync delay.
+    """
+
+    def __init__(self, lease_dir, ttl=600, heartbeat=60, owner=None):
+        self.lease_dir = lease_dir
+        self.ttl = ttl
+        self.heartbeat = heartbeat
+        self.owner = owner or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.counts = {"claimed": 0, "busy": 0, "reclaimed": 0, "lost": 0}
+        os.makedirs(lease_dir, exist_ok=True)
+
+    def claim(self, name):
+        """
+        Claims input file `name` (its path relative to the input directory).
+        Returns a Lease, or None if another live owner holds it.
+        """
+        path = os.path.join(self.lease_dir, self._file_name(name) + ".lease")
+        for _ in range(2):
+            now = time.time()
+            try:
+                fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+            except FileExistsError:
+                if self._reclaim(path):
+                    continue
+                self.counts["busy"] += 1
+                return None
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(self._record(name, now, now), f)
+            self.counts["claimed"] += 1
+            return Lease(name, path, now)
+        self.counts["busy"] += 1
+        return None
+
+    def renew(self, lease):
+        """Heartbeat: pushes back the expiry of a lease. Returns False (and marks it lost) if it was taken over."""
+        if lease.lost:
+            return False
+        record = self._read(lease.path)
+        if record is None or record.get("owner") != self.owner:
+            logger.warning(f"Lease on {lease.name} was taken over by {record.get('owner') if record else 'nobody'}")
+            lease.lost = True
+            self.counts["lost"] += 1
+            return False
+        tmp_path = f"{lease.path}.{uuid.uuid4().hex[:8]}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._record(lease.name, lease.acquired, time.time()), f)
+        os.replace(tmp_path, lease.path)
+        return True
+
+    async def keep_alive(self, lease):
+        """Renews lease every `heartbeat` seconds until cancelled or lost."""
+        while True:
+            await asyncio.sleep(self.heartbeat)
+            if not self.renew(lease):
+                return
+
+    def release(self, lease):
+        """Drops a lease, unless another owner has taken it over."""
+        record = self._read(lease.path)
+        if record is not None and record.get("owner") == self.owner:
+            try:
+                os.remove(lease.path)
+            except FileNotFoundError:
+                pass
+
+    def stats(self):
+        return dict(self.counts, owner=self.owner)
+
+    @staticmethod
+    def _file_name(name):
+        """Lease file name of a relative path: "A/b.html" -> "A%2Fb.html"."""
+        return name.replace("%", "%25").replace(os.sep, "%2F").replace("/", "%2F")
+
+    def _record(self, name, acquired, renewed):
+        return {"owner": self.owner, "file": name, "host": socket.gethostname(), "pid": os.getpid(),
+                "acquired": acquired, "renewed": renewed, "ttl": self.ttl}
+
+    def _read(self, path):
+        try:
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _is_stale(self, path):
+        """A lease is stale when not renewed for ttl seconds (mtime for a lease still being written)."""
+        record = self._read(path)
+        try:
+            renewed = record["renewed"] if record else os.path.getmtime(path)
+            ttl = record.get("ttl", self.ttl) if record else self.ttl
+        except FileNotFoundError:
+            return True  # Released meanwhile: free to claim
+        except (OSError, KeyError, TypeError):
+            return False
+        return time.time() - renewed > ttl
+
+    def _reclaim(self, path):
+        """Moves a stale lease away. Returns True if the lease file is gone."""
+        if not self._is_stale(path):
+            return False
+        stale_path = f"{path}.stale-{uuid.uuid4().hex[:8]}"
+        try:
+            os.rename(path, stale_path)
+        except FileNotFoundError:
+            return True  # Released or reclaimed by someone else meanwhile
+        if not self._is_stale(stale_path):
+            # Renewed or recreated between the check and the rename: put it back
+            try:
+                os.link(stale_path, path)
+            except FileExistsError:
+                pass
+            os.remove(stale_path)
+            return False
+        record = self._read(stale_path) or {}
+        logger.warning(f"Reclaiming stale lease of {record.get('file', os.path.basename(path))} "
+                       f"held by {record.get('owner', 'unknown')}")
+        os.remove(stale_path)
+        self.counts["reclaimed"] += 1
+        return True
@@ -0,0 +1,157 @@
+import codecs
+import contextlib
+import gzip
+import logging
+import mmap
+import os
+import re
+
+try:
+    from charset_normalizer import from_bytes
+except ImportError:  # Optional: undeclared non-UTF-8 files are then read as Windows-1252
+    from_bytes = None
+
+logger = logging.getLogger(__name__)
+
+# The <meta charset> declaration is looked for in the first bytes only
+SNIFF_BYTES = 8192
+# Sample given to the statistical detection
+DETECT_BYTES = 256 * 1024
+# Extra "chaos" (mess ratio) tolerated to prefer Windows-1252 over the best guess
+DETECT_CHAOS_MARGIN = 0.1
+# Files at least this large are mapped instead of read into a bytes copy
+MMAP_MIN_BYTES = 1 << 20
+
+# UTF-32 first: its little-endian BOM starts with the UTF-16 one
+BOMS = (
+    (codecs.BOM_UTF8, "utf-8"),
+    (codecs.BOM_UTF32_LE, "utf-32-le"),
+    (codecs.BOM_UTF32_BE, "utf-32-be"),
+    (codecs.BOM_UTF16_LE, "utf-16-le"),
+    (codecs.BOM_UTF16_BE, "utf-16-be"),
+)
+
+# <meta charset="..."> and <meta http-equiv="Content-Type" content="...; charset=...">
+META_CHARSET_RE = re.compile(rb'<meta[^>]*?charset\s*=\s*["\']?\s*([\w.:-]+)', re.IGNORECASE)
+
+# As browsers do, Latin-1 and ASCII declarations are read as Windows-1252: the
+# Word/Europresse exports that declare them use its curly quotes, dashes and œ
+WINDOWS_1252_ALIASES = {"iso8859-1", "ascii"}
+
+
+def _c1_fallback(error):
+    """Decodes the 5 bytes Windows-1252 leaves undefined to the C1 controls, as browsers do."""
+    return chr(error.object[error.start]), error.start + 1
+
+
+codecs.register_error("c1fallback", _c1_fallback)
+
+
+def normalize_encoding(label):
+    """Python codec name of an encoding label, None if unknown."""
+    try:
+        name = codecs.lookup(label.decode("ascii") if isinstance(label, bytes) else label).name
+    except (LookupError, UnicodeDecodeError):
+        return None
+    if name in WINDOWS_1252_ALIASES:
+        return "cp1252"
+    return name
+
+
+def sniff_encoding(head):
+    """
+    Encoding declared at the start of a document: (encoding, bom_length,
+    source), source being "bom" or "meta"; (None, 0, None) if undeclared.
+    """
+    for bom, encoding in BOMS:
+        if head.startswith(bom):
+            return encoding, len(bom), "bom"
+    match = META_CHARSET_RE.search(head)
+    if match:
+        encoding = normalize_encoding(match.group(1))
+        # A page saved as UTF-16 cannot declare it in ASCII bytes: stale declaration
+        if encoding and not encoding.startswith(("utf-16", "utf-32")):
+            return encoding, 0, "meta"
+    return None, 0, None
+
+
+def detect_encoding(data):
+    """
+    Statistical guess of the encoding of undeclared, non-UTF-8 bytes.
+    Windows-1252 is kept whenever it reads the sample about as cleanly as the
+    best candidate: on short French texts, the detector ranks Central European
+    code pages first for the same bytes.
+    """
+    if from_bytes is None:
+        return "cp1252"
+    matches = from_bytes(bytes(data[:DETECT_BYTES]))
+    best = matches.best()
+    if best is None:
+        return "cp1252"
+    for match in matches:
+        if normalize_encoding(match.encoding) == "cp1252" and match.chaos <= best.chaos + DETECT_CHAOS_MARGIN:
+            return "cp1252"
+    return normalize_encoding(best.encoding) or "cp1252"
+
+
+def decode_html(data):
+    """
+    Decodes an HTML document (bytes or any buffer) in one pass. Returns
+    (text, encoding, source), source telling how the encoding was found:
+    "bom", "meta", "utf-8" (undeclared but valid UTF-8) or "detected".
+    """
+    with memoryview(data) as view:
+        encoding, bom_length, source = sniff_encoding(bytes(view[:SNIFF_BYTES]))
+        body = view[bom_length:]
+        try:
+            if source == "bom":
+                return str(body, encoding, "replace"), encoding, source
+            if encoding and encoding != "utf-8":
+                return str(body, encoding, "c1fallback" if encoding == "cp1252" else "replace"), encoding, source
+            # Declared UTF-8 or undeclared: strict UTF-8 first, the common case
+            try:
+                return str(body, "utf-8"), "utf-8", source or "utf-8"
+            except UnicodeDecodeError:
+                if source:
+                    logger.debug("Document declared as UTF-8 is not: detecting its encoding")
+            encoding = detect_encoding(body)
+            errors = "c1fallback" if encoding == "cp1252" else "replace"
+            return str(body, encoding, errors), encoding, "detected"
+        finally:
+            body.release()
+
+
+@contextlib.contextmanager
+def html_bytes(filepath):
+    """
+    Raw bytes of an HTML export, read once: mapped when large, decompressed
+    when gzipped (archived copies). The buffer is only valid inside the block.
+    """
+    if filepath.endswith(".gz"):
+        with gzip.open(filepath, "rb") as f:
+            yield f.read()
+        return
+    with open(filepath, "rb") as f:
+        if os.fstat(f.fileno()).st_size >= MMAP_MIN_BYTES:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                yield mapped
+        else:
+            yield f.read()
+
+
+def decode_file(filepath, data):
+    """Text of the bytes read from filepath (see decode_html), logging unusual encodings."""
+    text, encoding, source = decode_html(data)
+    if source == "detected" or encoding != "utf-8":
+        logger.info(f"Decoding {os.path.basename(filepath)} as {encoding} ({source})")
+    return text
+
+
+def read_html(filepath):
+    """
+    Reads an HTML export as text: read once as bytes (mapped when large),
+    encoding from the BOM or <meta charset>, else UTF-8, else detected.
+    Gzipped files (archived copies) are decompressed as they are read.
+    """
+    with html_bytes(filepath) as data:
+        return decode_file(filepath, data)
@@ -0,0 +1,61 @@
+import json
+import logging
+import os
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class RunReport:
+    """
+    Collects what happened during a run: one entry per article plus named
+    sections of counters (TTS scheduler state, ...). Logged at the end of the
+    run and saved as JSON so the last run can be inspected afterwards.
+    """
+
+    def __init__(self):
+        self.started = time.time()
+        self.articles = []
+        self.sections = {}
+
+    def record_article(self, filename, status, **details):
+        """status: "done", "skipped", "deferred" or "failed"."""
+        entry = {"file": filename, "status": status}
+        entry.update(details)
+        self.articles.append(entry)
+
+    def add_section(self, name, values):
+        self.sections[name] = values
+
+    def summary(self):
+        counts = {}
+        for entry in self.articles:
+            counts[entry["status"]] = counts.get(entry["status"], 0) + 1
+        return {
+            "started": time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(self.started)),
+            "duration_s": round(time.time() - self.started, 1),
+            "articles": counts,
+        }
+
+    def log(self):
+        if not self.articles:
+            return
+        summary = self.summary()
+        logger.info("=" * 80)
+        logger.info(f"Rapport d'exécution ({summary['duration_s']}s): " +
+                    ", ".join(f"{status}={count}" for status, count in summary["articles"].items()))
+        for entry in self.articles:
+            details = ", ".join(f"{k}={v}" for k, v in entry.items() if k not in ("file", "status"))
+            logger.info(f"  [{entry['status']}] {entry['file']}" + (f" ({details})" if details else ""))
+        for name, values in self.sections.items():
+            logger.info(f"  {name}: " + ", ".join(f"{k}={v}" for k, v in values.items()))
+        logger.info("=" * 80)
+
+    def save(self, path):
+        report = self.summary()
+        report["entries"] = self.articles
+        report.update(self.sections)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
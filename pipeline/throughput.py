@@ -0,0 +1,83 @@
+import json
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+# Used until an engine has synthesized an article on this machine
+DEFAULT_CHARS_PER_SECOND = {"edge": 250.0, "local": 120.0}
+# French read at the default rate: about 14 characters per second of audio
+DEFAULT_AUDIO_SECONDS_PER_CHAR = 1 / 14
+
+
+class ThroughputModel:
+    """
+    Synthesis speed of each TTS engine, learned from the articles of previous
+    runs: characters synthesized per second of wall time at a given
+    concurrency, and seconds of audio per character. Both are ratios of
+    decayed sums (each new article weighs by its length; older ones fade by
+    `decay` per article), persisted in `path`.
+
+    Estimates at another concurrency scale the speed linearly, which is only
+    an approximation: edge-tts is also bound by its character budgets.
+    """
+
+    def __init__(self, path, decay=0.9):
+        self.path = path
+        self.decay = decay
+        self.engines = self._load()
+
+    def record(self, engine, chars, seconds, audio_seconds, concurrency):
+        """Learns from one synthesized article."""
+        if chars <= 0 or seconds <= 0:
+            return
+        model = self.engines.get(engine) or {"chars": 0.0, "seconds": 0.0, "audio_seconds": 0.0, "samples": 0}
+        model["chars"] = model["chars"] * self.decay + chars
+        model["seconds"] = model["seconds"] * self.decay + seconds
+        model["audio_seconds"] = model["audio_seconds"] * self.decay + audio_seconds
+        model["samples"] += 1
+        model["concurrency"] = concurrency
+        self.engines[engine] = model
+        self._save()
+
+    def chars_per_second(self, engine, concurrency, max_rate=None):
+        """
+        Synthesis speed of engine at concurrency, and whether it was learned
+        ("learned"/"default"). max_rate caps it (e.g. the edge-tts character
+        budget per minute, which no concurrency can exceed).
+        """
+        model = self.engines.get(engine)
+        if not model:
+            rate, source = DEFAULT_CHARS_PER_SECOND.get(engine, min(DEFAULT_CHARS_PER_SECOND.values())), "default"
+        else:
+            rate, source = model["chars"] / model["seconds"] * concurrency / max(model["concurrency"], 1), "learned"
+        if max_rate is not None:
+            rate = min(rate, max_rate)
+        return rate, source
+
+    def audio_seconds_per_char(self, engine):
+        model = self.engines.get(engine)
+        if not model or not model["audio_seconds"]:
+            return DEFAULT_AUDIO_SECONDS_PER_CHAR
+        return model["audio_seconds"] / model["chars"]
+
+    def estimate(self, engine, chars, concurrency, max_rate=None):
+        """(audio seconds, wall seconds) to synthesize `chars` characters."""
+        rate, _ = self.chars_per_second(engine, concurrency, max_rate)
+        return chars * self.audio_seconds_per_char(engine), chars / rate
+
+    def _load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read throughput model {self.path}: {e}")
+            return {}
+
+    def _save(self):
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.engines, f, indent=2)
+        os.replace(tmp_path, self.path)
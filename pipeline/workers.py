@@ -0,0 +1,170 @@
+import gc
+import logging
+import multiprocessing
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class WorkerCrashed(RuntimeError):
+    """The worker process died while running a job (e.g. killed by the OOM killer)."""
+
+
+def _read_status_kb(field):
+    """Value of a /proc/self/status field (VmRSS, VmHWM...) in KB, None if unavailable."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def _reset_peak_rss():
+    """Resets VmHWM so that it measures the peak of the next job only (Linux >= 4.0)."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+
+def _worker_main(conn, function, initializer, initargs, max_rss_kb, max_jobs):
+    """
+    Job loop of the worker process: runs function(*args) for each job received
+    and answers (result, error, usage, recycle). After the answer that sets
+    recycle, the process exits: the parent starts a fresh one for the next job.
+    """
+    if initializer is not None:
+        initializer(*initargs)
+    jobs = 0
+    while True:
+        try:
+            args = conn.recv()
+        except EOFError:
+            break
+        if args is None:
+            break
+
+        _reset_peak_rss()
+        start = time.perf_counter()
+        result = error = None
+        try:
+            result = function(*args)
+        except Exception as e:
+            error = e
+        seconds = time.perf_counter() - start
+        peak_kb = _read_status_kb("VmHWM")
+        gc.collect()
+        rss_kb = _read_status_kb("VmRSS")
+        jobs += 1
+
+        recycle = bool((max_rss_kb and rss_kb and rss_kb > max_rss_kb) or (max_jobs and jobs >= max_jobs))
+        usage = {
+            "seconds": round(seconds, 3),
+            "rss_mb": round(rss_kb / 1024, 1) if rss_kb else None,
+            "peak_rss_mb": round(peak_kb / 1024, 1) if peak_kb else None,
+            "jobs": jobs,
+        }
+        try:
+            conn.send((result, error, usage, recycle))
+        except Exception as e:  # Unpicklable result or exception
+            conn.send((None, RuntimeError(f"{type(e).__name__}: {e}"), usage, recycle))
+        if recycle:
+            break
+    conn.close()
+
+
+class RecyclingWorker:
+    """
+    Worker process running jobs one at a time, replaced between two jobs once
+    its resident memory exceeds max_rss_mb or it has run max_jobs jobs.
+
+    Parse trees of large pages fragment the heap of a long-lived process: its
+    RSS keeps growing even after the trees are freed. Running each article in
+    a worker that is recycled under a memory budget keeps the memory of an
+    arbitrarily long run bounded. The worker is started with "spawn", so a
+    fresh worker starts from a clean heap instead of a copy of the parent's.
+    """
+
+    def __init__(self, function, max_rss_mb=512, max_jobs=50, initializer=None, initargs=()):
+        self.function = function
+        self.max_rss_kb = max_rss_mb * 1024 if max_rss_mb else None
+        self.max_jobs = max_jobs
+        self.initializer = initializer
+        self.initargs = initargs
+        self._context = multiprocessing.get_context("spawn")
+        self._process = None
+        self._conn = None
+        self.started = 0
+        self.recycled = 0
+        self.crashed = 0
+        self.max_peak_rss_mb = 0.0
+
+    def _start(self):
+        parent_conn, child_conn = self._context.Pipe()
+        self._process = self._context.Process(
+            target=_worker_main,
+            args=(child_conn, self.function, self.initializer, self.initargs, self.max_rss_kb, self.max_jobs),
+            daemon=True,
+        )
+        self._process.start()
+        child_conn.close()
+        self._conn = parent_conn
+        self.started += 1
+
+    def _stop(self, timeout=5):
+        if self._process is None:
+            return
+        self._conn.close()
+        self._process.join(timeout)
+        if self._process.is_alive():
+            self._process.kill()
+            self._process.join()
+        self._process = None
+        self._conn = None
+
+    def run(self, *args):
+        """
+        Runs function(*args) in the worker and returns (result, usage), usage
+        being {"seconds", "rss_mb", "peak_rss_mb", "jobs"}. Exceptions raised
+        by the function are raised again here; WorkerCrashed if the worker died.
+        """
+        if self._process is None:
+            self._start()
+        try:
+            self._conn.send(args)
+            result, error, usage, recycle = self._conn.recv()
+        except (EOFError, OSError) as e:
+            exitcode = self._process.exitcode if self._process else None
+            self._stop()
+            self.crashed += 1
+            raise WorkerCrashed(f"worker process died (exit code {exitcode})") from e
+
+        if usage["peak_rss_mb"]:
+            self.max_peak_rss_mb = max(self.max_peak_rss_mb, usage["peak_rss_mb"])
+        if recycle:
+            logger.info(f"Recycling worker after {usage['jobs']} job(s), RSS {usage['rss_mb']} MB")
+            self._stop()
+            self.recycled += 1
+        if error is not None:
+            raise error
+        return result, usage
+
+    def close(self):
+        if self._process is not None:
+            try:
+                self._conn.send(None)
+            except OSError:
+                pass
+            self._stop()
+
+    def stats(self):
+        return {
+            "started": self.started,
+            "recycled": self.recycled,
+            "crashed": self.crashed,
+            "max_peak_rss_mb": self.max_peak_rss_mb,
+        }
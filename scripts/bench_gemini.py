@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark of GeminiAdapter.get_content() on synthetic conversation exports of
+growing size (headings, paragraphs with inline markup, lists whose items hold
+paragraphs, quotes, tables, stray inline runs). Reports the extraction time
+per paragraph: with a linear extraction it stays flat as the export grows.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+# Ensure project root is in path
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from bs4 import BeautifulSoup
+
+from adapters import GeminiAdapter
+
+WORDS = ("le la les un une des recherche modèle analyse données résultat méthode "
+         "source contexte question réponse exemple hypothèse").split()
+
+
+def sentence(rng, count=18):
+    return " ".join(rng.choice(WORDS) for _ in range(count)).capitalize() + "."
+
+
+def synthetic_export(paragraphs, seed=0):
+    """A Gemini export holding about `paragraphs` paragraphs."""
+    rng = random.Random(seed)
+    parts = ['<h1>Rapport de recherche</h1>']
+    count = 0
+    while count < paragraphs:
+        kind = rng.random()
+        if kind < 0.1:
+            parts.append(f'<h2>{sentence(rng, 5)}</h2>')
+        elif kind < 0.6:
+            parts.append(f'<p>{sentence(rng)} <strong>{sentence(rng, 4)}</strong> '
+                         f'<a href="#">{sentence(rng, 3)}</a></p>')
+            count += 1
+        elif kind < 0.75:
+            items = "".join(f'<li><p>{sentence(rng)}</p></li>' for _ in range(3))
+            parts.append(f'<ul>{items}</ul>')
+            count += 3
+        elif kind < 0.85:
+            parts.append(f'<blockquote><p>{sentence(rng)}</p><p>{sentence(rng)}</p></blockquote>')
+            count += 2
+        elif kind < 0.92:
+            parts.append(f'<div><p>{sentence(rng)}<p>{sentence(rng)}</p></p></div>')
+            count += 2
+        elif kind < 0.96:
+            parts.append(f'<table><tr><td>{sentence(rng, 4)}</td><td>{sentence(rng, 4)}</td></tr></table>')
+        else:
+            parts.append(f'{sentence(rng)} <em>{sentence(rng, 4)}</em><br>')
+            count += 1
+    return (f'<html><head><title>Gemini</title></head><body>'
+            f'<div class="markdown">{"".join(parts)}</div></body></html>')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark of the Gemini adapter on long exports")
+    parser.add_argument('--paragraphs', type=int, default=5000,
+                        help="Taille du plus grand export, en paragraphes (défaut: %(default)s)")
+    parser.add_argument('--steps', type=int, default=4,
+                        help="Nombre de tailles testées, divisées par deux à chaque fois (défaut: %(default)s)")
+    args = parser.parse_args()
+
+    sizes = sorted(max(args.paragraphs >> step, 1) for step in range(args.steps))
+    print(f"{'Paragraphs':>10} {'HTML':>9} {'Extract':>9} {'Per par.':>10} {'Chars':>9}")
+    print("-" * 52)
+    for size in sizes:
+        html = synthetic_export(size)
+        adapter = GeminiAdapter(BeautifulSoup(html, "html.parser"), "Gemini_export.html")
+        start = time.perf_counter()
+        content = adapter.get_content()
+        seconds = time.perf_counter() - start
+        assert adapter.get_content() == content, "get_content() is not repeatable"
+        print(f"{size:>10} {len(html) // 1024:>7}KB {seconds:>8.2f}s "
+              f"{seconds / size * 1e6:>8.0f}µs {len(content):>9}")
+
+
+if __name__ == "__main__":
+    main()
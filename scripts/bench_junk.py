@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the junk removal pass: for each HTML file, runs the adapter's
+get_content() with its compiled JunkFilter (one walk, hidden elements
+pruned) and with the former lookup (one traversal per tag list and per
+selector), and reports the elements left out and the time saved per page.
+"""
+import argparse
+import os
+import sys
+import time
+
+# Ensure project root is in path
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from bs4 import BeautifulSoup
+
+from adapters import get_adapter
+
+ARTICLE_DIR = os.path.join(ROOT_DIR, "Article-Test")
+
+
+class SequentialJunkFilter:
+    """The former lookup: one find_all for the tags, then one select() per selector."""
+
+    def __init__(self, junk_filter):
+        self.tags = list(junk_filter.tags)
+        self.selectors = junk_filter.selectors
+
+    def find(self, container):
+        start = time.perf_counter()
+        junk = container(self.tags)
+        for selector in self.selectors:
+            junk.extend(container.select(selector))
+        return junk, {"removed": len(junk), "hidden": 0, "nodes": None,
+                      "seconds": time.perf_counter() - start}
+
+
+def run(html, filename, sequential):
+    adapter = get_adapter(BeautifulSoup(html, "html.parser"), filename)
+    if adapter.junk_filter is None:
+        return type(adapter).__name__, None
+    if sequential:
+        adapter.junk_filter = SequentialJunkFilter(adapter.junk_filter)
+    adapter.get_content()
+    return type(adapter).__name__, adapter.junk_stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark of the junk removal pass")
+    parser.add_argument('directory', nargs='?', default=ARTICLE_DIR,
+                        help="Dossier des articles HTML (défaut: Article-Test/)")
+    args = parser.parse_args()
+
+    html_files = sorted(f for f in os.listdir(args.directory) if f.endswith(('.html', '.htm')))
+    print(f"{'File':<42} {'Adapter':<20} {'Removed':>8} {'Hidden':>7} {'Nodes':>7} "
+          f"{'Before':>9} {'After':>9} {'Saved':>9}")
+    print("-" * 118)
+    total_before = total_after = 0.0
+    for html_file in html_files:
+        with open(os.path.join(args.directory, html_file), encoding='utf-8', errors='replace') as f:
+            html = f.read()
+        adapter_name, after = run(html, html_file, sequential=False)
+        if after is None:
+            continue  # Adapter without junk pass, or reader mode answered
+        _, before = run(html, html_file, sequential=True)
+        total_before += before["seconds"]
+        total_after += after["seconds"]
+        name = html_file[:39] + "..." if len(html_file) > 42 else html_file
+        print(f"{name:<42} {adapter_name:<20} {after['removed']:>8} {after['hidden']:>7} {after['nodes']:>7} "
+              f"{before['seconds'] * 1000:>7.1f}ms {after['seconds'] * 1000:>7.1f}ms "
+              f"{(before['seconds'] - after['seconds']) * 1000:>7.1f}ms")
+    print(f"\nTotal: {total_before:.2f}s -> {total_after:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
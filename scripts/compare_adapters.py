@@ -2,159 +2,211 @@
 """
 Compare adapter output vs reader_mode output for each test article.
 Generates _ADAPTER_<name>.txt and _READER.txt for each HTML file,
-then reports differences.
+then reports differences as a table (similarity, length delta, time per
+extractor), sortable by any column.
+
+Files are processed in parallel. Texts are compared word by word on hashed
+tokens: the length and multiset bounds of SequenceMatcher (real_quick_ratio,
+quick_ratio) are checked first, and the exact ratio is only computed when
+the bound could reach the CHECK threshold.
 """
+import argparse
+import csv
 import os
-import sys
 import re
-from bs4 import BeautifulSoup
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
 from difflib import SequenceMatcher
 
 # Ensure project root is in path
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from adapters import parse_article
+from adapters.reader_mode import reader_extract_content
+from pipeline import read_html
+
+ARTICLE_DIR = os.path.join(ROOT_DIR, "Article-Test")
+
+# Verdict thresholds on the word-level similarity
+REMOVE_RATIO = 0.95
+CHECK_RATIO = 0.85
+
+WORD = re.compile(r'\w+')
+
+SORT_KEYS = {
+    "similarity": lambda r: r['ratio'],
+    "delta": lambda r: abs(r['delta_pct']),
+    "adapter_time": lambda r: r['adapter_s'],
+    "reader_time": lambda r: r['reader_s'],
+    "adapter": lambda r: (r['adapter'], r['file']),
+    "file": lambda r: r['file'],
+}
+
 
-from adapters import get_adapter
-from adapters.reader_mode import reader_extract_content, reader_extract_metadata
+def tokenize(text):
+    """Lowercased words as hashed tokens: comparing ints is cheaper than strings."""
+    return [hash(word) for word in WORD.findall(text.lower())]
 
-ARTICLE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Article-Test")
 
-def load_html(filepath):
-    with open(filepath, 'r', encoding='utf-8', errors='replace') as f:
-        return f.read()
+def compare_texts(adapter_text, reader_text, min_ratio=CHECK_RATIO):
+    """
+    Word-level similarity of two texts. Returns (ratio, exact): when the
+    quick upper bounds are already below min_ratio, the bound is returned
+    with exact=False instead of running the full comparison. autojunk is
+    off: in articles of 200+ words, frequent words ("de", "la"...) would
+    otherwise be ignored as junk and skew the ratio.
+    """
+    matcher = SequenceMatcher(None, tokenize(adapter_text), tokenize(reader_text), autojunk=False)
+    bound = matcher.real_quick_ratio()
+    if bound < min_ratio:
+        return bound, False
+    bound = matcher.quick_ratio()
+    if bound < min_ratio:
+        return bound, False
+    return matcher.ratio(), True
 
-def get_adapter_content(soup, filename):
-    """Get content using the standard adapter pipeline."""
-    adapter = get_adapter(soup, filename)
+
+def sample_differences(adapter_text, reader_text, count=3):
+    """Sentences only found in one of the two texts: (only_in_adapter, only_in_reader)."""
+    adapter_sentences = set(s.strip() for s in re.split(r'[.!?]+', adapter_text) if len(s.strip()) > 20)
+    reader_sentences = set(s.strip() for s in re.split(r'[.!?]+', reader_text) if len(s.strip()) > 20)
+    return (sorted(adapter_sentences - reader_sentences)[:count],
+            sorted(reader_sentences - adapter_sentences)[:count])
+
+
+def compare_file(filepath):
+    """Runs both extractors on one file and writes their outputs. Returns a result row, None for GenericAdapter."""
+    html_file = os.path.basename(filepath)
+    html_string = read_html(filepath)  # Same decoding as the pipeline (BOM, <meta charset>, detection)
+
+    # Get adapter output (standard pipeline)
+    start = time.perf_counter()
+    adapter = parse_article(html_string, html_file)
+    adapter_content = adapter.get_content()
+    adapter_s = time.perf_counter() - start
     adapter_name = adapter.__class__.__name__
-    content = adapter.get_content()
-    return adapter_name, content
-
-def get_reader_content(html_string):
-    """Get content using reader_mode directly."""
-    return reader_extract_content(html_string)
-
-def compare_texts(adapter_text, reader_text):
-    """Compare two texts and return similarity ratio and diff summary."""
-    # Similarity ratio
-    ratio = SequenceMatcher(None, adapter_text, reader_text).ratio()
-    
-    # Word-level diff for readability
-    adapter_words = adapter_text.split()
-    reader_words = reader_text.split()
-    
-    diff_lines = []
-    
-    # Count additions and removals
-    added = sum(1 for l in diff_lines if l.startswith('+') and not l.startswith('+++'))
-    removed = sum(1 for l in diff_lines if l.startswith('-') and not l.startswith('---'))
-    
-    return ratio, added, removed, diff_lines
+    adapter.close()
+
+    # Skip GenericAdapter (it already uses reader_mode)
+    if adapter_name == "GenericAdapter":
+        return None
+
+    # Get reader_mode output
+    start = time.perf_counter()
+    reader_content = reader_extract_content(html_string)
+    reader_s = time.perf_counter() - start
+
+    # Save files
+    base = os.path.splitext(filepath)[0]
+    with open(f"{base}_ADAPTER_{adapter_name}.txt", 'w', encoding='utf-8') as f:
+        f.write(adapter_content)
+    with open(f"{base}_READER.txt", 'w', encoding='utf-8') as f:
+        f.write(reader_content)
+
+    start = time.perf_counter()
+    ratio, exact = compare_texts(adapter_content, reader_content)
+    compare_s = time.perf_counter() - start
+
+    adapter_len = len(adapter_content)
+    reader_len = len(reader_content)
+    only_in_adapter, only_in_reader = sample_differences(adapter_content, reader_content)
+    return {
+        'file': html_file,
+        'adapter': adapter_name,
+        'ratio': ratio,
+        'exact': exact,
+        'adapter_len': adapter_len,
+        'reader_len': reader_len,
+        'delta_pct': (adapter_len - reader_len) / max(adapter_len, 1) * 100,
+        'adapter_s': adapter_s,
+        'reader_s': reader_s,
+        'compare_s': compare_s,
+        'only_in_adapter': only_in_adapter,
+        'only_in_reader': only_in_reader,
+    }
+
+
+def verdict(result):
+    if result['ratio'] > REMOVE_RATIO:
+        return "REMOVE?"
+    return "CHECK" if result['ratio'] > CHECK_RATIO else "KEEP"
+
+
+def print_table(results):
+    print(f"{'File':<42} {'Adapter':<26} {'Similarity':>10} {'Delta':>8} "
+          f"{'Adapter':>9} {'Reader':>9} {'Verdict':<8}")
+    print("-" * 118)
+    for r in results:
+        name = r['file'][:39] + "..." if len(r['file']) > 42 else r['file']
+        similarity = f"{r['ratio']:.1%}" if r['exact'] else f"<{r['ratio']:.0%}"
+        print(f"{name:<42} {r['adapter']:<26} {similarity:>10} {r['delta_pct']:>+7.0f}% "
+              f"{r['adapter_s']:>8.2f}s {r['reader_s']:>8.2f}s {verdict(r):<8}")
+
+
+def print_details(results):
+    for r in results:
+        if r['ratio'] >= 0.99 or not (r['only_in_adapter'] or r['only_in_reader']):
+            continue
+        print(f"\n📄 {r['file']} ({r['adapter']}, {r['ratio']:.1%})")
+        for label, sentences in (("ADAPTER", r['only_in_adapter']), ("READER", r['only_in_reader'])):
+            if sentences:
+                print(f"   Only in {label}:")
+                for s in sentences:
+                    print(f"     - {s[:120]}...")
+
+
+def write_csv(results, path):
+    columns = ['file', 'adapter', 'ratio', 'exact', 'adapter_len', 'reader_len', 'delta_pct',
+               'adapter_s', 'reader_s', 'compare_s']
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=columns, extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(results)
+
 
 def main():
-    html_files = [f for f in os.listdir(ARTICLE_DIR) if f.endswith('.html')]
-    
+    parser = argparse.ArgumentParser(description="Compare adapter output vs reader_mode output")
+    parser.add_argument('directory', nargs='?', default=ARTICLE_DIR,
+                        help="Dossier des articles HTML (défaut: Article-Test/)")
+    parser.add_argument('--sort', choices=sorted(SORT_KEYS), default="similarity",
+                        help="Colonne de tri du tableau (défaut: %(default)s)")
+    parser.add_argument('--reverse', action='store_true', help="Tri décroissant")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Nombre de processus (défaut: nombre de cœurs)")
+    parser.add_argument('--csv', help="Écrit aussi le tableau dans ce fichier CSV")
+    parser.add_argument('--details', action='store_true',
+                        help="Affiche des phrases présentes dans une seule des deux extractions")
+    args = parser.parse_args()
+
+    html_files = sorted(f for f in os.listdir(args.directory)
+                        if f.endswith('.html') and not f.startswith('.'))
     if not html_files:
-        print("No HTML files found in Article-Test/")
+        print(f"No HTML files found in {args.directory}")
         return
-    
+
     print(f"Found {len(html_files)} HTML files to compare\n")
-    print("=" * 100)
-    
-    results = []
-    
-    for html_file in sorted(html_files):
-        filepath = os.path.join(ARTICLE_DIR, html_file)
-        short_name = html_file[:60] + "..." if len(html_file) > 60 else html_file
-        
-        print(f"\n📄 {short_name}")
-        print("-" * 80)
-        
-        html_string = load_html(filepath)
-        soup = BeautifulSoup(html_string, 'html.parser')
-        
-        # Get adapter output
-        adapter_name, adapter_content = get_adapter_content(soup, html_file)
-        
-        # Skip GenericAdapter (it already uses reader_mode)
-        if adapter_name == "GenericAdapter":
-            print(f"   ⏭️  Uses GenericAdapter (already reader_mode) — skipping")
-            continue
-        
-        # Get reader_mode output (need fresh soup since adapter may have modified it)
-        reader_content = get_reader_content(html_string)
-        
-        # Save files
-        base = os.path.splitext(html_file)[0]
-        adapter_file = os.path.join(ARTICLE_DIR, f"{base}_ADAPTER_{adapter_name}.txt")
-        reader_file = os.path.join(ARTICLE_DIR, f"{base}_READER.txt")
-        
-        with open(adapter_file, 'w', encoding='utf-8') as f:
-            f.write(adapter_content)
-        with open(reader_file, 'w', encoding='utf-8') as f:
-            f.write(reader_content)
-        
-        # Compare
-        ratio, added, removed, diff_lines = compare_texts(adapter_content, reader_content)
-        
-        adapter_len = len(adapter_content)
-        reader_len = len(reader_content)
-        diff_pct = abs(adapter_len - reader_len) / max(adapter_len, 1) * 100
-        
-        print(f"   Adapter: {adapter_name}")
-        print(f"   Adapter length: {adapter_len:,} chars ({len(adapter_content.split()):,} words)")
-        print(f"   Reader length:  {reader_len:,} chars ({len(reader_content.split()):,} words)")
-        print(f"   Similarity: {ratio:.1%}")
-        print(f"   Length diff: {diff_pct:.1f}% {'(adapter longer)' if adapter_len > reader_len else '(reader longer)'}")
-        print(f"   Words added in reader: {added}, Words removed from adapter: {removed}")
-        
-        if ratio > 0.95:
-            print(f"   ✅ VERY SIMILAR — adapter may be removable")
-        elif ratio > 0.85:
-            print(f"   ⚠️  MOSTLY SIMILAR — check differences carefully")
-        else:
-            print(f"   ❌ SIGNIFICANTLY DIFFERENT — adapter likely needed")
-        
-        results.append({
-            'file': html_file,
-            'adapter': adapter_name,
-            'ratio': ratio,
-            'adapter_len': adapter_len,
-            'reader_len': reader_len,
-            'added': added,
-            'removed': removed
-        })
-        
-        # Show first few differences for context
-        if ratio < 0.99:
-            print(f"\n   📋 Sample differences (first 500 chars of adapter-only text):")
-            # Find sentences in adapter but not in reader
-            adapter_sentences = set(s.strip() for s in re.split(r'[.!?]+', adapter_content) if len(s.strip()) > 20)
-            reader_sentences = set(s.strip() for s in re.split(r'[.!?]+', reader_content) if len(s.strip()) > 20)
-            
-            only_in_adapter = adapter_sentences - reader_sentences
-            only_in_reader = reader_sentences - adapter_sentences
-            
-            if only_in_adapter:
-                sample_adapter = list(only_in_adapter)[:3]
-                print(f"      Only in ADAPTER ({len(only_in_adapter)} unique sentences):")
-                for s in sample_adapter:
-                    print(f"        - {s[:120]}...")
-            
-            if only_in_reader:
-                sample_reader = list(only_in_reader)[:3]
-                print(f"      Only in READER ({len(only_in_reader)} unique sentences):")
-                for s in sample_reader:
-                    print(f"        - {s[:120]}...")
-    
-    # Summary
-    print("\n" + "=" * 100)
+    start = time.monotonic()
+    paths = [os.path.join(args.directory, f) for f in html_files]
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        results = [r for r in pool.map(compare_file, paths) if r is not None]
+    skipped = len(html_files) - len(results)
+
+    results.sort(key=SORT_KEYS[args.sort], reverse=args.reverse)
+    print_table(results)
+    if args.details:
+        print_details(results)
+    if args.csv:
+        write_csv(results, args.csv)
+
     print("\n📊 SUMMARY")
-    print("-" * 80)
-    print(f"{'Adapter':<25} {'Similarity':>12} {'Adapter':>10} {'Reader':>10} {'Verdict':<20}")
-    print("-" * 80)
+    counts = {}
     for r in results:
-        verdict = "REMOVE?" if r['ratio'] > 0.95 else ("CHECK" if r['ratio'] > 0.85 else "KEEP")
-        print(f"{r['adapter']:<25} {r['ratio']:>11.1%} {r['adapter_len']:>10,} {r['reader_len']:>10,} {verdict:<20}")
+        counts[verdict(r)] = counts.get(verdict(r), 0) + 1
+    print(f"   {len(results)} compared, {skipped} GenericAdapter skipped, "
+          f"{time.monotonic() - start:.1f}s: " + ", ".join(f"{k}={v}" for k, v in sorted(counts.items())))
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,78 @@
+from .base import BaseTTSBackend, split_text
+from .edge import EdgeTTSBackend
+from .local import LocalTTSBackend
+from .scheduler import TTSScheduler, BudgetExceeded
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class FallbackTTSBackend(BaseTTSBackend):
+    """
+    Uses the primary engine and switches to the fallback one when it fails.
+    After a failure the primary engine is considered down for the rest of the
+    run, so an edge-tts outage does not stall every remaining article.
+    """
+
+    name = "auto"
+
+    def __init__(self, primary, fallback):
+        self.primary = primary
+        self.fallback = fallback
+        self.primary_down = not primary.is_available()
+
+    def is_available(self):
+        return self.primary.is_available() or self.fallback.is_available()
+
+    async def synthesize(self, text, mp3_path):
+        if not self.primary_down:
+            try:
+                await self.primary.synthesize(text, mp3_path)
+                return
+            except BudgetExceeded:
+                raise
+            except Exception as e:
+                logger.warning(f"{self.primary.name} failed ({e}), switching to {self.fallback.name} for this run")
+                self.primary_down = True
+        await self.fallback.synthesize(text, mp3_path)
+
+    def active_engine(self):
+        return (self.fallback if self.primary_down else self.primary).active_engine()
+
+    def stats(self):
+        stats = self.primary.stats()
+        stats["fallback_used"] = self.primary_down
+        return stats
+
+    def close(self):
+        self.primary.close()
+        self.fallback.close()
+
+
+def get_backend(name, voice, local_engine="espeak-ng", local_voice="fr", local_model=None,
+                scheduler_options=None):
+    """
+    Factory function to get the speech synthesis backend selected for this run.
+
+    name: "edge", "local" or "auto" (edge-tts, falling back to the local engine).
+    scheduler_options: keyword arguments of TTSScheduler, which paces the
+    requests sent to edge-tts.
+    """
+    edge = TTSScheduler(EdgeTTSBackend(voice), **(scheduler_options or {}))
+    local = LocalTTSBackend(local_engine, local_voice, local_model)
+
+    if name == "edge":
+        backend = edge
+    elif name == "local":
+        backend = local
+    elif local.is_available():
+        backend = FallbackTTSBackend(edge, local)
+    else:
+        logger.info(f"Local TTS engine {local_engine} not available, no fallback for edge-tts")
+        backend = edge
+
+    if not backend.is_available():
+        raise RuntimeError(f"TTS backend '{name}' is not available on this machine")
+
+    logger.info(f"Using TTS backend: {backend.name}")
+    return backend
@@ -0,0 +1,92 @@
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+# Sentence boundaries used to cut long articles into synthesis chunks.
+# The intro built by html_to_mp3 ("Article de X... Titre... Par Y...") relies on
+# "..." pauses, so they count as boundaries too.
+SENTENCE_END = re.compile(r'(?<=[.!?…])\s+')
+
+
+def split_text(text, max_chars=2000):
+    """
+    Splits text into chunks of at most max_chars characters, cutting on
+    sentence boundaries whenever possible.
+
+    A single sentence longer than max_chars is cut on word boundaries.
+    """
+    text = text.strip()
+    if not text:
+        return []
+    if len(text) <= max_chars:
+        return [text]
+
+    chunks = []
+    current = ""
+    for sentence in SENTENCE_END.split(text):
+        if not sentence:
+            continue
+
+        if len(sentence) > max_chars:
+            # Sentence too long on its own: flush and cut it on spaces
+            if current:
+                chunks.append(current)
+                current = ""
+            for word in sentence.split(" "):
+                if current and len(current) + 1 + len(word) > max_chars:
+                    chunks.append(current)
+                    current = word
+                else:
+                    current = f"{current} {word}" if current else word
+            continue
+
+        if current and len(current) + 1 + len(sentence) > max_chars:
+            chunks.append(current)
+            current = sentence
+        else:
+            current = f"{current} {sentence}" if current else sentence
+
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+class BaseTTSBackend:
+    """Common interface of the speech synthesis engines."""
+
+    name = "base"
+
+    def is_available(self):
+        """Returns True if the engine can be used on this machine."""
+        return False
+
+    async def synthesize(self, text, mp3_path):
+        """
+        Synthesizes text and writes the resulting MP3 to mp3_path. By default
+        the chunks of text are synthesized one after the other and their bare
+        MP3 streams concatenated.
+        """
+        with open(mp3_path, "wb") as f:
+            for chunk in split_text(text):
+                f.write(await self.synthesize_chunk(chunk))
+
+    async def synthesize_chunk(self, text, on_first_audio=None):
+        """
+        Synthesizes a short text and returns the bare MP3 stream as bytes
+        (empty: no audio, rejected by the output verification).
+        on_first_audio is called once, as soon as the first audio bytes arrive.
+        """
+        return b""
+
+    def active_engine(self):
+        """Name of the engine that synthesizes articles at this point of the run."""
+        return self.name
+
+    def stats(self):
+        """Returns counters describing this run, for the run report."""
+        return {"backend": self.name}
+
+    def close(self):
+        """Releases the resources held by the backend (pools, sessions)."""
+        pass
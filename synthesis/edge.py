@@ -0,0 +1,35 @@
+import logging
+from .base import BaseTTSBackend
+
+try:
+    import edge_tts
+except ImportError:  # Optional when only the local engine is used
+    edge_tts = None
+
+logger = logging.getLogger(__name__)
+
+
+class EdgeTTSBackend(BaseTTSBackend):
+    """Remote Microsoft Edge neural voices (default engine)."""
+
+    name = "edge"
+
+    def __init__(self, voice):
+        self.voice = voice
+
+    def is_available(self):
+        return edge_tts is not None
+
+    async def synthesize(self, text, mp3_path):
+        communicate = edge_tts.Communicate(text, self.voice)
+        await communicate.save(mp3_path)
+
+    async def synthesize_chunk(self, text, on_first_audio=None):
+        communicate = edge_tts.Communicate(text, self.voice)
+        audio = bytearray()
+        async for chunk in communicate.stream():
+            if chunk["type"] == "audio":
+                if not audio and on_first_audio:
+                    on_first_audio()
+                audio.extend(chunk["data"])
+        return bytes(audio)
@@ -0,0 +1,111 @@
+import asyncio
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from .base import BaseTTSBackend, split_text
+
+logger = logging.getLogger(__name__)
+
+# Local engines are much slower per character than edge-tts, but each chunk is
+# independent: small chunks spread an article over every core.
+LOCAL_CHUNK_CHARS = 800
+
+
+def _find_encoder():
+    """Returns the MP3 encoder available on this machine ("lame" or "ffmpeg")."""
+    for encoder in ("lame", "ffmpeg"):
+        if shutil.which(encoder):
+            return encoder
+    return None
+
+
+def _synthesize_chunk(engine, voice, model, encoder, text):
+    """
+    Runs in a worker process: synthesizes one chunk to WAV with the local
+    engine, then encodes it to a bare MP3 stream (no ID3, no Xing header) so
+    that the chunks of an article can simply be concatenated.
+    """
+    with tempfile.TemporaryDirectory(prefix="tts_local_") as tmp:
+        wav_path = os.path.join(tmp, "chunk.wav")
+        mp3_path = os.path.join(tmp, "chunk.mp3")
+
+        if engine == "piper":
+            cmd = ["piper", "--model", model, "--output_file", wav_path]
+        else:
+            cmd = [engine, "-v", voice, "-w", wav_path, "--stdin"]
+        subprocess.run(cmd, input=text.encode("utf-8"), check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+
+        if encoder == "lame":
+            cmd = ["lame", "--quiet", "-t", "-b", "64", wav_path, mp3_path]
+        else:
+            cmd = ["ffmpeg", "-loglevel", "error", "-y", "-i", wav_path,
+                   "-codec:a", "libmp3lame", "-b:a", "64k",
+                   "-write_xing", "0", "-id3v2_version", "0", mp3_path]
+        subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+
+        with open(mp3_path, "rb") as f:
+            return f.read()
+
+
+class LocalTTSBackend(BaseTTSBackend):
+    """
+    Offline synthesis with espeak-ng or piper, encoded to MP3 with lame/ffmpeg.
+
+    Chunks of an article are synthesized in a process pool sized to the CPU
+    count, so throughput scales with the number of cores.
+    """
+
+    name = "local"
+
+    def __init__(self, engine="espeak-ng", voice="fr", model=None, workers=None):
+        self.engine = engine
+        self.voice = voice
+        self.model = model
+        self.workers = workers or os.cpu_count() or 1
+        self.encoder = _find_encoder()
+        self._pool = None
+
+    def is_available(self):
+        if not self.encoder or not shutil.which(self.engine):
+            return False
+        if self.engine == "piper" and not (self.model and os.path.exists(self.model)):
+            return False
+        return True
+
+    def _get_pool(self):
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        return self._pool
+
+    async def synthesize(self, text, mp3_path):
+        loop = asyncio.get_running_loop()
+        pool = self._get_pool()
+        chunks = split_text(text, LOCAL_CHUNK_CHARS)
+        logger.info(f"Local TTS ({self.engine}): {len(chunks)} chunks on {self.workers} workers")
+
+        parts = await asyncio.gather(*[
+            loop.run_in_executor(pool, _synthesize_chunk,
+                                 self.engine, self.voice, self.model, self.encoder, chunk)
+            for chunk in chunks
+        ])
+
+        with open(mp3_path, "wb") as f:
+            for part in parts:
+                f.write(part)
+
+    async def synthesize_chunk(self, text, on_first_audio=None):
+        loop = asyncio.get_running_loop()
+        audio = await loop.run_in_executor(self._get_pool(), _synthesize_chunk,
+                                           self.engine, self.voice, self.model, self.encoder, text)
+        if on_first_audio:
+            on_first_audio()
+        return audio
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
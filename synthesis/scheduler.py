@@ -0,0 +1,330 @@
+import asyncio
+import json
+import logging
+import os
+import random
+import time
+from collections import deque
+from .base import BaseTTSBackend, split_text
+
+logger = logging.getLogger(__name__)
+
+
+class BudgetExceeded(Exception):
+    """Raised when the daily character budget cannot cover an article."""
+
+
+async def _cancel(*tasks):
+    """Cancels the tasks still running and waits for them: a losing request never outlives its caller."""
+    pending = [task for task in tasks if not task.done()]
+    for task in pending:
+        task.cancel()
+    if pending:
+        await asyncio.wait(pending)
+
+
+class TokenBucket:
+    """
+    Character budget refilled continuously at capacity / period.
+
+    A request larger than the bucket capacity is accepted once the bucket is
+    full (the balance goes negative), otherwise it could never be served.
+    """
+
+    def __init__(self, capacity, period, tokens=None, updated=None):
+        self.capacity = capacity
+        self.rate = capacity / period
+        self.tokens = capacity if tokens is None else tokens
+        self.updated = time.time() if updated is None else updated
+
+    def _refill(self):
+        now = time.time()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self, amount):
+        """Seconds to wait before amount tokens can be consumed (0 if available now)."""
+        self._refill()
+        needed = min(amount, self.capacity)
+        if self.tokens >= needed:
+            return 0.0
+        return (needed - self.tokens) / self.rate
+
+    def consume(self, amount):
+        self._refill()
+        self.tokens -= amount
+
+    def refund(self, amount):
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+    def remaining(self):
+        self._refill()
+        return max(0, int(self.tokens))
+
+
+class TTSScheduler(BaseTTSBackend):
+    """
+    Wraps a remote backend (edge-tts) and synthesizes articles chunk by chunk:
+
+    - in-flight requests are limited by an AIMD window: +1 request per window
+      of fast successes, halved on errors or latency spikes;
+    - failed requests are retried with jittered exponential backoff, each
+      attempt bounded by a deadline;
+    - characters sent are limited by a per-minute and a per-day token bucket,
+      the daily one being persisted between runs in state_path;
+    - optionally, a request that has not produced audio (or completed) within
+      the hedge_percentile of the observed latencies is duplicated: the first
+      finisher wins and the other one is cancelled. Hedges are capped to
+      hedge_max_rate of the requests.
+    """
+
+    name = "scheduler"
+
+    def __init__(self, backend, state_path=None, chunk_chars=2000,
+                 min_concurrency=1, max_concurrency=6, initial_concurrency=2,
+                 max_retries=5, backoff_base=2.0, backoff_max=120.0,
+                 request_deadline=180.0, slow_factor=3.0,
+                 chars_per_minute=60000, chars_per_day=3000000,
+                 hedge=False, hedge_percentile=0.95, hedge_max_rate=0.1, hedge_min_samples=20):
+        self.backend = backend
+        self.name = backend.name
+        self.state_path = state_path
+        self.chunk_chars = chunk_chars
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.limit = float(initial_concurrency)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.request_deadline = request_deadline
+        self.slow_factor = slow_factor
+
+        self.minute_bucket = TokenBucket(chars_per_minute, 60)
+        self.day_bucket = TokenBucket(chars_per_day, 86400, **self._load_day_budget())
+
+        self.in_flight = 0
+        self._condition = None
+        self._last_decrease = 0.0
+        self._latency_per_char = None  # EWMA of seconds per character
+
+        self.hedge = hedge
+        self.hedge_percentile = hedge_percentile
+        self.hedge_max_rate = hedge_max_rate
+        self.hedge_min_samples = hedge_min_samples
+        self._first_audio_latencies = deque(maxlen=200)
+        self._completion_per_char = deque(maxlen=200)
+
+        self.requests = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.retries = 0
+        self.failures = 0
+        self.chars_sent = 0
+        self.peak_concurrency = self.limit
+
+    # --- Persistence of the daily budget ---
+
+    def _load_day_budget(self):
+        if not self.state_path or not os.path.exists(self.state_path):
+            return {}
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            return {"tokens": state["tokens"], "updated": state["updated"]}
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Could not read TTS budget state {self.state_path}: {e}")
+            return {}
+
+    def _save_day_budget(self):
+        if not self.state_path:
+            return
+        tmp_path = self.state_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"tokens": self.day_bucket.tokens, "updated": self.day_bucket.updated}, f)
+        os.replace(tmp_path, self.state_path)
+
+    # --- AIMD concurrency window ---
+
+    async def _acquire(self):
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+
+    async def _release(self):
+        async with self._condition:
+            self.in_flight -= 1
+            self._condition.notify_all()
+
+    def _on_success(self, latency, chars):
+        per_char = latency / max(chars, 1)
+        if self._latency_per_char is not None and per_char > self.slow_factor * self._latency_per_char:
+            self._decrease(f"slow response ({latency:.1f}s)")
+        else:
+            self.limit = min(self.max_concurrency, self.limit + 1.0 / self.limit)
+            self.peak_concurrency = max(self.peak_concurrency, self.limit)
+
+        if self._latency_per_char is None:
+            self._latency_per_char = per_char
+        else:
+            self._latency_per_char = 0.8 * self._latency_per_char + 0.2 * per_char
+
+    def _decrease(self, reason):
+        # Concurrent failures from the same window only count once
+        now = time.monotonic()
+        if now - self._last_decrease < 1.0:
+            return
+        self._last_decrease = now
+        self.limit = max(self.min_concurrency, self.limit / 2)
+        logger.info(f"TTS concurrency reduced to {int(self.limit)} ({reason})")
+
+    # --- Hedged requests ---
+
+    def _percentile(self, samples):
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(self.hedge_percentile * len(ordered)))]
+
+    def _timed_request(self, text):
+        """Starts one request, recording its first-audio and completion latencies."""
+        started = time.monotonic()
+        first_audio = asyncio.Event()
+
+        def on_first_audio():
+            if not first_audio.is_set():
+                first_audio.set()
+                self._first_audio_latencies.append(time.monotonic() - started)
+
+        task = asyncio.ensure_future(self.backend.synthesize_chunk(text, on_first_audio=on_first_audio))
+        task.first_audio = first_audio
+        return task
+
+    async def _request(self, text):
+        primary = self._timed_request(text)
+        started = time.monotonic()
+
+        if not self.hedge or len(self._completion_per_char) < self.hedge_min_samples:
+            return await primary
+
+        first_audio_wait = asyncio.ensure_future(primary.first_audio.wait())
+        try:
+            # 1. No audio at all after the usual time to first bytes
+            await asyncio.wait({primary, first_audio_wait},
+                               timeout=self._percentile(self._first_audio_latencies)
+                               if self._first_audio_latencies else None,
+                               return_when=asyncio.FIRST_COMPLETED)
+
+            # 2. Audio started but the request lasts longer than usual
+            if primary.first_audio.is_set() and not primary.done():
+                expected = self._percentile(self._completion_per_char) * len(text)
+                await asyncio.wait({primary}, timeout=max(0.0, expected - (time.monotonic() - started)))
+
+            if primary.done() or self.hedges >= self.hedge_max_rate * self.requests:
+                return await primary
+
+            self.hedges += 1
+            self.in_flight += 1  # The duplicate does not wait for the window
+            logger.info(f"Hedging slow TTS request ({time.monotonic() - started:.1f}s, {len(text)} chars)")
+            secondary = self._timed_request(text)
+            try:
+                pending = {primary, secondary}
+                while pending:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    winner = next((t for t in done if t.exception() is None), None)
+                    if winner is not None:
+                        if winner is secondary:
+                            self.hedge_wins += 1
+                        return winner.result()
+                # Both failed: report the primary's error
+                return primary.result()
+            finally:
+                await _cancel(secondary)
+                await self._release()
+        finally:
+            await _cancel(primary, first_audio_wait)
+
+    # --- Synthesis ---
+
+    def _reserve_daily_budget(self, chars):
+        if self.day_bucket.delay(chars) > 0:
+            raise BudgetExceeded(
+                f"daily TTS budget exhausted ({self.day_bucket.remaining()} chars left, {chars} needed)"
+            )
+        self.day_bucket.consume(chars)
+        self._save_day_budget()
+
+    async def _run_chunk(self, text):
+        for attempt in range(self.max_retries + 1):
+            delay = self.minute_bucket.delay(len(text))
+            while delay > 0:
+                await asyncio.sleep(delay)
+                delay = self.minute_bucket.delay(len(text))
+            self.minute_bucket.consume(len(text))
+
+            await self._acquire()
+            started = time.monotonic()
+            self.requests += 1
+            try:
+                audio = await asyncio.wait_for(self._request(text), timeout=self.request_deadline)
+            except Exception as e:
+                reason = "deadline exceeded" if isinstance(e, asyncio.TimeoutError) else str(e) or type(e).__name__
+                self._decrease(reason)
+                if attempt == self.max_retries:
+                    self.failures += 1
+                    raise
+                self.retries += 1
+                backoff = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+                logger.warning(f"TTS request failed ({reason}), retry {attempt + 1}/{self.max_retries} in {backoff:.1f}s")
+            else:
+                self._completion_per_char.append((time.monotonic() - started) / max(len(text), 1))
+                self._on_success(time.monotonic() - started, len(text))
+                self.chars_sent += len(text)
+                return audio
+            finally:
+                await self._release()
+            await asyncio.sleep(backoff)
+
+    async def synthesize(self, text, mp3_path):
+        chunks = split_text(text, self.chunk_chars)
+        self._reserve_daily_budget(len(text))
+
+        tasks = []
+        try:
+            async with asyncio.TaskGroup() as group:
+                tasks = [group.create_task(self._run_chunk(chunk)) for chunk in chunks]
+        except BaseException as e:
+            # Give back the characters that were not synthesized
+            done = sum(len(c) for c, t in zip(chunks, tasks)
+                       if t.done() and not t.cancelled() and t.exception() is None)
+            self.day_bucket.refund(len(text) - done)
+            self._save_day_budget()
+            if isinstance(e, BaseExceptionGroup):
+                raise e.exceptions[0] from None
+            raise
+
+        with open(mp3_path, "wb") as f:
+            for task in tasks:
+                f.write(task.result())
+
+    def stats(self):
+        return {
+            "backend": self.backend.name,
+            "concurrency": int(self.limit),
+            "peak_concurrency": int(self.peak_concurrency),
+            "requests": self.requests,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "hedge_rate": round(self.hedges / self.requests, 3) if self.requests else 0.0,
+            "retries": self.retries,
+            "failures": self.failures,
+            "chars_sent": self.chars_sent,
+            "budget_minute_remaining": self.minute_bucket.remaining(),
+            "budget_day_remaining": self.day_bucket.remaining(),
+        }
+
+    def is_available(self):
+        return self.backend.is_available()
+
+    def close(self):
+        self.backend.close()
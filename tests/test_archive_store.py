@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Test de l'archive des HTML traités: copies compressées adressées par leur
+contenu (un contenu identique n'est stocké qu'une fois), index nom/date/MP3
+rechargé entre deux passages, import des anciens fichiers archivés et relecture
+directe des copies compressées.
+"""
+import gzip
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pipeline import ArchiveStore, read_html
+
+HTML = "<html><head><meta charset='utf-8'><title>Économie</title></head><body>" + "<p>Texte.</p>" * 500 + "</body></html>"
+
+
+def _input(directory, name, text=HTML):
+    path = directory / name
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+def test_add_compresses_and_removes_source(tmp_path):
+    inbox = tmp_path / "inbox"
+    inbox.mkdir()
+    store = ArchiveStore(str(tmp_path / "archive"))
+    entry = store.add(str(_input(inbox, "article.html")), mp3="Économie.mp3")
+
+    path = store.object_path(entry["sha1"])
+    assert not (inbox / "article.html").exists()
+    assert os.path.getsize(path) < entry["size"] == len(HTML.encode("utf-8"))
+    assert read_html(path) == HTML
+
+
+def test_duplicates_are_stored_once(tmp_path):
+    inbox = tmp_path / "inbox"
+    inbox.mkdir()
+    store = ArchiveStore(str(tmp_path / "archive"))
+    first = store.add(str(_input(inbox, "article.html")), mp3="Économie.mp3")
+    second = store.add(str(_input(inbox, "article (1).html")), mp3="Économie.mp3")
+    store.add(str(_input(inbox, "article.html", HTML + " ")))
+
+    assert first["sha1"] == second["sha1"]
+    objects = [name for _, _, names in os.walk(store.objects_dir) for name in names]
+    assert len(objects) == 2
+    assert store.stats() == {"archived": 3, "deduplicated": 1, "contents": 2, "files": 3}
+
+
+def test_index_is_reloaded(tmp_path):
+    inbox = tmp_path / "inbox"
+    inbox.mkdir()
+    archive_dir = str(tmp_path / "archive")
+    store = ArchiveStore(archive_dir)
+    store.add(str(_input(inbox, "article.html")))
+    store.add(str(_input(inbox, "copie.html")), mp3="Économie.mp3")
+
+    store = ArchiveStore(archive_dir)
+    assert store.find("article.html")["mp3"] == ""
+    assert store.find("inconnu.html") is None
+    # One entry per content, the one that produced an MP3
+    assert [entry["name"] for entry in store.contents()] == ["copie.html"]
+
+
+def test_import_legacy_archived_files(tmp_path):
+    archive_dir = tmp_path / "archive"
+    archive_dir.mkdir()
+    _input(archive_dir, "ancien.html")
+    _input(archive_dir, "ancien_1.html", HTML.replace("Économie", "Politique"))
+    (archive_dir / "notes.txt").write_text("pas un article")
+
+    store = ArchiveStore(str(archive_dir))
+    assert store.import_legacy() == 2
+    assert sorted(os.listdir(archive_dir)) == ["index.jsonl", "notes.txt", "objects"]
+    assert read_html(store.object_path(store.find("ancien_1.html")["sha1"])) == HTML.replace("Économie", "Politique")
+    assert store.import_legacy() == 0
+
+
+def test_gzip_header_keeps_original_name(tmp_path):
+    inbox = tmp_path / "inbox"
+    inbox.mkdir()
+    store = ArchiveStore(str(tmp_path / "archive"))
+    entry = store.add(str(_input(inbox, "article.html")))
+    with open(store.object_path(entry["sha1"]), "rb") as f:
+        header = f.read(64)
+    assert header[:2] == b"\x1f\x8b" and b"article.html" in header
+    with gzip.open(store.object_path(entry["sha1"]), "rt", encoding="utf-8") as f:
+        assert f.read() == HTML
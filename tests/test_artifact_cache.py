@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Test du cache des étapes d'extraction: métadonnées et texte brut par empreinte
+et nom du fichier HTML, texte normalisé par empreinte du texte, chaque étape
+invalidée quand son code change, et reprise d'un article sans nouvelle
+analyse ni nouvelle lecture du HTML.
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import html_to_mp3
+from pipeline import ArtifactCache
+
+EXTRACTION = {"meta": {"title": "Titre"}, "text_body": "Texte brut.", "tier": "adapter",
+              "adapter": "adapters.ballast", "junk": None}
+
+
+def test_extraction_is_keyed_by_html_name_and_adapter_code(tmp_path):
+    cache = ArtifactCache(str(tmp_path), {"adapters.ballast": "v1"}, "n1")
+    assert cache.extraction("abc", "a.html") is None
+    cache.store_extraction("abc", "a.html", EXTRACTION)
+    assert cache.extraction("abc", "a.html") == EXTRACTION
+    assert cache.extraction("other html", "a.html") is None
+    # Adapters read the filename: the same content under another name is extracted again
+    assert cache.extraction("abc", "b.html") is None
+
+    # Only a change of the adapter that produced it invalidates it
+    assert ArtifactCache(str(tmp_path), {"adapters.ballast": "v1", "adapters.cairn": "v2"}, "n2").extraction("abc", "a.html")
+    assert ArtifactCache(str(tmp_path), {"adapters.ballast": "v2"}, "n1").extraction("abc", "a.html") is None
+
+
+def test_normalized_text_is_keyed_by_text_and_normalizer_code(tmp_path):
+    cache = ArtifactCache(str(tmp_path), {}, "n1")
+    cache.store_normalized("Texte brut.", "Texte normalisé.")
+    assert cache.normalized("Texte brut.") == "Texte normalisé."
+    assert cache.normalized("Autre texte.") is None
+    assert ArtifactCache(str(tmp_path), {}, "n2").normalized("Texte brut.") is None
+    assert cache.stats() == {"extract_hits": 0, "extract_misses": 0, "normalize_hits": 1, "normalize_misses": 1}
+
+
+def test_prune_drops_unused_entries(tmp_path):
+    cache = ArtifactCache(str(tmp_path), {}, "n1", max_age=3600)
+    cache.store_normalized("ancien", "ancien")
+    cache.store_normalized("récent", "récent")
+    old = time.time() - 7200
+    for name in os.listdir(tmp_path / "normalize"):
+        os.utime(tmp_path / "normalize" / name, (old, old))
+    cache.normalized("récent")  # Used: kept
+    assert cache.prune() == 1
+    assert cache.normalized("récent") == "récent"
+
+
+ARTICLE = ("<html><head><title>Titre</title></head><body><article>"
+           + "<p>Un paragraphe assez long pour être synthétisé par le moteur TTS.</p>" * 5
+           + "</article></body></html>")
+
+
+def test_extract_article_reuses_cached_stages(tmp_path, monkeypatch):
+    source = tmp_path / "article.html"
+    source.write_text(ARTICLE, encoding="utf-8")
+    monkeypatch.setattr(html_to_mp3, "ARTIFACT_DIR", str(tmp_path / "artifacts"))
+    monkeypatch.setattr(html_to_mp3, "_artifact_cache", None)
+    first = html_to_mp3.extract_article(str(source))
+    assert first["cached"] == []
+
+    def no_parse(filepath):
+        raise AssertionError("HTML parsed again")
+
+    monkeypatch.setattr(html_to_mp3, "extract_text", no_parse)
+    second = html_to_mp3.extract_article(str(source))
+    assert second["cached"] == ["extract", "normalize"]
+    assert second["full_content"] == first["full_content"]
+
+    # Normalizer changed: the extraction is still reused
+    cache = html_to_mp3.artifact_cache()
+    monkeypatch.setattr(cache, "normalize_fingerprint", "changed")
+    third = html_to_mp3.extract_article(str(source))
+    assert third["cached"] == ["extract"]
+    assert third["full_content"] == first["full_content"]
+
+
+def test_extract_article_reads_the_file_once_and_keys_by_name(tmp_path, monkeypatch):
+    source = tmp_path / "article.html"
+    source.write_text(ARTICLE, encoding="utf-8")
+    monkeypatch.setattr(html_to_mp3, "ARTIFACT_DIR", str(tmp_path / "artifacts"))
+    monkeypatch.setattr(html_to_mp3, "_artifact_cache", None)
+
+    def no_read(filepath):
+        raise AssertionError("HTML read a second time")
+
+    monkeypatch.setattr(html_to_mp3, "read_html", no_read)
+    assert html_to_mp3.extract_article(str(source))["cached"] == []
+    assert html_to_mp3.extract_article(str(source))["cached"] == ["extract", "normalize"]
+
+    # Renamed (e.g. to the name an adapter recognizes): extracted again
+    renamed = tmp_path / "Ballast - article.html"
+    source.rename(renamed)
+    assert "extract" not in html_to_mp3.extract_article(str(renamed))["cached"]
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Test de l'ordre de traitement des articles en attente: prioritaires d'abord
+(dossier ou préfixe du nom), puis les plus courts d'abord d'après une
+estimation de la longueur du texte, avec vieillissement des articles longs,
+et nouveau parcours du dossier seulement de temps en temps pendant un passage.
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pipeline.backlog
+from pipeline import Backlog, estimate_chars
+
+HOUR = 3600
+
+
+def _article(directory, name, words, saved):
+    path = directory / name
+    path.write_text(
+        "<html><head><title>Titre</title><style>p { color: red }</style></head><body>"
+        + "<p>" + " mot" * words + "</p><script>var x = 1;</script></body></html>",
+        encoding="utf-8")
+    os.utime(path, (saved, saved))
+    return path
+
+
+def test_estimate_counts_body_text_only(tmp_path):
+    path = _article(tmp_path, "article.html", 10, 0)
+    assert estimate_chars(str(path)) == len("mot " * 10) - 1
+
+
+def test_shortest_first_then_aging(tmp_path):
+    now = 100 * HOUR
+    _article(tmp_path, "long.html", 5000, now - HOUR)
+    _article(tmp_path, "court.html", 100, now - 0.5 * HOUR)
+    _article(tmp_path, "moyen.html", 1000, now - 0.2 * HOUR)
+    (tmp_path / "notes.txt").write_text("pas un article")
+    (tmp_path / "partiel.html.part").write_text("<p>en cours</p>")
+
+    backlog = Backlog(str(tmp_path), aging_chars_per_hour=2000)
+    assert [item.name for item in backlog.scan(now)] == ["court.html", "moyen.html", "long.html"]
+
+    # Ten hours later, the long article goes before the short pieces saved since
+    _article(tmp_path, "breve.html", 10, now + 10 * HOUR)
+    names = [item.name for item in backlog.scan(now + 10 * HOUR)]
+    assert names.index("long.html") < names.index("breve.html")
+    assert names.index("court.html") < names.index("long.html")
+
+
+def test_priority_folder_and_marker_come_first(tmp_path):
+    now = 100 * HOUR
+    priority_dir = tmp_path / "Prioritaire"
+    priority_dir.mkdir()
+    _article(tmp_path, "court.html", 10, now)
+    _article(tmp_path, "!urgent.html", 3000, now)
+    _article(priority_dir, "dossier.html", 2000, now)
+
+    backlog = Backlog(str(tmp_path), str(priority_dir))
+    items = backlog.scan(now)
+    assert [item.name for item in items] == ["dossier.html", "!urgent.html", "court.html"]
+    assert items[0].path == str(priority_dir / "dossier.html")
+
+
+def test_next_skips_done_and_sees_new_files(tmp_path):
+    _article(tmp_path, "a.html", 100, 0)
+    backlog = Backlog(str(tmp_path))
+    first = backlog.next()
+    _article(tmp_path, "b.html", 10, 0)
+    assert backlog.next({first.path}).name == "b.html"
+    assert backlog.next({first.path, str(tmp_path / "b.html")}) is None
+
+
+def test_estimates_are_cached_by_size_and_mtime(tmp_path, monkeypatch):
+    inbox = tmp_path / "inbox"
+    inbox.mkdir()
+    path = _article(inbox, "article.html", 100, 0)
+    state = str(tmp_path / "backlog.json")
+    Backlog(str(inbox), state_path=state).scan()
+
+    calls = []
+    real_estimate = pipeline.backlog.estimate_chars
+    monkeypatch.setattr(pipeline.backlog, "estimate_chars", lambda p: calls.append(p) or real_estimate(p))
+    backlog = Backlog(str(inbox), state_path=state)
+    backlog.scan()
+    assert calls == []
+
+    _article(inbox, "article.html", 50, 10)
+    assert backlog.scan()[0].chars == len("mot " * 50) - 1
+    assert calls == [str(path)]
+
+
+def test_directory_is_not_scanned_before_every_file(tmp_path, monkeypatch):
+    for i in range(6):
+        _article(tmp_path, f"{i}.html", 10 + i, 0)
+    scans = []
+    real_iter_inputs = pipeline.backlog.iter_inputs
+
+    def counting_iter_inputs(*args, **kwargs):
+        scans.append(args[0])
+        return real_iter_inputs(*args, **kwargs)
+
+    monkeypatch.setattr(pipeline.backlog, "iter_inputs", counting_iter_inputs)
+    backlog = Backlog(str(tmp_path), rescan_every=4, rescan_interval=3600)
+    done = set()
+    served = []
+    while (item := backlog.next(done)) is not None:
+        done.add(item.path)
+        served.append(item.name)
+        if len(served) == 2:
+            _article(tmp_path, "0a.html", 1, 0)  # Saved during the run: shortest of all
+    # Scanned at start, after 4 files, and once more to find the queue empty
+    assert len(scans) == 3 and backlog.stats()["scans"] == 3
+    assert served == ["0.html", "1.html", "2.html", "3.html", "0a.html", "4.html", "5.html"]
+
+
+def test_rescan_after_interval(tmp_path, monkeypatch):
+    _article(tmp_path, "a.html", 10, 0)
+    _article(tmp_path, "b.html", 20, 0)
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now)
+    backlog = Backlog(str(tmp_path), rescan_every=100, rescan_interval=60)
+    first = backlog.next()
+    _article(tmp_path, "court.html", 1, 0)
+    assert backlog.next({first.path}).name == "b.html"  # Not seen yet
+    monkeypatch.setattr(time, "time", lambda: now + 61)
+    assert backlog.next({first.path, str(tmp_path / "b.html")}).name == "court.html"
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Test de l'extraction non destructive: la vue en lecture seule donne le même
+texte que la copie du conteneur suivie des boucles extract()/unwrap(), sans
+modifier l'arbre, et les adapters peuvent extraire métadonnées et contenu
+dans n'importe quel ordre.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup
+
+from adapters import CairnAdapter, LeMondeDiplomatiqueAdapter, MediapartAdapter
+from adapters.junk import JunkFilter
+from adapters.view import ContentView
+
+BLOCKS = ['p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6']
+TAGS = ['h1', 'h2', 'h3', 'p', 'blockquote', 'li']
+
+PAGE = """<div id="c">
+<div class="wrap"><p>Premier <b>paragraphe</b>.</p><div><h2>Intertitre</h2></div></div>
+<p>Un p qui contient <p>un autre p</p> et du texte.</p>
+<div class="share"><p>Partager</p></div>
+<blockquote><p>Citation imbriquée.</p></blockquote>
+<p>Texte <span class="share">masqué</span> gardé.</p>
+<div style="display:none"><p>Doublon caché.</p></div>
+<ul><li>Un élément</li></ul>
+</div>"""
+
+
+def _unwrapped(html, junk_filter):
+    """The former extraction: copy, remove the junk, unwrap until stable."""
+    container = BeautifulSoup(html, "html.parser").div.__copy__()
+    junk_filter.remove(container)
+    while True:
+        wrapper = container.find(lambda t: t.name in ['p', 'div'] and t.find(BLOCKS))
+        if not wrapper:
+            break
+        wrapper.unwrap()
+    return [(t.name, t.get_text(separator=" ", strip=True)) for t in container.find_all(TAGS)]
+
+
+def test_view_matches_copy_and_unwrap():
+    junk_filter = JunkFilter(selectors=[".share"])
+    soup = BeautifulSoup(PAGE, "html.parser")
+    before = str(soup)
+
+    view = ContentView(soup.div, junk_filter)
+    texts = [(t.name, view.get_text(t, separator=" ", strip=True))
+             for t in view.find_all(TAGS, flatten=['p', 'div'])]
+
+    assert texts == _unwrapped(PAGE, junk_filter)
+    assert ("p", "Texte gardé.") in texts
+    assert view.junk_stats["removed"] == 3 and view.junk_stats["hidden"] == 1
+    assert str(soup) == before
+
+
+def test_excluded_blocks_no_longer_count_for_flattening():
+    soup = BeautifulSoup("<div><p>Avant <span><p>Auteur</p></span> après.</p></div>", "html.parser")
+    view = ContentView(soup.div)
+    assert [view.get_text(t) for t in view.find_all('p', flatten=['p'])] == ["Auteur"]
+
+    view.exclude(soup.div.p.span.p)
+    assert [view.get_text(t) for t in view.find_all('p', flatten=['p'])] == ["Avant  après."]
+    assert view.find('p', soup.div.p) is None
+    assert not view.contains(soup.div.p, ['p'])
+
+
+def test_find_outermost_skips_nested_tags():
+    soup = BeautifulSoup("<div><p>a<p>b</p></p><h2>c</h2><section><li>d<p>e</p></li></section></div>",
+                         "html.parser")
+    view = ContentView(soup.div)
+    assert [t.name for t in view.find_outermost(['p', 'h2', 'li'])] == ['p', 'h2', 'li']
+
+
+CAIRN = """<html><head><meta property="og:site_name" content="Cairn.info">
+<meta property="og:description" content="Court."></head><body>
+<main class="main-content"><h1>Le titre de l'article sur Cairn</h1>
+<p class="author">Jeanne Martin</p><p>DOI 10.3917/xyz</p>
+<div class="article-body"><div><p>Premier paragraphe de l'article, assez long pour être lu à voix haute.</p></div>
+<p>Second paragraphe de l'article, lui aussi assez long pour passer le filtre.</p></div>
+<div class="notes"><p>Une note de bas de page qui ne doit pas être lue.</p></div></main></body></html>"""
+
+
+def test_adapter_extraction_order_does_not_matter():
+    soup = BeautifulSoup(CAIRN, "html.parser")
+    before = str(soup)
+    adapter = CairnAdapter(soup, "cairn.html")
+    content = adapter.get_content()
+    meta = adapter.extract_metadata()
+
+    other = CairnAdapter(BeautifulSoup(CAIRN, "html.parser"), "cairn.html")
+    assert other.extract_metadata() == meta
+    assert other.get_content() == content
+    assert adapter.get_content() == content
+    assert str(soup) == before
+    assert "Premier paragraphe" in content and "note de bas de page" not in content
+    assert "DOI" not in content
+
+
+def test_lemonde_content_survives_metadata():
+    html = """<html><head><meta property="og:site_name" content="Le Monde diplomatique">
+<meta property="og:description" content="Court."></head><body>
+<div class="chapo"><p>Le chapeau de l'article.</p></div>
+<div class="texte"><p>Le corps de l'article, assez long pour être lu.</p></div></body></html>"""
+    adapter = LeMondeDiplomatiqueAdapter(BeautifulSoup(html, "html.parser"), "lmd.html")
+    meta = adapter.extract_metadata()
+    assert "Le corps de l'article" in meta["description"]
+    content = adapter.get_content()
+    assert content.startswith("Le chapeau de l'article.") and "Le corps de l'article" in content
+
+
+def test_mediapart_nested_paragraphs_read_once():
+    html = """<html><head><meta property="og:site_name" content="Mediapart"></head><body>
+<div class="news__rich-text-content"><p>Début <p>milieu</p> fin</p>
+<div class="lire-aussi"><p>À lire aussi</p></div><h2>Suite</h2></div></body></html>"""
+    soup = BeautifulSoup(html, "html.parser")
+    before = str(soup)
+    adapter = MediapartAdapter(soup, "mediapart.html")
+    assert adapter.get_content().startswith("Début milieu fin.")
+    assert adapter.get_content().count("milieu") == 1 and "lire aussi" not in adapter.get_content()
+    assert str(soup) == before
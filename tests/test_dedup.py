@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Test de l'index de doublons: URL canonique, SimHash, et article corrigé ou
+réécrit à la même URL qui n'est pas un doublon.
+"""
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from library.dedup import DuplicateIndex, canonical_url, simhash
+
+
+def _random_text(rng, words=800):
+    vocabulary = [f"mot{i}" for i in range(5000)]
+    return " ".join(rng.choice(vocabulary) for _ in range(words))
+
+
+def test_canonical_url():
+    assert canonical_url("HTTP://www.Example.org/a/?utm_source=rss&b=2&a=1#top") == \
+        "https://example.org/a?a=1&b=2"
+
+
+def test_simhash_is_stable():
+    rng = random.Random(1)
+    text = _random_text(rng)
+    assert simhash(text) == simhash(text.upper() + " ")
+    assert simhash(text) != simhash(_random_text(rng))
+
+
+def test_near_duplicate_found(tmp_path):
+    rng = random.Random(2)
+    index = DuplicateIndex(str(tmp_path / "index.jsonl"))
+    original = _random_text(rng)
+    index.add("https://example.org/article", original, "article.mp3", "Article")
+    for _ in range(200):
+        index.add("", _random_text(rng), "other.mp3")
+
+    # Same article from an aggregator: no URL, a few words changed
+    copy = "Europresse. " + original.replace("mot1 ", "motX ", 3)
+    entry, similarity = index.find("", copy)
+    assert entry["mp3"] == "article.mp3"
+    assert similarity >= 0.95
+
+    assert index.find("", _random_text(rng)) is None
+
+    # The index is persisted and reloaded
+    assert len(DuplicateIndex(str(tmp_path / "index.jsonl")).entries) == 201
+
+
+def test_same_url_with_different_text_is_not_a_duplicate(tmp_path):
+    rng = random.Random(3)
+    index = DuplicateIndex(str(tmp_path / "index.jsonl"))
+    original = _random_text(rng)
+    index.add("https://example.org/article?utm_source=rss", original, "article.mp3")
+
+    entry, similarity = index.find("https://www.example.org/article", original)
+    assert entry["mp3"] == "article.mp3" and similarity == 1.0
+
+    # Rewritten article at the same URL, same length
+    assert index.find("https://example.org/article", _random_text(rng)) is None
+
+    # Texts too short to fingerprint: the URL decides
+    index.add("https://example.org/breve", "Brève courte.", "breve.mp3")
+    assert index.find("https://example.org/breve", "Brève revue.")[0]["mp3"] == "breve.mp3"
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Test du cache négatif des articles en échec: fichier ignoré sans analyse
+jusqu'à son prochain essai (délai exponentiel), remis à zéro quand son contenu
+change, puis mis en quarantaine avec un fichier expliquant pourquoi. Les
+erreurs de synthèse (panne TTS) reportent l'article sans le pénaliser.
+"""
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import html_to_mp3
+import pipeline.failures
+from pipeline import FailureCache, OutputCommitter, RunReport
+
+
+def _setup(tmp_path, **kwargs):
+    inbox = tmp_path / "inbox"
+    inbox.mkdir()
+    source = inbox / "article.html"
+    source.write_text("<html><body>court</body></html>")
+    cache = FailureCache(str(tmp_path / "failures.json"), str(tmp_path / "quarantine"), **kwargs)
+    return cache, source
+
+
+def _no_hash(path):
+    raise AssertionError("hashed an unchanged file")
+
+
+def test_failed_file_is_skipped_until_retry(tmp_path, monkeypatch):
+    cache, source = _setup(tmp_path, retry_delay=100)
+    assert cache.check(str(source)) is None
+    assert cache.record(str(source), "content too short or empty") is None
+
+    # Unchanged file: not even hashed
+    monkeypatch.setattr(pipeline.failures, "file_sha1", _no_hash)
+    assert "content too short" in cache.check(str(source))
+
+    # A new process sees the same state
+    other = FailureCache(cache.path, cache.quarantine_dir, retry_delay=100)
+    assert other.check(str(source)) is not None
+    assert other.stats() == {"skipped": 1, "failed": 0, "quarantined": 0, "pending": 1}
+
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 101)
+    assert cache.check(str(source)) is None
+
+
+def test_backoff_doubles(tmp_path):
+    cache, source = _setup(tmp_path, retry_delay=100)
+    delays = []
+    for _ in range(3):
+        before = time.time()
+        cache.record(str(source), "boom")
+        delays.append(cache.entries["article.html"]["retry_at"] - before)
+    assert [round(delay, -1) for delay in delays] == [100, 200, 400]
+
+
+def test_changed_content_is_retried(tmp_path):
+    cache, source = _setup(tmp_path)
+    cache.record(str(source), "boom")
+    source.write_text("<html><body>article complet</body></html>")
+    assert cache.check(str(source)) is None
+    assert cache.stats()["pending"] == 0
+
+
+def test_touched_file_with_same_content_stays_skipped(tmp_path):
+    cache, source = _setup(tmp_path)
+    cache.record(str(source), "boom")
+    stat = source.stat()
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 5_000_000_000))
+    assert cache.check(str(source)) is not None
+
+
+def test_quarantine_after_max_attempts(tmp_path):
+    cache, source = _setup(tmp_path, max_attempts=2, retry_delay=0)
+    files_dir = source.parent / "article_files"
+    files_dir.mkdir()
+    (files_dir / "image.jpg").write_bytes(b"jpg")
+
+    assert cache.record(str(source), "first") is None
+    target = cache.record(str(source), "second")
+    assert target == os.path.join(cache.quarantine_dir, "article.html")
+    assert not source.exists() and not files_dir.exists()
+    assert os.path.exists(os.path.join(cache.quarantine_dir, "article_files", "image.jpg"))
+
+    with open(target + ".failure.json", encoding="utf-8") as f:
+        sidecar = json.load(f)
+    assert sidecar["attempts"] == 2
+    assert sidecar["reasons"] == ["first", "second"]
+    assert cache.stats() == {"skipped": 0, "failed": 2, "quarantined": 1, "pending": 0}
+
+
+ARTICLE = {"meta": {"title": "Titre", "author": "Auteur", "media": "Média", "url": "", "date": "",
+                    "description": "", "image_url": ""},
+           "text_body": "Texte " * 20, "full_content": "Texte " * 20, "tier": "adapter",
+           "adapter": "adapters.generic", "junk": None, "cached": []}
+
+
+class FakeWorker:
+    def __init__(self, error=None):
+        self.error = error
+
+    def run(self, filepath):
+        if self.error:
+            raise self.error
+        return dict(ARTICLE, meta=dict(ARTICLE["meta"])), {"peak_rss_mb": 1}
+
+
+class FailingBackend:
+    async def synthesize(self, text, output_path):
+        raise ConnectionError("edge-tts unreachable")
+
+
+def _process(tmp_path, cache, source, worker, monkeypatch):
+    monkeypatch.setattr(html_to_mp3, "DEDUP_MODE", "off")
+    committer = OutputCommitter(str(tmp_path / "staging"), str(tmp_path), None)
+    report = RunReport()
+    asyncio.run(html_to_mp3.process_html_file(str(source), FailingBackend(), report, None, None, worker,
+                                              committer, cache, None))
+    committer.close()
+    return report.articles[-1]
+
+
+def test_tts_error_does_not_count_as_a_failure(tmp_path, monkeypatch):
+    cache, source = _setup(tmp_path, max_attempts=1)
+    for _ in range(3):
+        entry = _process(tmp_path, cache, source, FakeWorker(), monkeypatch)
+        assert entry["status"] == "deferred"
+        assert "ConnectionError" in entry["reason"]
+    assert cache.entries == {} and cache.check(str(source)) is None
+    assert source.exists()
+    assert os.listdir(tmp_path / "staging") == []
+
+
+def test_extraction_error_counts_as_a_failure(tmp_path, monkeypatch):
+    cache, source = _setup(tmp_path)
+    entry = _process(tmp_path, cache, source, FakeWorker(ValueError("no article")), monkeypatch)
+    assert entry["status"] == "failed"
+    assert cache.entries["article.html"]["attempts"] == 1
+
+
+def test_same_name_in_two_subfolders_have_separate_attempts(tmp_path):
+    inbox = tmp_path / "inbox"
+    paths = []
+    for folder in ("Politique", "Culture"):
+        (inbox / folder).mkdir(parents=True)
+        path = inbox / folder / "a.html"
+        path.write_text(f"<html><body>{folder}</body></html>")
+        paths.append(str(path))
+    cache = FailureCache(str(tmp_path / "failures.json"), str(tmp_path / "quarantine"),
+                         max_attempts=2, input_dir=str(inbox))
+
+    assert cache.record(paths[0], "boom") is None
+    assert cache.check(paths[1]) is None
+    assert cache.record(paths[1], "boom") is None  # First attempt of its own
+    assert set(cache.entries) == {os.path.join("Politique", "a.html"), os.path.join("Culture", "a.html")}
+
+    target = cache.record(paths[0], "boom")
+    assert target is not None and os.path.exists(paths[1])
+    with open(target + ".failure.json", encoding="utf-8") as f:
+        assert json.load(f)["file"] == os.path.join("Politique", "a.html")
+    cache.forget(paths[1])
+    assert cache.entries == {}
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Test de l'adapter Gemini: aplatissement des blocs imbriqués et regroupement
+du texte libre en paragraphes sans modifier l'arbre, en temps linéaire sur
+les longues conversations exportées.
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup
+
+from adapters import GeminiAdapter
+
+EXPORT = """<html><head><title>Gemini</title></head><body><div class="markdown"><h1>Titre</h1>
+Texte libre <b>en gras</b>
+<p>Un p qui contient <h2>Intertitre</h2> et du texte</p>
+<ul><li><p>Point un</p></li><li>Point deux</li></ul>
+<blockquote><p>Citation</p></blockquote>
+<h3><p>Titre imbriqué</p></h3>
+<!-- url: https://gemini.google.com/share/abc -->
+</div></body></html>"""
+
+
+def test_flatten_and_regroup():
+    soup = BeautifulSoup(EXPORT, "html.parser")
+    before = str(soup)
+    adapter = GeminiAdapter(soup, "Gemini.html")
+    content = adapter.get_content()
+    # Free text and the flattened <p> read as one paragraph; the <p> nested
+    # in the heading is read with it, not twice
+    assert content == ("Titre.. Texte libre en gras Un p qui contient. Intertitre.. et du texte. "
+                       "Point un. Point deux. Citation. Titre imbriqué..")
+    assert str(soup) == before
+
+    meta = adapter.extract_metadata()
+    assert meta["title"] == "Titre"
+    assert meta["url"] == "https://gemini.google.com/share/abc"
+    assert meta["description"] == content
+    assert adapter.get_content() == content
+
+
+def test_long_export_is_linear():
+    paragraph = "<p>Une phrase de recherche assez longue <strong>avec du gras</strong>.</p>"
+    item = "<ul><li><p>Un point de liste.</p></li></ul>"
+    body = (paragraph * 4 + item) * 1000  # 5 000 paragraphs
+    html = f'<html><body><div class="markdown">{body}</div></body></html>'
+    adapter = GeminiAdapter(BeautifulSoup(html, "html.parser"), "Gemini_long.html")
+    start = time.perf_counter()
+    content = adapter.get_content()
+    # The former flatten loop compared tags structurally: minutes at this size
+    assert time.perf_counter() - start < 3
+    assert content.count("Un point de liste.") == 1000
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Test du mode test incrémental: empreintes du code d'extraction par adapter,
+état du dernier passage et comparaison aux textes de référence.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from adapters import ADAPTERS, GenericAdapter, EuropresseAdapter, GeminiAdapter, MediapartAdapter
+from pipeline import GoldenState, adapter_fingerprints, compare_with_golden
+
+ORDER = ADAPTERS + [GenericAdapter]
+
+
+def _module_path(cls):
+    return sys.modules[cls.__module__].__file__
+
+
+def test_fingerprint_covers_adapters_tried_before(tmp_path):
+    shared = tmp_path / "normalize.py"
+    shared.write_text("A = 1\n")
+    before = adapter_fingerprints(ORDER, [str(shared)], ["source"])
+
+    assert len(set(before.values())) == len(ORDER)
+    assert before == adapter_fingerprints(ORDER, [str(shared)], ["source"])
+    # Editing the shared code invalidates every adapter
+    shared.write_text("A = 2\n")
+    after = adapter_fingerprints(ORDER, [str(shared)], ["source"])
+    assert all(before[m] != after[m] for m in before)
+    # An adapter module only affects itself and the adapters detected after it
+    paths = [str(shared), _module_path(MediapartAdapter)]
+    with_mediapart = adapter_fingerprints(ORDER, paths, ["source"])
+    assert with_mediapart[EuropresseAdapter.__module__] == after[EuropresseAdapter.__module__]
+    assert with_mediapart[GeminiAdapter.__module__] == after[GeminiAdapter.__module__]
+
+
+def test_state_freshness(tmp_path):
+    state = GoldenState(str(tmp_path / ".state.json"))
+    (tmp_path / "a.txt").write_text("texte")
+    fingerprints = {"adapters.generic": "code1"}
+    state.record("a.html", "html1", "code1", "adapters.generic", "a.txt", 0.1)
+    state.save()
+
+    state = GoldenState(str(tmp_path / ".state.json"))
+    assert state.is_fresh("a.html", "html1", fingerprints, str(tmp_path))
+    assert not state.is_fresh("a.html", "html2", fingerprints, str(tmp_path))
+    assert not state.is_fresh("a.html", "html1", {"adapters.generic": "code2"}, str(tmp_path))
+    os.remove(tmp_path / "a.txt")
+    assert not state.is_fresh("a.html", "html1", fingerprints, str(tmp_path))
+
+
+def test_compare_with_golden(tmp_path):
+    output = tmp_path / "out.txt"
+    golden = tmp_path / "golden.txt"
+    output.write_text("titre\nligne un\nligne deux\n")
+    assert compare_with_golden(str(output), str(golden))[0] == "no golden"
+    golden.write_text("titre\nligne un\nligne deux\n")
+    assert compare_with_golden(str(output), str(golden)) == ("identical", 0, 0, [])
+    golden.write_text("titre\nligne 1\n")
+    status, added, removed, diff = compare_with_golden(str(output), str(golden))
+    assert (status, added, removed) == ("changed", 2, 1)
+    assert "+ligne deux" in diff
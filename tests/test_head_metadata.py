@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Test de la table des métadonnées (<meta>, <link>, <title>, JSON-LD) construite
+une seule fois par document et partagée par les adapters.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup
+
+from adapters import get_adapter
+from adapters.head import HeadMetadata
+
+PAGE = """<html><head>
+<title>Un article | Manifesto XXI</title>
+<meta property="og:site_name" content="Manifesto XXI">
+<meta property="og:title" content="Un article - Manifesto XXI">
+<meta property="og:title" content="Second titre ignoré">
+<meta name="description" content="Résumé">
+<meta property="article:author">
+<link rel="canonical alternate" href="https://manifesto-21.com/un-article">
+<script type="application/ld+json">{"@graph": [{"@type": "Article", "author": {"name": "Camille"}}]}</script>
+<script type="application/ld+json">{not json</script>
+</head><body><article><p>Texte.</p></article></body></html>"""
+
+
+def test_lookups_follow_document_order():
+    head = HeadMetadata(BeautifulSoup(PAGE, "html.parser"))
+    assert head.meta(property="og:title") == "Un article - Manifesto XXI"
+    assert head.meta_all(property="og:title") == ["Un article - Manifesto XXI", "Second titre ignoré"]
+    assert head.meta(name="description") == "Résumé"
+    assert head.meta(property="article:author") == ""
+    assert head.meta(property="og:image") is None
+    assert head.link("canonical") == "https://manifesto-21.com/un-article"
+    assert head.title == "Un article | Manifesto XXI"
+    assert len(head.json_ld) == 1
+
+
+def test_adapter_reads_shared_table():
+    adapter = get_adapter(BeautifulSoup(PAGE, "html.parser"), "article.html")
+    assert type(adapter).__name__ == "ManifestoAdapter"
+    meta = adapter.extract_metadata()
+    assert meta["title"] == "Un article"
+    assert meta["author"] == "Camille"
+    assert meta["url"] == "https://manifesto-21.com/un-article"
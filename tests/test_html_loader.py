@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Test du chargement des fichiers HTML: lecture unique en octets (projetée en
+mémoire pour les gros fichiers), encodage tiré du BOM ou de <meta charset>,
+UTF-8 par défaut, détection sinon, et Windows-1252 plutôt que Latin-1 pour
+les exports Europresse/Word.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pipeline.loader
+from pipeline import decode_html, read_html
+
+TEXT = ("<p>L’économie française a connu « une crise » — c’était prévu… "
+        "Œuvre, cœur, être, où, déjà, garçon.</p>")
+
+
+def test_undeclared_utf8():
+    html = f"<html><body>{TEXT}</body></html>"
+    assert decode_html(html.encode("utf-8")) == (html, "utf-8", "utf-8")
+
+
+def test_bom_wins_over_meta():
+    html = f'<meta charset="windows-1252">{TEXT}'
+    assert decode_html(html.encode("utf-8-sig")) == (html, "utf-8", "bom")
+    assert decode_html(b"\xff\xfe" + html.encode("utf-16-le")) == (html, "utf-16-le", "bom")
+
+
+def test_latin1_declaration_is_read_as_windows_1252():
+    html = f'<meta http-equiv="Content-Type" content="text/html; charset=ISO-8859-1">{TEXT}'
+    text, encoding, source = decode_html(html.encode("cp1252"))
+    assert (text, encoding, source) == (html, "cp1252", "meta")
+    assert "\x92" not in text
+
+
+def test_undefined_windows_1252_bytes_do_not_fail():
+    text, encoding, _ = decode_html(b'<meta charset="iso-8859-1"><p>\x81\x92</p>')
+    assert encoding == "cp1252"
+    assert text.endswith("<p>\x81’</p>")
+
+
+def test_undeclared_windows_1252_is_detected():
+    html = "<html><body>" + TEXT * 5 + "</body></html>"
+    assert decode_html(html.encode("cp1252")) == (html, "cp1252", "detected")
+
+
+def test_wrong_utf8_declaration_falls_back_to_detection():
+    html = '<meta charset="utf-8">' + TEXT * 5
+    text, encoding, source = decode_html(html.encode("cp1252"))
+    assert (text, encoding, source) == (html, "cp1252", "detected")
+
+
+def test_large_files_are_mapped(tmp_path, monkeypatch):
+    monkeypatch.setattr(pipeline.loader, "MMAP_MIN_BYTES", 1024)
+    html = '<meta charset="windows-1252">' + TEXT * 100
+    path = tmp_path / "article.html"
+    path.write_bytes(html.encode("cp1252"))
+    assert read_html(str(path)) == html
+
+    empty = tmp_path / "empty.html"
+    empty.write_bytes(b"")
+    assert read_html(str(empty)) == ""
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Test de la découverte des fichiers d'entrée: parcours par os.scandir, sous-dossiers
+comme catégories, dossiers d'archive, de quarantaine et "_files" jamais parcourus,
+interface de générateur.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pipeline.discovery
+from pipeline import Backlog, iter_inputs
+
+
+def _tree(root):
+    for path in ("a.html", "b.HTM", "notes.txt", ".cache.html", "c.html.crdownload",
+                 "a_files/image.html", "Sciences/d.html", "Sciences/Climat/e.html",
+                 "Sciences/Climat/e_files/frame.html", "Archived/old.html", "Quarantine/bad.html"):
+        path = root / path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("<p>texte</p>")
+    for index in range(200):
+        (root / "Archived" / f"archive_{index}.html").write_text("<p>archive</p>")
+
+
+def test_categories_and_exclusions(tmp_path):
+    _tree(tmp_path)
+    found = {os.path.relpath(item.path, tmp_path): item.category
+             for item in iter_inputs(str(tmp_path), [str(tmp_path / "Archived"), str(tmp_path / "Quarantine")])}
+    assert found == {
+        "a.html": None,
+        "b.HTM": None,
+        os.path.join("Sciences", "d.html"): "Sciences",
+        os.path.join("Sciences", "Climat", "e.html"): "Sciences/Climat",
+    }
+
+
+def test_excluded_directories_are_not_listed(tmp_path, monkeypatch):
+    _tree(tmp_path)
+    listed = []
+    real_scandir = os.scandir
+
+    def scandir(path):
+        listed.append(os.path.relpath(path, tmp_path))
+        return real_scandir(path)
+
+    monkeypatch.setattr(pipeline.discovery.os, "scandir", scandir)
+    list(iter_inputs(str(tmp_path), [str(tmp_path / "Archived"), str(tmp_path / "Quarantine")]))
+    assert sorted(listed) == [".", "Sciences", os.path.join("Sciences", "Climat")]
+
+
+def test_not_recursive_and_lazy(tmp_path):
+    _tree(tmp_path)
+    assert sorted(item.name for item in iter_inputs(str(tmp_path), recursive=False)) == ["a.html", "b.HTM"]
+    first = next(iter_inputs(str(tmp_path)))
+    assert first.stat.st_size == len("<p>texte</p>")
+
+
+def test_backlog_items_carry_their_category(tmp_path):
+    _tree(tmp_path)
+    priority_dir = tmp_path / "Prioritaire"
+    (priority_dir / "Politique").mkdir(parents=True)
+    (priority_dir / "Politique" / "f.html").write_text("<p>urgent</p>")
+    backlog = Backlog(str(tmp_path), str(priority_dir),
+                      exclude=[str(tmp_path / "Archived"), str(tmp_path / "Quarantine")])
+    items = {item.name: item for item in backlog.scan()}
+    assert sorted(items) == ["a.html", "b.HTM", "d.html", "e.html", "f.html"]
+    assert (items["f.html"].priority, items["f.html"].category) == (True, "Politique")
+    assert (items["e.html"].priority, items["e.html"].category) == (False, "Sciences/Climat")
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Test du nettoyage compilé des adapters: balises, sélecteurs et éléments
+masqués retirés en un seul parcours, avec le même résultat que les boucles
+select() qu'il remplace.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup
+
+from adapters import LMSIAdapter
+from adapters.junk import JunkFilter, is_hidden
+
+PAGE = """<div id="c">
+<p>Garder ce paragraphe.</p>
+<script>var x;</script>
+<div class="share x"><p>Partager</p></div>
+<div class="cartouche"><h1>Titre doublé</h1><p>Chapeau gardé.</p></div>
+<div style="DISPLAY:none"><p>Bloc caché dupliqué.</p></div>
+<p hidden>Aussi caché.</p>
+<section><div class="notes"><p>Une note.</p><span class="share">x</span></div><p>Fin.</p></section>
+</div>"""
+
+SELECTORS = [".share", ".notes", ".cartouche h1"]
+
+
+def _texts(container):
+    return [p.get_text() for p in container.find_all("p")]
+
+
+def test_single_walk_matches_sequential_removal():
+    junk_filter = JunkFilter(tags=["script"], selectors=SELECTORS, hidden=False)
+    container = BeautifulSoup(PAGE, "html.parser").div
+    stats = junk_filter.remove(container)
+
+    expected = BeautifulSoup(PAGE, "html.parser").div
+    for element in expected(["script"]):
+        element.extract()
+    for selector in SELECTORS:
+        for element in expected.select(selector):
+            element.extract()
+
+    assert str(container) == str(expected)
+    assert stats["removed"] == 4  # script, .share, .cartouche h1, .notes (with its .share)
+    assert stats["nodes"] == 7
+    assert stats["hidden"] == 0
+
+
+def test_hidden_elements_are_pruned():
+    container = BeautifulSoup(PAGE, "html.parser").div
+    stats = JunkFilter(tags=["script"], selectors=SELECTORS).remove(container)
+    assert _texts(container) == ["Garder ce paragraphe.", "Chapeau gardé.", "Fin."]
+    assert stats["hidden"] == 2
+    assert is_hidden(BeautifulSoup('<p style="color: red; display : none">', "html.parser").p)
+    assert not is_hidden(BeautifulSoup('<p style="display: block">', "html.parser").p)
+
+
+def test_adapter_records_junk_stats():
+    html = f"""<html><head><meta property="og:site_name" content="lmsi.net"></head><body>
+<div class="contenu-principal"><p>Un paragraphe de l'article assez long pour être gardé.</p>
+<div class="notes"><p>Une note de bas de page assez longue pour compter.</p></div>
+<p style="display:none">Un paragraphe masqué assez long pour être lu.</p></div></body></html>"""
+    adapter = LMSIAdapter(BeautifulSoup(html, "html.parser"), "article.html")
+    content = adapter.get_content()
+    assert "note" not in content and "masqué" not in content
+    assert adapter.junk_stats["removed"] == 2
+    assert adapter.junk_stats["hidden"] == 1
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Test des baux de réservation des fichiers d'entrée: un seul propriétaire
+par fichier, renouvellement, reprise des baux expirés, répartition sans
+doublon entre plusieurs processus, baux par chemin relatif, et épisode
+abandonné quand le bail a été perdu avant sa publication.
+"""
+import asyncio
+import functools
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import html_to_mp3
+from pipeline import FailureCache, LeaseManager, OutputCommitter, RunReport
+
+
+def _age(lease_path, seconds):
+    with open(lease_path, encoding="utf-8") as f:
+        record = json.load(f)
+    record["renewed"] -= seconds
+    with open(lease_path, "w", encoding="utf-8") as f:
+        json.dump(record, f)
+
+
+def test_claim_is_exclusive_until_released(tmp_path):
+    first = LeaseManager(str(tmp_path), ttl=60)
+    second = LeaseManager(str(tmp_path), ttl=60)
+    lease = first.claim("article.html")
+    assert lease is not None
+    assert second.claim("article.html") is None
+
+    second.release(lease)  # Not its lease: kept
+    assert second.claim("article.html") is None
+    first.release(lease)
+    assert second.claim("article.html") is not None
+    assert first.stats()["claimed"] == 1 and second.stats()["busy"] == 2
+
+
+def test_stale_lease_is_reclaimed_and_owner_notices(tmp_path):
+    dead = LeaseManager(str(tmp_path), ttl=60)
+    lease = dead.claim("article.html")
+    _age(lease.path, 120)
+
+    alive = LeaseManager(str(tmp_path), ttl=60)
+    taken = alive.claim("article.html")
+    assert taken is not None
+    assert alive.stats()["reclaimed"] == 1
+
+    # The former owner finds out at its next heartbeat and does not remove the new lease
+    assert not dead.renew(lease)
+    dead.release(lease)
+    assert os.path.exists(taken.path)
+    assert [name for name in os.listdir(tmp_path)] == ["article.html.lease"]
+
+
+def test_heartbeat_keeps_lease_fresh(tmp_path):
+    manager = LeaseManager(str(tmp_path), ttl=60, heartbeat=0.01)
+    lease = manager.claim("article.html")
+    _age(lease.path, 120)
+
+    async def run():
+        task = asyncio.create_task(manager.keep_alive(lease))
+        await asyncio.sleep(0.05)
+        task.cancel()
+
+    asyncio.run(run())
+    assert LeaseManager(str(tmp_path), ttl=60).claim("article.html") is None
+
+
+def _drain(lease_dir, names):
+    manager = LeaseManager(lease_dir, ttl=60)
+    return [name for name in names if manager.claim(name) is not None]
+
+
+def test_concurrent_processes_share_files_without_duplicates(tmp_path):
+    names = [f"article-{i}.html" for i in range(200)]
+    with ProcessPoolExecutor(max_workers=4) as pool:
+        claimed = [name for result in pool.map(_drain, [str(tmp_path)] * 4, [names] * 4) for name in result]
+    assert sorted(claimed) == sorted(names)
+
+
+def test_concurrent_reclaim_of_stale_leases_has_one_winner(tmp_path):
+    names = [f"article-{i}.html" for i in range(100)]
+    dead = LeaseManager(str(tmp_path), ttl=60)
+    for name in names:
+        _age(dead.claim(name).path, 120)
+    with ProcessPoolExecutor(max_workers=4) as pool:
+        claimed = [name for result in pool.map(_drain, [str(tmp_path)] * 4, [names] * 4) for name in result]
+    assert sorted(claimed) == sorted(names)
+
+
+def test_same_name_in_two_subfolders_are_distinct_files(tmp_path):
+    manager = LeaseManager(str(tmp_path), ttl=60)
+    assert manager.claim(os.path.join("Politique", "a.html")) is not None
+    assert manager.claim(os.path.join("Culture", "a.html")) is not None
+    assert manager.claim("a.html") is not None
+    assert manager.claim(os.path.join("Culture", "a.html")) is None
+
+
+class FramesBackend:
+    async def synthesize(self, text, mp3_path):
+        with open(mp3_path, "wb") as f:
+            f.write(b"\xff\xfb\x90\x00" + b"\x00" * 413)  # One MPEG frame
+
+
+class ArticleWorker:
+    def run(self, filepath):
+        meta = {"title": "Titre", "author": "Auteur", "media": "Média", "url": "", "date": "",
+                "description": "", "image_url": ""}
+        return ({"meta": meta, "text_body": "Texte " * 20, "full_content": "Texte " * 20, "tier": "adapter",
+                 "adapter": "adapters.generic", "junk": None, "cached": []}, {"peak_rss_mb": 1})
+
+
+def test_episode_is_dropped_when_the_lease_was_lost(tmp_path, monkeypatch):
+    monkeypatch.setattr(html_to_mp3, "DEDUP_MODE", "off")
+    inbox, output = tmp_path / "inbox", tmp_path / "output"
+    inbox.mkdir()
+    output.mkdir()
+    source = inbox / "article.html"
+    source.write_text("<html></html>")
+
+    mine = LeaseManager(str(tmp_path / "leases"), ttl=60)
+    lease = mine.claim("article.html")
+    _age(lease.path, 120)
+    assert LeaseManager(str(tmp_path / "leases"), ttl=60).claim("article.html") is not None  # Reclaimed
+
+    committer = OutputCommitter(str(tmp_path / "staging"), str(output), None)
+    failures = FailureCache(str(tmp_path / "failures.json"), str(tmp_path / "quarantine"))
+    report = RunReport()
+    asyncio.run(html_to_mp3.process_html_file(str(source), FramesBackend(), report, None, None, ArticleWorker(),
+                                              committer, failures, None,
+                                              owns_input=functools.partial(mine.renew, lease)))
+    assert lease.lost
+    assert report.articles == [{"file": "article.html", "status": "skipped",
+                                "reason": "lease lost before publication"}]
+    assert os.listdir(output) == [] and os.listdir(committer.staging_dir) == []
+    assert source.exists()  # Left to the new owner
+    assert failures.entries == {}
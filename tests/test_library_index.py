@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Test de la bibliothèque: durée des MP3 par lecture des en-têtes de trames,
+index des épisodes (journal des ajouts, rechargement, compactage) et flux
+podcast paginé (RFC 5005) dont seules les pages modifiées sont réécrites.
+"""
+import os
+import sys
+import xml.etree.ElementTree as ET
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from library import LibraryIndex, scan_mp3, write_feed
+
+# MPEG-1 Layer III, 128 kbit/s, 44.1 kHz: 417-byte frames of 1152 samples
+FRAME = b"\xff\xfb\x90\x00" + b"\x00" * 413
+# MPEG-2 Layer III, 64 kbit/s, 22.05 kHz: 208-byte frames of 576 samples
+FRAME_MPEG2 = b"\xff\xf3\x80\x00" + b"\x00" * 204
+ID3V2 = b"ID3\x04\x00\x00\x00\x00\x00\x0a" + b"\x00" * 10
+ID3V1 = b"TAG" + b"\x00" * 125
+ATOM = "{http://www.w3.org/2005/Atom}"
+
+
+def _mp3(tmp_path, data, name="episode.mp3"):
+    path = tmp_path / name
+    path.write_bytes(data)
+    return str(path)
+
+
+@pytest.mark.parametrize("data, frames, duration", [
+    (FRAME * 40, 40, 40 * 1152 / 44100),
+    (ID3V2 + FRAME * 10 + ID3V1, 10, 10 * 1152 / 44100),
+    (FRAME_MPEG2 * 25, 25, 25 * 576 / 22050),
+    (FRAME * 5 + b"garbage\xff\x00" + FRAME * 5, 10, 10 * 1152 / 44100),  # Sync lost, then found again
+    (b"", 0, 0.0),
+    (b"not an mp3 at all" * 10, 0, 0.0),
+])
+def test_scan_mp3_counts_frames(tmp_path, data, frames, duration):
+    info = scan_mp3(_mp3(tmp_path, data))
+    assert info["frames"] == frames
+    assert info["duration"] == pytest.approx(duration, abs=1e-3)
+    assert info["size"] == len(data)
+
+
+def test_truncated_last_frame_is_not_counted(tmp_path):
+    assert scan_mp3(_mp3(tmp_path, FRAME * 3 + FRAME[:100]))["frames"] == 3
+
+
+META = {"title": "Titre", "author": "Auteur", "media": "Média", "date": "2024", "url": "https://example.org/a",
+        "description": "Résumé", "category": "Politique"}
+
+
+def test_index_logs_updates_and_reloads(tmp_path):
+    path = str(tmp_path / "library.json")
+    index = LibraryIndex(path)
+    mp3 = _mp3(tmp_path, FRAME * 40)
+    index.add(mp3, META, image_data=b"cover", source="a.html")
+    assert not os.path.exists(path)  # Appended to the log, not rewritten
+    with open(index.log_path, encoding="utf-8") as f:
+        assert len(f.readlines()) == 1
+
+    reloaded = LibraryIndex(path)
+    entry = reloaded.episodes["episode.mp3"]
+    assert entry["title"] == "Titre" and entry["category"] == "Politique" and entry["source"] == "a.html"
+    assert entry["duration"] == pytest.approx(40 * 1152 / 44100, abs=1e-3)
+
+    # Retagged without cover nor source: both are kept, as is the date added
+    reloaded.add(mp3, dict(META, title="Nouveau titre", category=""))
+    again = LibraryIndex(path).episodes["episode.mp3"]
+    assert again["title"] == "Nouveau titre"
+    assert again["cover_hash"] == entry["cover_hash"] != ""
+    assert again["source"] == "a.html" and again["category"] == "Politique"
+    assert again["added"] == entry["added"]
+
+    # save() compacts the log into the index
+    reloaded.save()
+    assert not os.path.exists(reloaded.log_path)
+    assert LibraryIndex(path).episodes == reloaded.episodes
+
+
+def test_index_compacts_every_n_updates(tmp_path, monkeypatch):
+    monkeypatch.setattr(LibraryIndex, "COMPACT_EVERY", 3)
+    path = str(tmp_path / "library.json")
+    index = LibraryIndex(path)
+    for i in range(5):
+        index.add(_mp3(tmp_path, FRAME, f"{i}.mp3"), META)
+    assert os.path.exists(path) and index.logged == 1
+    assert sorted(LibraryIndex(path).episodes) == [f"{i}.mp3" for i in range(5)]
+
+
+def _library(tmp_path, count):
+    index = LibraryIndex(str(tmp_path / "library.json"))
+    for i in range(count):
+        index.episodes[f"{i:03d}.mp3"] = {"title": f"Épisode {i}", "added": 1_700_000_000 + i,
+                                          "size": 1000, "duration": 60}
+    return index
+
+
+def _page(output, name):
+    channel = ET.parse(output / name).getroot().find("channel")
+    links = {link.get("rel"): link.get("href").rsplit("/", 1)[-1] for link in channel.iter(f"{ATOM}link")}
+    guids = [item.find("guid").text for item in channel.iter("item")]
+    return links, guids
+
+
+def test_feed_is_paginated_as_archived_feeds(tmp_path):
+    output = tmp_path / "output"
+    output.mkdir()
+    index = _library(tmp_path, 250)
+    assert write_feed(index, str(output), "https://example.org/podcast", page_size=100) == 3
+    assert sorted(os.listdir(output)) == ["feed-archive-1.xml", "feed-archive-2.xml", "feed.xml"]
+
+    links, guids = _page(output, "feed.xml")
+    assert links == {"self": "feed.xml", "prev-archive": "feed-archive-2.xml"}
+    assert len(guids) == 100 and guids[0] == "249.mp3"  # Newest first
+    links, guids = _page(output, "feed-archive-1.xml")
+    assert links == {"current": "feed.xml", "self": "feed-archive-1.xml", "next-archive": "feed-archive-2.xml"}
+    assert guids[0] == "099.mp3" and guids[-1] == "000.mp3"
+    links, _ = _page(output, "feed-archive-2.xml")
+    assert links["prev-archive"] == "feed-archive-1.xml" and "next-archive" not in links
+
+
+def test_feed_rewrites_only_changed_pages(tmp_path):
+    output = tmp_path / "output"
+    output.mkdir()
+    index = _library(tmp_path, 250)
+    write_feed(index, str(output), "https://example.org/podcast", page_size=100)
+    assert write_feed(index, str(output), "https://example.org/podcast", page_size=100) == 0
+
+    # A new episode only changes the current page
+    archives = {name: (output / name).stat().st_mtime_ns for name in ("feed-archive-1.xml", "feed-archive-2.xml")}
+    index.episodes["250.mp3"] = {"title": "Nouveau", "added": 1_800_000_000, "size": 1000, "duration": 60}
+    assert write_feed(index, str(output), "https://example.org/podcast", page_size=100) == 1
+    assert {name: (output / name).stat().st_mtime_ns for name in archives} == archives
+    assert _page(output, "feed.xml")[1][0] == "250.mp3"
+
+    # The page hashes are kept in the index between runs
+    reloaded = LibraryIndex(index.path)
+    assert write_feed(reloaded, str(output), "https://example.org/podcast", page_size=100) == 0
+
+    # Episodes deleted: the archive page that no longer exists is removed
+    for name in [f"{i:03d}.mp3" for i in range(60)]:
+        del reloaded.episodes[name]
+    write_feed(reloaded, str(output), "https://example.org/podcast", page_size=100)
+    assert "feed-archive-2.xml" not in os.listdir(output)
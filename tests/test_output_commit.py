@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Test de la publication transactionnelle des épisodes: préparation hors du
+dossier synchronisé, vérification des trames, renommage atomique puis
+archivage, et reprise au démarrage des publications interrompues par les
+seuls processus morts.
+"""
+import errno
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pipeline import OutputCommitter, VerificationError
+
+# MPEG-1 Layer III, 128 kbit/s, 44.1 kHz: 417-byte frames of 1152 samples
+FRAME = b"\xff\xfb\x90\x00" + b"\x00" * 413
+
+
+def _archiver(archive):
+    def archive_source(path, mp3_name):
+        target = archive / os.path.basename(path)
+        os.replace(path, target)
+        return str(target)
+    return archive_source
+
+
+def _setup(tmp_path):
+    staging, output, inbox, archive = (tmp_path / name for name in ("staging", "output", "inbox", "archive"))
+    for directory in (output, inbox, archive):
+        directory.mkdir()
+    source = inbox / "article.html"
+    source.write_text("<html></html>")
+    return OutputCommitter(str(staging), str(output), _archiver(archive)), source, output, archive
+
+
+def _restarted(committer):
+    """Simulates the death of committer's process (its lock is dropped, its files stay) and a new run."""
+    committer._lock.close()
+    return OutputCommitter(committer.staging_root, committer.output_dir, committer.archive)
+
+
+def _staged(committer, frames=40):
+    path = committer.stage_path()
+    with open(path, "wb") as f:
+        f.write(FRAME * frames)
+    return path
+
+
+def test_commit_publishes_then_archives(tmp_path):
+    committer, source, output, archive = _setup(tmp_path)
+    staged = _staged(committer)
+    assert committer.verify(staged)["frames"] == 40
+
+    entry = committer.commit(staged, "Titre.mp3", str(source), record={"meta": {"title": "Titre"}})
+    assert os.listdir(output) == ["Titre.mp3"]
+    assert entry["mp3_path"] == str(output / "Titre.mp3")
+    assert entry["archive"] == str(archive / "article.html")
+    assert not source.exists() and not os.path.exists(staged)
+
+    # The journal is kept until the episode has been indexed
+    assert os.listdir(committer.staging_dir) == [os.path.basename(staged)[:-4] + ".json"]
+    committer.finish(entry)
+    assert os.listdir(committer.staging_dir) == []
+    committer.close()
+    assert os.listdir(committer.staging_root) == []
+
+
+def test_verification_rejects_empty_audio(tmp_path):
+    committer, _, _, _ = _setup(tmp_path)
+    with pytest.raises(VerificationError):
+        committer.verify(_staged(committer, frames=0))
+
+
+def test_cross_device_commit_goes_through_hidden_part(tmp_path, monkeypatch):
+    committer, source, output, _ = _setup(tmp_path)
+    staged = _staged(committer)
+    real_replace = os.replace
+    renamed = []
+
+    def replace(src, dst):
+        if src == staged:
+            raise OSError(errno.EXDEV, "Invalid cross-device link")
+        renamed.append(os.path.basename(src))
+        real_replace(src, dst)
+
+    monkeypatch.setattr(os, "replace", replace)
+    committer.commit(staged, "Titre.mp3", str(source))
+    assert ".Titre.mp3.part" in renamed
+    assert os.listdir(output) == ["Titre.mp3"]
+    assert not os.path.exists(staged)
+
+
+def _crashed_commit(committer, source, state):
+    """Leaves the journal of a commit interrupted right after reaching `state`."""
+    staged = _staged(committer)
+    entry = {"state": "staged", "staged": staged, "mp3": "Titre.mp3",
+             "part": os.path.join(committer.output_dir, ".Titre.mp3.part"),
+             "source": str(source), "archive": None, "record": None}
+    committer._write_journal(entry)
+    if state == "published":
+        committer._publish(entry)
+    elif state == "lost":
+        os.remove(staged)
+    return staged
+
+
+@pytest.mark.parametrize("state", ["staged", "published"])
+def test_recovery_completes_interrupted_commits(tmp_path, state):
+    crashed, source, output, archive = _setup(tmp_path)
+    _crashed_commit(crashed, source, state)
+    orphan = _staged(crashed)  # Crash during synthesis: no journal
+    committer = _restarted(crashed)
+
+    completed = committer.recover()
+    assert [entry["mp3"] for entry in completed] == ["Titre.mp3"]
+    assert os.listdir(output) == ["Titre.mp3"]
+    assert os.listdir(archive) == ["article.html"]
+    assert not os.path.exists(orphan)
+    # The journal was moved into the staging directory of the new process
+    assert not os.path.exists(crashed.staging_dir)
+    committer.finish(completed[0])
+    assert os.listdir(committer.staging_dir) == []
+
+
+def test_recovery_rolls_back_lost_staged_file(tmp_path):
+    crashed, source, output, _ = _setup(tmp_path)
+    _crashed_commit(crashed, source, "lost")
+    committer = _restarted(crashed)
+    assert committer.recover() == []
+    assert os.listdir(output) == []
+    assert source.exists()  # Processed again on this run
+    assert os.listdir(committer.staging_dir) == []
+
+
+def test_journal_is_valid_json_at_each_step(tmp_path):
+    committer, source, _, _ = _setup(tmp_path)
+    staged = _staged(committer)
+    committer.commit(staged, "Titre.mp3", str(source))
+    with open(os.path.splitext(staged)[0] + ".json", encoding="utf-8") as f:
+        assert json.load(f)["state"] == "archived"
+
+
+def test_recovery_leaves_running_processes_alone(tmp_path):
+    first, source, output, archive = _setup(tmp_path)
+    second = OutputCommitter(first.staging_root, first.output_dir, first.archive)
+    assert first.staging_dir != second.staging_dir
+
+    # First process between synthesis and commit (no journal yet) while the second starts
+    staged = _staged(first)
+    _crashed_commit(first, source, "staged")
+    assert second.recover() == []
+    assert os.path.exists(staged)
+    assert os.listdir(output) == []
+
+    entry = first.commit(staged, "Autre.mp3", str(source))
+    assert os.path.exists(entry["mp3_path"])
+    first.finish(entry)
+
+
+def test_recovery_skips_other_hosts(tmp_path):
+    crashed, source, output, _ = _setup(tmp_path)
+    _crashed_commit(crashed, source, "staged")
+    committer = _restarted(crashed)
+    committer.host = "autre-machine"  # Its lock cannot tell whether the owner is alive
+    assert committer.recover() == []
+    assert os.path.isdir(crashed.staging_dir)
+    assert os.listdir(output) == []
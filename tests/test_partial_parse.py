@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Test de l'analyse partielle des gros documents: seuls les métadonnées et les
+conteneurs déclarés par les adapters sont construits, avec repli sur l'analyse
+complète quand le conteneur est absent.
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup
+
+import adapters
+from adapters import get_adapter, parse_article
+from adapters.partial import ContainerStrainer
+
+HEAD = """<head><title>{title}</title>
+<meta property="og:title" content="Un article">
+<meta property="og:url" content="{url}">
+<script type="application/ld+json">{{"@type": "Article"}}</script>
+<script>var ignored = 1;</script></head>"""
+
+NOISE = '<div class="nav"><ul><li><a href="/a">Menu</a></li></ul><p>Pied de page sans intérêt.</p></div>'
+
+PAGES = {
+    "europresse.html": f"""<html>{HEAD.format(title="Europresse.com", url="")}<body>{NOISE}
+<div class="titreArticleVisu">Le titre</div><div class="DocPublicationName">Le Monde</div>
+<div class="DocText"><div><p>Premier paragraphe de l'article.</p><h2>Intertitre</h2>
+<div><p>Second paragraphe de l'article.</p></div></div></div>{NOISE}</body></html>""",
+    "cairn.html": f"""<html>{HEAD.format(title="x", url="https://www.cairn.info/a")}<body>{NOISE}
+<main class="main-content"><p>Jean Dupont</p><p>Un long paragraphe de l'article, assez long pour être gardé.</p></main>
+{NOISE}</body></html>""",
+    "lmsi.html": f"""<html>{HEAD.format(title="x", url="https://lmsi.net/a")}<body>{NOISE}<h1>Titre</h1>
+<span class="vcard author">par Alice</span><div class="contenu-principal">
+<p>Un paragraphe de l'article assez long.</p><div class="notes"><p>Une note.</p></div></div></body></html>""",
+}
+
+
+@pytest.fixture
+def always_partial(monkeypatch):
+    monkeypatch.setattr(adapters, "PARTIAL_PARSE_MIN_CHARS", 0)
+
+
+def test_strainer_keeps_head_and_declared_containers():
+    strainer = ContainerStrainer(["div.DocText, section.doc-content", ".vcard.author", "[data-x] p"])
+    soup = BeautifulSoup(PAGES["europresse.html"], "html.parser", parse_only=strainer)
+    assert [tag.name for tag in soup.find_all(recursive=False)] == ["title", "meta", "meta", "script", "div"]
+    assert soup.select_one("div.DocText h2").get_text() == "Intertitre"
+    assert "Menu" not in soup.get_text()
+
+
+@pytest.mark.parametrize("filename", sorted(PAGES))
+def test_partial_parse_matches_full_parse(always_partial, filename):
+    full = get_adapter(BeautifulSoup(PAGES[filename], "html.parser"), filename)
+    partial = parse_article(PAGES[filename], filename)
+    assert type(partial) is type(full)
+    assert partial.soup.find("div", class_="nav") is None
+    assert partial.extract_metadata() == full.extract_metadata()
+    assert partial.get_content() == full.get_content()
+
+
+def test_missing_container_falls_back_to_full_parse(always_partial):
+    html = PAGES["cairn.html"].replace("main", "section")
+    adapter = parse_article(html, "cairn.html")
+    assert adapter.soup.find("div", class_="nav") is not None
+    assert adapter.get_content()
+
+
+def test_small_documents_are_parsed_in_full():
+    adapter = parse_article(PAGES["lmsi.html"], "lmsi.html")
+    assert adapter.soup.find("div", class_="nav") is not None
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Test de l'extraction Reader Mode par paliers: passe rapide pour les pages
+propres, passe complète quand le score de qualité est trop bas, densité de
+liens pénalisée de la même façon dans les deux passes.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup
+
+from adapters import get_adapter
+from adapters.reader_mode import (QUALITY_THRESHOLD, _extract_fast, _extract_full, content_quality,
+                                  reader_extract_with_tier)
+
+SENTENCE = "Une phrase de contenu assez longue pour être comptée comme du texte. "
+
+
+def _blog_page():
+    paragraphs = "".join(f"<p>Paragraphe {i}. {SENTENCE * 6}</p>" for i in range(8))
+    menu = "".join(f"<a href='/{i}'>Menu {i}</a>" for i in range(30))
+    return f"<html><head><title>Blog</title></head><body><nav>{menu}</nav><article><h1>Un billet</h1>{paragraphs}</article></body></html>"
+
+
+def _div_page():
+    # No <p> nor <article>: the precision pass finds nothing, the fallback extractors do
+    blocks = "".join(f"<div>Paragraphe {i}. {SENTENCE * 4}</div>" for i in range(6))
+    return f"<html><body>{blocks}</body></html>"
+
+
+def _related_links_page():
+    paragraphs = "".join(f"<p>Paragraphe {i}. {SENTENCE * 3}</p>" for i in range(2))
+    related = "".join(f"<p>Voir aussi : <a href='/{i}'>Un autre article très intéressant numéro {i}</a></p>"
+                      for i in range(30))
+    return f"<html><head><title>Liens</title></head><body><article>{paragraphs}{related}</article></body></html>"
+
+
+def test_content_quality():
+    text = "\n\n".join([SENTENCE * 6] * 4)
+    assert content_quality(text) == 1.0
+    assert content_quality(text, link_chars=len(text) // 2) == 0.5
+    assert content_quality(SENTENCE) < 0.1
+    assert content_quality("") == 0.0
+
+
+def test_clean_blog_uses_fast_tier():
+    text, tier, score = reader_extract_with_tier(_blog_page())
+    assert tier == "fast"
+    assert score >= 0.5
+    assert "Paragraphe 7" in text
+    assert "Menu 3" not in text
+
+
+def test_poor_page_escalates_to_full_tier():
+    text, tier, score = reader_extract_with_tier(_div_page())
+    assert tier == "full"
+    assert score >= 0.5
+    assert "Paragraphe 5" in text
+
+
+def test_link_density_is_penalized_in_both_tiers():
+    page = _related_links_page()
+    fast_text, fast_score = _extract_fast(page)
+    full_text, full_score = _extract_full(page)
+    assert fast_text == full_text
+    assert fast_score == full_score < QUALITY_THRESHOLD
+    # Same text, same score: the full pass does not take over with an inflated score
+    text, tier, score = reader_extract_with_tier(page)
+    assert tier == "fast"
+    assert score == round(fast_score, 2)
+
+
+def test_adapter_records_tier():
+    adapter = get_adapter(BeautifulSoup(_blog_page(), "html.parser"), "blog.html")
+    adapter.get_content()
+    assert adapter.extraction_tier == "fast"
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Test du mode retag: les tags ID3 des MP3 existants sont réécrits depuis les
+HTML archivés correspondants, sans synthèse vocale et sans toucher à l'audio.
+"""
+import json
+import os
+import sys
+
+from mutagen.id3 import ID3, TIT2
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import html_to_mp3
+import synthesis
+
+FRAME = b"\xff\xfb\x90\x00" + b"\x00" * 413
+
+
+def _page(title):
+    return ("<html><head><meta charset='utf-8'><title>" + title + "</title>"
+            "<meta property='og:url' content='https://example.org/" + title.lower() + "'></head>"
+            "<body><article>" + "<p>Un paragraphe de l'article archivé.</p>" * 5 + "</article></body></html>")
+
+
+def _setup(tmp_path, monkeypatch):
+    dirs = {name: tmp_path / name for name in ("inbox", "output", "archive", "state")}
+    for directory in dirs.values():
+        directory.mkdir()
+    monkeypatch.setattr(html_to_mp3, "OUTPUT_DIR", str(dirs["output"]))
+    monkeypatch.setattr(html_to_mp3, "ARCHIVE_DIR", str(dirs["archive"]))
+    monkeypatch.setattr(html_to_mp3, "STATE_DIR", str(dirs["state"]))
+    monkeypatch.setattr(html_to_mp3, "FEED_BASE_URL", "")
+    monkeypatch.setattr(html_to_mp3, "_archive_store", None)
+
+    def no_synthesis(*args, **kwargs):
+        raise AssertionError("retag must not synthesize")
+
+    monkeypatch.setattr(html_to_mp3, "get_backend", no_synthesis)
+    monkeypatch.setattr(synthesis.TTSScheduler, "synthesize", no_synthesis)
+    return dirs
+
+
+def _episode(output, name, title):
+    path = output / name
+    path.write_bytes(FRAME * 20)
+    tags = ID3()
+    tags.add(TIT2(encoding=3, text=title))
+    tags.save(str(path))
+    return path
+
+
+def _audio(path):
+    data = path.read_bytes()
+    return data[data.index(FRAME):]
+
+
+def test_retag_rewrites_tags_of_the_matching_mp3_only(tmp_path, monkeypatch):
+    dirs = _setup(tmp_path, monkeypatch)
+    matched = _episode(dirs["output"], "Ancien_titre.mp3", "Ancien titre")
+    other = _episode(dirs["output"], "Autre.mp3", "Autre")
+    audio = _audio(matched)
+
+    source = dirs["inbox"] / "article.html"
+    source.write_text(_page("Corrigé"), encoding="utf-8")
+    html_to_mp3.archive_input(str(source), "Ancien_titre.mp3")
+    orphan = dirs["inbox"] / "orphelin.html"
+    orphan.write_text(_page("Orphelin"), encoding="utf-8")
+    html_to_mp3.archive_input(str(orphan))
+
+    html_to_mp3.main_retag(workers=1)
+
+    assert str(ID3(str(matched))["TIT2"]) == "Corrigé"
+    assert _audio(matched) == audio  # Same frames: only the tag was rewritten
+    assert str(ID3(str(other))["TIT2"]) == "Autre"
+    assert sorted(os.listdir(dirs["output"])) == ["Ancien_titre.mp3", "Autre.mp3"]
+
+    # The library index records the new metadata and the archived source
+    index = html_to_mp3.LibraryIndex(os.path.join(dirs["state"], "library.json"))
+    assert index.episodes["Ancien_titre.mp3"]["title"] == "Corrigé"
+    assert index.episodes["Ancien_titre.mp3"]["source"] == "article.html"
+
+    with open(os.path.join(dirs["state"], "last_retag.json"), encoding="utf-8") as f:
+        statuses = {entry["file"]: entry["status"] for entry in json.load(f)["entries"]}
+    assert statuses == {"article.html": "done", "orphelin.html": "skipped"}
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Fuzz de la normalisation du texte: chaque étape doit rester linéaire, même
+sur des entrées construites pour faire revenir en arrière les expressions
+régulières (tableaux aplatis, blocs de code, préfixes répétés sans point).
+"""
+import os
+import random
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from normalization import NORMALIZATION_STAGES, normalize_text
+from normalization.cleaning import CLEANING_STAGES
+
+# Time budget of any single stage, per KB of input (generous for slow CI boxes:
+# the quadratic versions took seconds on these inputs)
+STAGE_BUDGET_PER_KB = 0.005
+INPUT_KB = 64
+
+FRAGMENTS = [
+    "client·e·s", "citoyen·ne·s", "lecteur·rice·s", "chacun·e", "celleux", "iels",
+    "Paru dans", "Dupont, A. (2020). ", "Dupont, A. & ", "Presses", "Seuil",
+    "https://example.org/a", "www.example.org", "doi: 10.1/2", "[12]", "mot1.",
+    "CC BY-NC", "Le texte seul est utilisable sous licence", "[En ligne]",
+    "mis en ligne le 3 mai", "consulté le 12 mai", "URL :", ". 1 Note de bas de page",
+    "...", "·", "-", ".", ",", "(", ")", " ", "  ", "\n", "Abc", "e", "s",
+]
+
+
+def _repeat(unit, size):
+    return (unit * (size // len(unit) + 1))[:size]
+
+
+def _adversarial_inputs(seed=0, size=INPUT_KB * 1024):
+    rng = random.Random(seed)
+    yield "long word", "".join(rng.choice("abcdefghijklmnopqrstuvwxyz0123456789") for _ in range(size))
+    yield "separator chain", _repeat("a·", size)
+    yield "dotted identifiers", _repeat("ab.cd-ef", size)
+    for prefix in ["Paru dans ", "[En ligne] ", "mis en ligne le ", "consulté le 1 ",
+                   "Le texte seul est utilisable sous licence ", "Référence électronique "]:
+        yield f"repeated '{prefix.strip()}'", _repeat(prefix, size)
+    yield "author list without year", _repeat("Dupont, A. & ", size)
+    yield "references without dot", "Dupont, A. (2020). " + _repeat("Titre sans point ", size)
+    yield "numbered notes", _repeat(". 1 Aaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa", size)
+    yield "whitespace", _repeat(" \n\t", size)
+    yield "punctuation", _repeat(".,;:!? ", size)
+    yield "random fragments", "".join(rng.choice(FRAGMENTS) for _ in range(size // 8))
+
+
+@pytest.mark.parametrize("name,text", list(_adversarial_inputs()))
+def test_every_stage_is_within_time_budget(name, text):
+    budget = STAGE_BUDGET_PER_KB * len(text) / 1024
+    for stage_name, stage in NORMALIZATION_STAGES:
+        start = time.perf_counter()
+        stage(text)
+        elapsed = time.perf_counter() - start
+        assert elapsed <= budget, f"{stage_name} took {elapsed:.2f}s on '{name}' ({len(text)} chars)"
+
+
+def test_cleaning_never_adds_text():
+    rng = random.Random(1)
+    for _ in range(500):
+        text = "".join(rng.choice(FRAGMENTS) for _ in range(rng.randint(1, 60)))
+        for _, stage in CLEANING_STAGES:
+            cleaned = stage(text)
+            assert len(cleaned) <= len(text)
+            text = cleaned
+
+
+def test_normalize_text():
+    timings = {}
+    text = normalize_text(
+        "Les citoyen·ne·s  de l'article1. Paru dans Le Monde. "
+        "Dupont, A. (2020). Un livre. Presses de Paris. Fin https://example.org/a .",
+        timings,
+    )
+    assert text == "Les citoyennes et citoyens de l'article. Fin."
+    assert set(timings) == {name for name, _ in NORMALIZATION_STAGES}
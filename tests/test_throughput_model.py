@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Test du modèle de débit de synthèse utilisé par le mode --plan: vitesse et
+durée audio apprises des articles déjà synthétisés, persistées entre deux
+passages, valeurs par défaut tant qu'aucun article n'a été synthétisé.
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pipeline import ThroughputModel
+from pipeline.throughput import DEFAULT_CHARS_PER_SECOND, DEFAULT_AUDIO_SECONDS_PER_CHAR
+
+
+def test_defaults_without_history(tmp_path):
+    model = ThroughputModel(str(tmp_path / "throughput.json"))
+    assert model.chars_per_second("edge", 6) == (DEFAULT_CHARS_PER_SECOND["edge"], "default")
+    audio_s, _ = model.estimate("edge", 1400, 6)
+    assert audio_s == pytest.approx(1400 * DEFAULT_AUDIO_SECONDS_PER_CHAR)
+
+
+def test_learned_speed_is_persisted_and_scaled(tmp_path):
+    path = str(tmp_path / "throughput.json")
+    model = ThroughputModel(path)
+    model.record("edge", 10000, 20, 700, concurrency=4)
+    model.record("edge", 30000, 60, 2100, concurrency=4)
+
+    model = ThroughputModel(path)
+    assert model.chars_per_second("edge", 4) == (pytest.approx(500), "learned")
+    assert model.chars_per_second("edge", 8)[0] == pytest.approx(1000)
+    audio_s, wall_s = model.estimate("edge", 5000, 4)
+    assert (audio_s, wall_s) == (pytest.approx(350), pytest.approx(10))
+    # The edge-tts budget per minute caps the speed whatever the concurrency
+    assert model.estimate("edge", 5000, 8, max_rate=250)[1] == pytest.approx(20)
+    # Engines are learned separately
+    assert model.chars_per_second("local", 4)[1] == "default"
+
+
+def test_recent_articles_weigh_more(tmp_path):
+    model = ThroughputModel(str(tmp_path / "throughput.json"), decay=0.5)
+    model.record("local", 1000, 10, 70, concurrency=2)   # 100 chars/s
+    for _ in range(10):
+        model.record("local", 1000, 2, 70, concurrency=2)  # 500 chars/s
+    assert model.chars_per_second("local", 2)[0] == pytest.approx(500, rel=0.01)
+
+
+def test_fallback_backend_reports_the_engine_in_use():
+    from synthesis import FallbackTTSBackend, LocalTTSBackend, EdgeTTSBackend
+
+    backend = FallbackTTSBackend(EdgeTTSBackend("fr-FR-VivienneNeural"), LocalTTSBackend())
+    backend.primary_down = False
+    assert backend.active_engine() == "edge"
+    backend.primary_down = True
+    assert backend.active_engine() == "local"
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Test des moteurs de synthèse: choix du moteur (edge, local, auto), taille du
+pool du moteur local, synthèse et encodage des morceaux (espeak-ng/piper et
+lame/ffmpeg simulés) concaténés dans l'ordre, et bascule d'edge-tts vers le
+moteur local.
+"""
+import asyncio
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import synthesis
+import synthesis.edge
+import synthesis.local
+from synthesis import (BaseTTSBackend, BudgetExceeded, FallbackTTSBackend, LocalTTSBackend, TTSScheduler,
+                       get_backend)
+
+
+def _tools(monkeypatch, *available):
+    monkeypatch.setattr(synthesis.local.shutil, "which", lambda name: f"/usr/bin/{name}" if name in available else None)
+
+
+def _fake_run(calls):
+    """subprocess.run of the engine and encoder: WAV = the text, MP3 = b"[" + WAV + b"]"."""
+    def run(cmd, input=None, **kwargs):
+        calls.append(cmd)
+        if cmd[0] in ("espeak-ng", "piper"):
+            wav_path = cmd[cmd.index("-w" if cmd[0] == "espeak-ng" else "--output_file") + 1]
+            with open(wav_path, "wb") as f:
+                f.write(input)
+        else:
+            wav_path = cmd[-2] if cmd[0] == "lame" else cmd[cmd.index("-i") + 1]
+            with open(wav_path, "rb") as src, open(cmd[-1], "wb") as dst:
+                dst.write(b"[" + src.read() + b"]")
+    return run
+
+
+@pytest.mark.parametrize("name, local_tools, expected", [
+    ("edge", ("espeak-ng", "lame"), TTSScheduler),
+    ("local", ("espeak-ng", "lame"), LocalTTSBackend),
+    ("auto", ("espeak-ng", "lame"), FallbackTTSBackend),
+    ("auto", ("espeak-ng",), TTSScheduler),  # No MP3 encoder: no fallback
+])
+def test_backend_selection(monkeypatch, name, local_tools, expected):
+    _tools(monkeypatch, *local_tools)
+    monkeypatch.setattr(synthesis.edge, "edge_tts", object())
+    backend = get_backend(name, "fr-FR-VivienneNeural")
+    assert type(backend) is expected
+    backend.close()
+
+
+def test_unavailable_backend_is_an_error(monkeypatch):
+    _tools(monkeypatch)
+    monkeypatch.setattr(synthesis.edge, "edge_tts", None)
+    with pytest.raises(RuntimeError):
+        get_backend("auto", "fr-FR-VivienneNeural")
+    with pytest.raises(RuntimeError):
+        get_backend("local", "fr-FR-VivienneNeural")
+
+
+def test_piper_needs_its_model(monkeypatch, tmp_path):
+    _tools(monkeypatch, "piper", "ffmpeg")
+    assert not LocalTTSBackend("piper", model=str(tmp_path / "missing.onnx")).is_available()
+    model = tmp_path / "voice.onnx"
+    model.write_bytes(b"onnx")
+    backend = LocalTTSBackend("piper", model=str(model))
+    assert backend.is_available() and backend.encoder == "ffmpeg"
+
+
+def test_pool_is_sized_to_the_cores(monkeypatch):
+    monkeypatch.setattr(synthesis.local.os, "cpu_count", lambda: 3)
+    assert LocalTTSBackend().workers == 3
+    assert LocalTTSBackend(workers=5).workers == 5
+    monkeypatch.setattr(synthesis.local.os, "cpu_count", lambda: None)
+    assert LocalTTSBackend().workers == 1
+
+
+@pytest.mark.parametrize("engine, encoder", [("espeak-ng", "lame"), ("piper", "ffmpeg")])
+def test_chunk_is_synthesized_then_encoded(monkeypatch, engine, encoder):
+    calls = []
+    monkeypatch.setattr(synthesis.local.subprocess, "run", _fake_run(calls))
+    audio = synthesis.local._synthesize_chunk(engine, "fr", "voice.onnx", encoder, "Bonjour.")
+    assert audio == b"[Bonjour.]"
+    assert [cmd[0] for cmd in calls] == [engine, encoder]
+    if engine == "espeak-ng":
+        assert calls[0][:3] == ["espeak-ng", "-v", "fr"]
+    else:
+        assert calls[0][:3] == ["piper", "--model", "voice.onnx"]
+    # Bare MP3 stream, so that chunks can be concatenated
+    assert "-t" in calls[1] if encoder == "lame" else "-write_xing" in calls[1]
+
+
+def test_chunks_are_concatenated_in_order(monkeypatch, tmp_path):
+    calls = []
+    _tools(monkeypatch, "espeak-ng", "lame")
+    monkeypatch.setattr(synthesis.local.subprocess, "run", _fake_run(calls))
+    backend = LocalTTSBackend(workers=4)
+    backend._pool = ThreadPoolExecutor(4)  # Same process: the subprocess stub applies
+    sentences = [f"Phrase {i} " + "x" * 300 + "." for i in range(6)]
+    path = tmp_path / "article.mp3"
+    asyncio.run(backend.synthesize(" ".join(sentences), str(path)))
+    backend.close()
+
+    chunks = synthesis.split_text(" ".join(sentences), synthesis.local.LOCAL_CHUNK_CHARS)
+    assert len(chunks) == 3
+    assert path.read_bytes() == b"".join(b"[" + chunk.encode() + b"]" for chunk in chunks)
+    assert len(calls) == 6
+
+
+class FakeEngine(BaseTTSBackend):
+    def __init__(self, name, error=None):
+        self.name = name
+        self.error = error
+        self.texts = []
+
+    def is_available(self):
+        return True
+
+    async def synthesize_chunk(self, text, on_first_audio=None):
+        self.texts.append(text)
+        if self.error:
+            raise self.error
+        return self.name.encode()
+
+
+def test_fallback_to_local_engine_for_the_rest_of_the_run(tmp_path):
+    edge, local = FakeEngine("edge", ConnectionError("edge-tts down")), FakeEngine("local")
+    backend = FallbackTTSBackend(edge, local)
+    assert backend.active_engine() == "edge"
+    for i in range(2):
+        asyncio.run(backend.synthesize("Texte.", str(tmp_path / f"{i}.mp3")))
+        assert (tmp_path / f"{i}.mp3").read_bytes() == b"local"
+    assert len(edge.texts) == 1  # Not tried again after the outage
+    assert backend.active_engine() == "local"
+    assert backend.stats()["fallback_used"] is True
+
+
+def test_budget_exhaustion_does_not_switch_engines(tmp_path):
+    backend = FallbackTTSBackend(FakeEngine("edge", BudgetExceeded("no budget")), FakeEngine("local"))
+    with pytest.raises(BudgetExceeded):
+        asyncio.run(backend.synthesize("Texte.", str(tmp_path / "out.mp3")))
+    assert not backend.primary_down
+
+
+def test_unavailable_primary_starts_on_the_fallback(tmp_path):
+    edge = FakeEngine("edge")
+    edge.is_available = lambda: False
+    backend = FallbackTTSBackend(edge, FakeEngine("local"))
+    asyncio.run(backend.synthesize("Texte.", str(tmp_path / "out.mp3")))
+    assert edge.texts == [] and backend.active_engine() == "local"
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Test de l'ordonnanceur edge-tts avec un moteur factice et une horloge
+simulée: fenêtre de concurrence AIMD, reprises avec attente aléatoire et délai
+maximum, budgets de caractères par minute et par jour (persistance,
+restitution des caractères non synthétisés, BudgetExceeded), et requêtes
+dupliquées: seuil de lenteur, part maximale, première réponse gardée et
+requête perdante annulée.
+"""
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from synthesis import scheduler
+from synthesis import BaseTTSBackend, BudgetExceeded, TTSScheduler
+
+REAL_SLEEP = asyncio.sleep
+SENTENCE = "a" * 99 + "."  # 100 characters: one chunk each with chunk_chars=100
+
+
+class FakeClock:
+    """time.time/time.monotonic of the scheduler; asyncio.sleep advances it instead of waiting."""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def time(self):
+        return self.now
+
+    def monotonic(self):
+        return self.now
+
+    async def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+        await REAL_SLEEP(0)
+
+
+class FakeBackend(BaseTTSBackend):
+    """Returns b"<text>" for each chunk; `failures` calls fail first, `latencies` advance the clock."""
+
+    name = "fake"
+
+    def __init__(self, clock=None, failures=0, latencies=(), fail_on=None):
+        self.clock = clock
+        self.failures = failures
+        self.latencies = list(latencies)
+        self.fail_on = fail_on
+        self.calls = 0
+
+    def is_available(self):
+        return True
+
+    async def synthesize_chunk(self, text, on_first_audio=None):
+        self.calls += 1
+        if self.latencies:
+            self.clock.now += self.latencies.pop(0)
+        if self.fail_on and self.fail_on in text:
+            for _ in range(5):
+                await REAL_SLEEP(0)  # Let the other chunks finish first
+            raise ConnectionError("chunk refused")
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("service unavailable")
+        return text.encode()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(scheduler, "time", clock)
+    monkeypatch.setattr(asyncio, "sleep", clock.sleep)
+    monkeypatch.setattr(scheduler.random, "uniform", lambda low, high: high)  # Longest jittered backoff
+    return clock
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+def test_window_grows_additively_up_to_the_maximum(clock):
+    tts = TTSScheduler(FakeBackend(), initial_concurrency=1, max_concurrency=3)
+    limits = []
+    for _ in range(5):
+        assert _run(tts._run_chunk("texte")) == b"texte"
+        limits.append(round(tts.limit, 2))
+    assert limits == [2.0, 2.5, 2.9, 3.0, 3.0]
+    assert tts.stats()["peak_concurrency"] == 3
+
+
+def test_window_halves_on_slow_response(clock):
+    backend = FakeBackend(clock, latencies=[1.0, 10.0])
+    tts = TTSScheduler(backend, initial_concurrency=4)
+    _run(tts._run_chunk(SENTENCE))
+    assert tts.limit == 4.25
+    _run(tts._run_chunk(SENTENCE))  # 10x slower per character than usual
+    assert tts.limit == 2.125
+
+
+def test_failures_are_retried_with_jittered_exponential_backoff(clock):
+    tts = TTSScheduler(FakeBackend(failures=3), initial_concurrency=4, backoff_base=2.0, backoff_max=5.0)
+    assert _run(tts._run_chunk("texte")) == b"texte"
+    assert clock.sleeps == [2.0, 4.0, 5.0]  # Capped by backoff_max
+    assert tts.retries == 3 and tts.requests == 4
+    # Halved on each failure (they are more than a second apart), then +1/limit
+    assert tts.limit == 2.0
+
+
+def test_concurrent_failures_halve_the_window_once(clock):
+    tts = TTSScheduler(FakeBackend(), initial_concurrency=4)
+    tts._decrease("error")
+    tts._decrease("error")
+    assert tts.limit == 2
+    clock.now += 1.5
+    tts._decrease("error")
+    assert tts.limit == 1
+
+
+def test_retries_exhausted_raise_the_last_error(clock):
+    backend = FakeBackend(failures=10)
+    tts = TTSScheduler(backend, max_retries=2)
+    with pytest.raises(ConnectionError):
+        _run(tts._run_chunk("texte"))
+    assert backend.calls == 3
+    assert tts.stats()["failures"] == 1 and tts.stats()["retries"] == 2
+    assert tts.in_flight == 0
+
+
+def test_each_attempt_is_bounded_by_the_deadline(monkeypatch):
+    monkeypatch.setattr(scheduler.random, "uniform", lambda low, high: 0.0)
+    cancelled = []
+
+    class HangingBackend(FakeBackend):
+        async def synthesize_chunk(self, text, on_first_audio=None):
+            self.calls += 1
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                cancelled.append(text)
+                raise
+
+    backend = HangingBackend()
+    tts = TTSScheduler(backend, max_retries=1, request_deadline=0.05)
+    with pytest.raises(asyncio.TimeoutError):
+        _run(tts._run_chunk("texte"))
+    assert backend.calls == 2 and cancelled == ["texte", "texte"]
+
+
+def test_per_minute_bucket_paces_requests(clock, tmp_path):
+    tts = TTSScheduler(FakeBackend(), chunk_chars=100, chars_per_minute=100)
+    _run(tts.synthesize(f"{SENTENCE} {SENTENCE}", str(tmp_path / "out.mp3")))
+    # The second chunk waits for the bucket to refill: 100 characters at 100/min
+    assert clock.sleeps == [pytest.approx(60.0)]
+    assert (tmp_path / "out.mp3").read_bytes() == SENTENCE.encode() * 2
+
+
+def test_daily_budget_is_persisted_and_enforced(clock, tmp_path):
+    state = str(tmp_path / "budget.json")
+    tts = TTSScheduler(FakeBackend(), state_path=state, chunk_chars=100, chars_per_day=250)
+    _run(tts.synthesize(f"{SENTENCE} {SENTENCE}", str(tmp_path / "out.mp3")))
+    assert tts.stats()["budget_day_remaining"] == 49
+
+    # The next run starts from the saved balance
+    other = TTSScheduler(FakeBackend(), state_path=state, chunk_chars=100, chars_per_day=250)
+    assert other.day_bucket.remaining() == 49
+    with pytest.raises(BudgetExceeded):
+        _run(other.synthesize(SENTENCE, str(tmp_path / "other.mp3")))
+    assert other.day_bucket.remaining() == 49
+
+    # Refilled over time: 250 characters a day
+    clock.now += 86400 * 51 / 250
+    _run(other.synthesize(SENTENCE, str(tmp_path / "other.mp3")))
+    assert other.day_bucket.remaining() == 0
+
+
+def test_unsynthesized_characters_are_refunded(clock, tmp_path):
+    state = str(tmp_path / "budget.json")
+    backend = FakeBackend(fail_on="b")
+    tts = TTSScheduler(backend, state_path=state, chunk_chars=100, chars_per_day=1000, max_retries=0)
+    failing = "b" * 99 + "."
+    with pytest.raises(ConnectionError):
+        _run(tts.synthesize(f"{SENTENCE} {failing}", str(tmp_path / "out.mp3")))
+    # Only the synthesized chunk is charged, on disk as well
+    assert tts.day_bucket.remaining() == 900
+    assert TTSScheduler(FakeBackend(), state_path=state, chars_per_day=1000).day_bucket.remaining() == 900
+    assert not (tmp_path / "out.mp3").exists()
+
+
+class ScriptedBackend(FakeBackend):
+    """
+    Each call follows the next behaviour of `script`: "fast" (audio at once),
+    "silent" (no audio, never completes), "late" (audio at once, completes
+    after 0.2 s) or "slow" (no audio, completes after 0.05 s).
+    """
+
+    def __init__(self, script):
+        super().__init__()
+        self.script = list(script)
+        self.cancelled = []
+
+    async def synthesize_chunk(self, text, on_first_audio=None):
+        self.calls += 1
+        behaviour = self.script.pop(0) if self.script else "fast"
+        try:
+            if behaviour in ("fast", "late"):
+                on_first_audio()
+            if behaviour == "silent":
+                await asyncio.Event().wait()
+            elif behaviour in ("late", "slow"):
+                await asyncio.sleep(0.2 if behaviour == "late" else 0.05)
+        except asyncio.CancelledError:
+            self.cancelled.append(behaviour)
+            raise
+        return behaviour.encode()
+
+
+def _hedging(backend, **kwargs):
+    tts = TTSScheduler(backend, hedge=True, hedge_min_samples=20, **kwargs)
+    # Usual latencies: first audio within 10 ms, 1 ms per 10 characters
+    tts._first_audio_latencies.extend([0.01] * 20)
+    tts._completion_per_char.extend([0.0001] * 20)
+    return tts
+
+
+async def _request_and_cleanup(tts):
+    """One request through the window; returns its audio, the requests cancelled and the tasks left running."""
+    await tts._acquire()
+    tts.requests += 1
+    try:
+        audio = await tts._request("texte")
+    finally:
+        await tts._release()
+    leftover = {task for task in asyncio.all_tasks() if task is not asyncio.current_task()}
+    return audio, list(tts.backend.cancelled), leftover
+
+
+@pytest.mark.parametrize("slow", ["silent", "late"])
+def test_slow_request_is_hedged_and_the_loser_cancelled(tmp_path, slow):
+    backend = ScriptedBackend([slow, "fast"])
+    tts = _hedging(backend, hedge_max_rate=1.0)
+    # The loser is cancelled and gone by the time the winner is returned
+    assert _run(_request_and_cleanup(tts)) == (b"fast", [slow], set())
+    assert tts.stats()["hedges"] == 1 and tts.stats()["hedge_wins"] == 1
+    assert tts.in_flight == 0
+
+    backend.script = [slow, "fast"]
+    _run(tts.synthesize("texte", str(tmp_path / "out.mp3")))
+    assert (tmp_path / "out.mp3").read_bytes() == b"fast"
+    assert os.listdir(tmp_path) == ["out.mp3"]
+
+
+def test_fast_request_is_not_hedged(tmp_path):
+    backend = ScriptedBackend(["fast"])
+    tts = _hedging(backend)
+    _run(tts.synthesize("texte", str(tmp_path / "out.mp3")))
+    assert backend.calls == 1 and tts.hedges == 0
+
+
+def test_primary_finishing_first_wins():
+    backend = ScriptedBackend(["slow", "silent"])
+    tts = _hedging(backend)
+    assert _run(_request_and_cleanup(tts)) == (b"slow", ["silent"], set())
+    assert tts.hedges == 1 and tts.hedge_wins == 0
+
+
+def test_hedges_are_capped_by_max_rate(tmp_path):
+    backend = ScriptedBackend(["slow"] * 10)
+    tts = _hedging(backend, hedge_max_rate=0.5)
+
+    async def run_all():
+        for i in range(4):
+            await tts.synthesize("texte", str(tmp_path / f"{i}.mp3"))
+
+    _run(run_all())
+    assert tts.requests == 4 and tts.hedges == 2
+    assert backend.calls == 6
+
+
+def test_no_hedging_before_enough_samples(tmp_path):
+    backend = ScriptedBackend(["slow"])
+    tts = TTSScheduler(backend, hedge=True, hedge_min_samples=20)
+    _run(tts.synthesize("texte", str(tmp_path / "out.mp3")))
+    assert backend.calls == 1 and tts.hedges == 0
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Test du processus d'extraction recyclé: remplacement entre deux articles au
+delà d'un nombre d'articles ou d'une mémoire résidente, mesure du pic de
+mémoire par article et reprise après la mort du processus.
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pipeline import RecyclingWorker, WorkerCrashed
+
+_retained = []
+
+
+def _job(size_mb, keep=False, crash=False, fail=False):
+    if crash:
+        os._exit(1)
+    if fail:
+        raise ValueError("bad article")
+    block = bytearray(size_mb * 1024 * 1024)
+    if keep:
+        _retained.append(block)
+    return os.getpid()
+
+
+def test_worker_is_recycled_after_max_jobs():
+    worker = RecyclingWorker(_job, max_rss_mb=0, max_jobs=2)
+    try:
+        pids = [worker.run(1)[0] for _ in range(5)]
+    finally:
+        worker.close()
+    assert pids[0] == pids[1] != pids[2] == pids[3] != pids[4]
+    assert worker.stats()["recycled"] == 2
+    assert worker.stats()["started"] == 3
+
+
+@pytest.mark.skipif(not os.path.exists("/proc/self/status"), reason="needs /proc")
+def test_worker_is_recycled_over_memory_budget_and_peak_is_recorded():
+    worker = RecyclingWorker(_job, max_rss_mb=200, max_jobs=0)
+    try:
+        first_pid, usage = worker.run(64)
+        assert usage["peak_rss_mb"] >= 64
+        assert worker.run(1)[0] == first_pid
+        assert worker.run(256, True)[0] == first_pid  # Retained: RSS over budget
+        assert worker.run(1)[0] != first_pid
+    finally:
+        worker.close()
+    assert worker.stats()["recycled"] == 1
+
+
+def test_errors_and_crashes_do_not_stop_the_worker():
+    worker = RecyclingWorker(_job, max_jobs=0)
+    try:
+        with pytest.raises(ValueError):
+            worker.run(1, False, False, True)
+        with pytest.raises(WorkerCrashed):
+            worker.run(1, False, True)
+        assert worker.run(1)[0]
+    finally:
+        worker.close()
+    assert worker.stats()["crashed"] == 1